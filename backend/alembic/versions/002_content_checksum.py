@@ -0,0 +1,17 @@
+"""Add SHA-256 checksum to content."""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '002_content_checksum'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('content', sa.Column('checksum', sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('content', 'checksum')
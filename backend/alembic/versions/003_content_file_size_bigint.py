@@ -0,0 +1,17 @@
+"""Widen content.file_size to BIGINT for large video uploads."""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '003_file_size_bigint'
+down_revision = '002_content_checksum'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column('content', 'file_size', existing_type=sa.Integer(), type_=sa.BigInteger(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('content', 'file_size', existing_type=sa.BigInteger(), type_=sa.Integer(), existing_nullable=True)
@@ -0,0 +1,37 @@
+"""Screen groups (tags) for fleet-wide assignment and push."""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '004_screen_groups'
+down_revision = '003_file_size_bigint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'screen_groups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+
+    op.create_table(
+        'screen_group_members',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('screen_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['screen_groups.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['screen_id'], ['screens.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('group_id', 'screen_id')
+    )
+    op.create_index('ix_screen_group_members_screen_id', 'screen_group_members', ['screen_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_screen_group_members_screen_id', table_name='screen_group_members')
+    op.drop_table('screen_group_members')
+    op.drop_table('screen_groups')
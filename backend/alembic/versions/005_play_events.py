@@ -0,0 +1,48 @@
+"""Proof-of-play events (append-only) and hourly aggregates."""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '005_play_events'
+down_revision = '004_screen_groups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'play_events',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False, autoincrement=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('screen_id', sa.Integer(), nullable=False),
+        sa.Column('playlist_id', sa.Integer(), nullable=True),
+        sa.Column('playlist_item_id', sa.Integer(), nullable=True),
+        sa.Column('content_item_id', sa.Integer(), nullable=True),
+        sa.Column('content_id', sa.Integer(), nullable=False),
+        sa.Column('duration_ms', sa.Integer(), nullable=False),
+        sa.Column('result', sa.String(20), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_play_events_started_at', 'play_events', ['started_at'])
+    op.create_index('ix_play_events_screen_started', 'play_events', ['screen_id', 'started_at'])
+
+    op.create_table(
+        'play_stats_hourly',
+        sa.Column('hour', sa.DateTime(), nullable=False),
+        sa.Column('screen_id', sa.Integer(), nullable=False),
+        sa.Column('content_id', sa.Integer(), nullable=False),
+        sa.Column('plays', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('errors', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_duration_ms', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('hour', 'screen_id', 'content_id')
+    )
+    op.create_index('ix_play_stats_hourly_content_hour', 'play_stats_hourly', ['content_id', 'hour'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_play_stats_hourly_content_hour', table_name='play_stats_hourly')
+    op.drop_table('play_stats_hourly')
+    op.drop_index('ix_play_events_screen_started', table_name='play_events')
+    op.drop_index('ix_play_events_started_at', table_name='play_events')
+    op.drop_table('play_events')
@@ -0,0 +1,41 @@
+"""Screen presence intervals and daily uptime rollups."""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '006_screen_presence'
+down_revision = '005_play_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'screen_presence',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('screen_id', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['screen_id'], ['screens.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_screen_presence_screen_started', 'screen_presence', ['screen_id', 'started_at'])
+    op.create_index('ix_screen_presence_ended_at', 'screen_presence', ['ended_at'])
+
+    op.create_table(
+        'screen_uptime_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('screen_id', sa.Integer(), nullable=False),
+        sa.Column('online_seconds', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['screen_id'], ['screens.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('day', 'screen_id')
+    )
+    op.create_index('ix_screen_uptime_daily_screen_day', 'screen_uptime_daily', ['screen_id', 'day'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_screen_uptime_daily_screen_day', table_name='screen_uptime_daily')
+    op.drop_table('screen_uptime_daily')
+    op.drop_index('ix_screen_presence_ended_at', table_name='screen_presence')
+    op.drop_index('ix_screen_presence_screen_started', table_name='screen_presence')
+    op.drop_table('screen_presence')
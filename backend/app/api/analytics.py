@@ -0,0 +1,105 @@
+from typing import List, Optional
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.proof_of_play import play_events
+from app.models.user import User
+from app.models.screen import Screen
+from app.models.content import Content
+from app.models.analytics import PlayStatHourly
+from app.schemas.analytics import PlayStatHourlyResponse, PlaySummary
+from app.api.deps import get_current_active_user, get_current_admin_user
+
+router = APIRouter()
+
+
+def _time_range(start: Optional[datetime], end: Optional[datetime]):
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=1)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    return start, end
+
+
+@router.get("/plays/hourly", response_model=List[PlayStatHourlyResponse])
+async def get_hourly_plays(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    screen_id: Optional[int] = None,
+    content_id: Optional[int] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Plays per hour, screen and content (UTC, default last 24h)"""
+    start, end = _time_range(start, end)
+    
+    query = db.query(PlayStatHourly).filter(PlayStatHourly.hour >= start, PlayStatHourly.hour < end)
+    if screen_id is not None:
+        query = query.filter(PlayStatHourly.screen_id == screen_id)
+    if content_id is not None:
+        query = query.filter(PlayStatHourly.content_id == content_id)
+    
+    return query.order_by(PlayStatHourly.hour, PlayStatHourly.screen_id, PlayStatHourly.content_id).limit(limit).all()
+
+
+@router.get("/plays/summary", response_model=List[PlaySummary])
+async def get_play_summary(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    group_by: str = Query("content", pattern="^(content|screen)$"),
+    screen_id: Optional[int] = None,
+    content_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Play totals per content or per screen (from hourly aggregates)"""
+    start, end = _time_range(start, end)
+    
+    key = PlayStatHourly.content_id if group_by == "content" else PlayStatHourly.screen_id
+    query = db.query(
+        key,
+        func.sum(PlayStatHourly.plays),
+        func.sum(PlayStatHourly.completed),
+        func.sum(PlayStatHourly.errors),
+        func.sum(PlayStatHourly.total_duration_ms)
+    ).filter(PlayStatHourly.hour >= start, PlayStatHourly.hour < end)
+    if screen_id is not None:
+        query = query.filter(PlayStatHourly.screen_id == screen_id)
+    if content_id is not None:
+        query = query.filter(PlayStatHourly.content_id == content_id)
+    rows = query.group_by(key).order_by(func.sum(PlayStatHourly.plays).desc()).all()
+    
+    # Titles in one query
+    ids = [row[0] for row in rows]
+    if group_by == "content":
+        titles = dict(db.query(Content.id, Content.title).filter(Content.id.in_(ids)).all()) if ids else {}
+    else:
+        titles = dict(db.query(Screen.id, Screen.name).filter(Screen.id.in_(ids)).all()) if ids else {}
+    
+    return [
+        {
+            "key": key_id,
+            "title": titles.get(key_id),
+            "plays": int(plays or 0),
+            "completed": int(completed or 0),
+            "errors": int(errors or 0),
+            "total_duration_ms": int(total or 0)
+        }
+        for key_id, plays, completed, errors, total in rows
+    ]
+
+
+@router.post("/plays/flush")
+async def flush_play_events(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Write buffered play events now (admin only)"""
+    written = await play_events.flush()
+    return {"written": written, "pending": play_events.pending}
@@ -1,25 +1,63 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Query, Header, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse
 from sqlalchemy.orm import Session
+import mimetypes
+import logging
 import os
 
-from app.core.database import get_db
-from app.models.user import User
+from app.core.database import get_db, SessionLocal
+from app.core.jobs import jobs
+from app.core.playlist_snapshots import playlist_snapshots
+from app.core.read_models import content_list, content_items
+from app.core.response_cache import response_cache
+from app.models.user import User, UserRole
 from app.models.content import Content, ContentItem, ContentType
-from app.schemas.content import ContentResponse, ContentUpdate, ContentUploadResponse, ContentItemResponse
+from app.schemas.content import (
+    ContentResponse,
+    ContentUpdate,
+    ContentUploadResponse,
+    ContentItemResponse,
+    ResumableUploadCreate,
+    ResumableUploadResponse
+)
 from app.api.deps import get_current_active_user, get_current_admin_user
 from app.utils.file_handler import (
     save_upload_file,
+    stream_to_file,
+    get_max_upload_size,
+    UploadTooLargeError,
     get_content_type_from_extension,
     create_thumbnail,
     delete_file,
     delete_multiple_files,
     convert_pdf_to_images,
-    get_pdf_page_count,
-    sanitize_filename
+    get_pdf_page_path,
+    get_thumbnail_path,
+    PDF_PAGE_FILENAME,
+    open_pdf,
+    generate_unique_filename,
+    process_video_file,
+    video_duration_seconds,
+    hash_file
+)
+from app.utils.thumbnails import thumbnail_cache
+from app.utils.page_renderer import page_renderer
+from app.utils.resumable_upload import (
+    create_upload,
+    get_upload,
+    get_upload_offset,
+    append_chunk,
+    finalize_upload,
+    delete_upload,
+    UploadOffsetMismatchError,
+    UploadChecksumMismatchError
 )
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -31,47 +69,43 @@ async def list_content(
     current_user: User = Depends(get_current_active_user)
 ):
     """List all content"""
-    content = db.query(Content).offset(skip).limit(limit).all()
-    return content
+    # Column projection rendered directly (response_model documents the shape)
+    return ORJSONResponse(content_list(db, skip, limit))
 
 
-@router.post("", response_model=ContentUploadResponse, status_code=status.HTTP_201_CREATED)
-async def upload_content(
-    file: UploadFile = File(...),
-    title: str = Form(...),
-    description: str = Form(None),
-    duration: int = Form(10),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
-    """Upload new content (Images, PDFs, Videos)"""
-    
-    # Validate file extension
-    file_ext = os.path.splitext(file.filename)[1].lower()
+def _validate_upload_filename(filename: str) -> ContentType:
+    """Validate extension and determine content type of an upload"""
+    file_ext = os.path.splitext(filename)[1].lower()
     if file_ext not in settings.ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File type {file_ext} not allowed"
         )
     
-    # Determine content type
     try:
-        content_type = get_content_type_from_extension(file.filename)
+        return get_content_type_from_extension(filename)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    
-    # Save file
-    try:
-        file_path, unique_filename, file_size = await save_upload_file(file)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to save file: {str(e)}"
-        )
-    
+
+
+def _create_content(
+    db: Session,
+    current_user: User,
+    content_type: ContentType,
+    original_filename: str,
+    mime_type: str,
+    file_path: str,
+    unique_filename: str,
+    file_size: int,
+    checksum: str,
+    title: str,
+    description: str,
+    duration: int
+) -> dict:
+    """Create content record and items for a file that is already in storage"""
     # Create database record
     db_content = Content(
         title=title,
@@ -79,8 +113,9 @@ async def upload_content(
         file_path=file_path,
         file_name=unique_filename,
         file_size=file_size,
+        checksum=checksum,
         content_type=content_type,
-        mime_type=file.content_type,
+        mime_type=mime_type,
         duration=duration,
         created_by=current_user.id
     )
@@ -91,18 +126,39 @@ async def upload_content(
     # Handle PDF: Convert to JPEG pages
     if content_type == ContentType.PDF:
         try:
-            # Get page count
-            page_count = get_pdf_page_count(file_path)
-            db_content.pdf_page_count = page_count
-            
-            if page_count == 0:
-                raise ValueError("Cannot read PDF or PDF is empty")
-            
-            # Convert PDF to images with original filename
-            image_paths = convert_pdf_to_images(file_path, db_content.id, file.filename)
+            # Open once: page count, page sizes and rendering share one parse
+            with open_pdf(file_path) as pdf:
+                # Get page count
+                page_count = pdf.page_count
+                db_content.pdf_page_count = page_count
+                
+                if page_count == 0:
+                    raise ValueError("Cannot read PDF or PDF is empty")
+                
+                thumbnail_path = get_thumbnail_path(unique_filename)
+                
+                if settings.PDF_LAZY_RENDERING:
+                    if page_count > settings.MAX_PDF_PAGES:
+                        raise ValueError(f"PDF has {page_count} pages, max is {settings.MAX_PDF_PAGES}")
+                
+                    # Pages are rendered on first request (see get_pdf_page)
+                    page_paths = [
+                        get_pdf_page_path(db_content.id, page_num)
+                        for page_num in range(1, page_count + 1)
+                    ]
+                else:
+                    # Convert PDF to images with original filename
+                    # (thumbnail is made from the rendered first page in memory)
+                    image_paths = convert_pdf_to_images(
+                        file_path, db_content.id, original_filename,
+                        thumbnail_path=thumbnail_path, thumbnail_size=(300, 400),
+                        document=pdf
+                    )
+                    page_paths = [img_path for img_path, _ in image_paths]
+                    db_content.thumbnail_path = thumbnail_path
             
             # Create ContentItem for each page
-            for page_num, (img_path, img_filename) in enumerate(image_paths, 1):
+            for page_num, img_path in enumerate(page_paths, 1):
                 content_item = ContentItem(
                     content_id=db_content.id,
                     item_number=page_num,
@@ -112,14 +168,6 @@ async def upload_content(
                 )
                 db.add(content_item)
             
-            # Create thumbnail from first page
-            first_page_path = image_paths[0][0]
-            base_name = sanitize_filename(file.filename)
-            thumbnail_filename = f"{base_name}_thumb.jpg"
-            thumbnail_path = os.path.join(settings.UPLOAD_DIR, thumbnail_filename)
-            create_thumbnail(first_page_path, thumbnail_path, size=(300, 400))
-            db_content.thumbnail_path = thumbnail_path
-            
         except Exception as e:
             # Cleanup on error
             delete_file(file_path)
@@ -132,9 +180,7 @@ async def upload_content(
     
     # Handle Image: Create thumbnail
     elif content_type == ContentType.IMAGE:
-        base_name = sanitize_filename(file.filename)
-        thumbnail_filename = f"{base_name}_thumb.jpg"
-        thumbnail_path = os.path.join(settings.UPLOAD_DIR, thumbnail_filename)
+        thumbnail_path = get_thumbnail_path(unique_filename)
         create_thumbnail(file_path, thumbnail_path)
         db_content.thumbnail_path = thumbnail_path
         
@@ -143,7 +189,18 @@ async def upload_content(
             content_id=db_content.id,
             item_number=1,
             file_path=file_path,
-            mime_type=file.content_type,
+            mime_type=mime_type,
+            duration=duration
+        )
+        db.add(content_item)
+    
+    # Handle Video: Single item now, probe/poster/faststart in background
+    elif content_type == ContentType.VIDEO:
+        content_item = ContentItem(
+            content_id=db_content.id,
+            item_number=1,
+            file_path=file_path,
+            mime_type=mime_type,
             duration=duration
         )
         db.add(content_item)
@@ -151,6 +208,12 @@ async def upload_content(
     db.commit()
     db.refresh(db_content)
     
+    job_id = None
+    if content_type == ContentType.VIDEO:
+        job_id = jobs.submit("video", process_video_content, db_content.id)
+    elif content_type == ContentType.PDF and settings.PDF_LAZY_RENDERING:
+        job_id = jobs.submit("pdf_thumbnail", render_pdf_thumbnail, db_content.id)
+    
     # Reload items
     db.refresh(db_content)
     items_count = len(db_content.items)
@@ -162,10 +225,350 @@ async def upload_content(
         "content_type": db_content.content_type,
         "pdf_page_count": db_content.pdf_page_count,
         "items_count": items_count,
+        "checksum": db_content.checksum,
+        "job_id": job_id,
         "message": f"Content uploaded successfully ({items_count} items)"
     }
 
 
+def process_video_content(content_id: int):
+    """Background job: faststart, probe and poster frame for uploaded video"""
+    db = SessionLocal()
+    try:
+        db_content = db.query(Content).filter(Content.id == content_id).first()
+        if not db_content:
+            return
+        
+        thumbnail_path = get_thumbnail_path(db_content.file_name)
+        info = process_video_file(db_content.file_path, thumbnail_path)
+        
+        if info["remuxed"]:
+            db_content.file_size = os.path.getsize(db_content.file_path)
+            db_content.checksum = hash_file(db_content.file_path)
+        
+        if info["thumbnail_path"]:
+            db_content.thumbnail_path = info["thumbnail_path"]
+        
+        # Display duration = real video length
+        if info["duration"]:
+            video_duration = video_duration_seconds(info["duration"], db_content.duration)
+            db_content.duration = video_duration
+            for item in db_content.items:
+                item.duration = video_duration
+        
+        db.commit()
+        playlist_snapshots.invalidate()  # Display timelines use the item durations
+        response_cache.bump("content", content_id)
+        response_cache.bump("playlist")  # Item durations show in /playlists/{id}/full
+    finally:
+        db.close()
+
+
+def render_pdf_thumbnail(content_id: int):
+    """Background job (lazy PDF mode): render first page and thumbnail"""
+    db = SessionLocal()
+    try:
+        db_content = db.query(Content).filter(Content.id == content_id).first()
+        if not db_content:
+            return
+        
+        first_item = db.query(ContentItem).filter(
+            ContentItem.content_id == content_id
+        ).order_by(ContentItem.item_number).first()
+        if not first_item:
+            return
+        
+        page_renderer.render(db_content.file_path, first_item.item_number, first_item.file_path)
+        
+        thumbnail_path = get_thumbnail_path(db_content.file_name)
+        if create_thumbnail(first_item.file_path, thumbnail_path, size=(300, 400)):
+            db_content.thumbnail_path = thumbnail_path
+            db.commit()
+    finally:
+        db.close()
+
+
+@router.post("", response_model=ContentUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_content(
+    file: UploadFile = File(...),
+    title: str = Form(...),
+    description: str = Form(None),
+    duration: int = Form(10),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Upload new content (Images, PDFs, Videos)"""
+    content_type = _validate_upload_filename(file.filename)
+    
+    # Save file
+    try:
+        file_path, unique_filename, file_size, checksum = await save_upload_file(
+            file, max_size=get_max_upload_size(content_type)
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to save file: {str(e)}"
+        )
+    
+    return _create_content(
+        db, current_user, content_type, file.filename, file.content_type,
+        file_path, unique_filename, file_size, checksum,
+        title, description, duration
+    )
+
+
+@router.post("/stream", response_model=ContentUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_content_stream(
+    request: Request,
+    filename: str = Query(..., min_length=1),
+    title: str = Query(...),
+    description: str = Query(None),
+    duration: int = Query(10),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Upload new content as raw request body (no multipart spooling)
+    
+    The body is streamed straight to storage, so each byte is copied once and
+    oversized uploads are rejected with 413 as soon as the limit is crossed.
+    """
+    content_type = _validate_upload_filename(filename)
+    max_size = get_max_upload_size(content_type)
+    
+    # Reject early if the client announces an oversized body
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(UploadTooLargeError(max_size))
+        )
+    
+    try:
+        file_path, unique_filename, file_size, checksum = await stream_to_file(
+            request.stream(), filename, max_size
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to save file: {str(e)}"
+        )
+    
+    mime_type = request.headers.get("content-type") or mimetypes.guess_type(filename)[0]
+    
+    return _create_content(
+        db, current_user, content_type, filename, mime_type,
+        file_path, unique_filename, file_size, checksum,
+        title, description, duration
+    )
+
+
+# ===== RESUMABLE UPLOADS =====
+# tus-like protocol: create -> PATCH chunks at Upload-Offset -> HEAD to
+# resume after an interruption -> finalize
+
+def _get_upload_or_404(upload_id: str, current_user: User) -> dict:
+    """Get resumable upload owned by current user"""
+    upload = get_upload(upload_id)
+    if not upload or (upload["created_by"] != current_user.id and current_user.role != UserRole.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+    return upload
+
+
+@router.post("/uploads", response_model=ResumableUploadResponse, status_code=status.HTTP_201_CREATED)
+async def create_resumable_upload(
+    upload_data: ResumableUploadCreate,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Start a resumable upload"""
+    content_type = _validate_upload_filename(upload_data.filename)
+    
+    max_size = get_max_upload_size(content_type)
+    if upload_data.length > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(UploadTooLargeError(max_size))
+        )
+    
+    upload = create_upload({
+        **upload_data.model_dump(),
+        "created_by": current_user.id
+    })
+    
+    return {**upload, "offset": 0}
+
+
+@router.head("/uploads/{upload_id}")
+async def get_resumable_upload_offset(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get current offset of a resumable upload"""
+    upload = _get_upload_or_404(upload_id, current_user)
+    
+    return Response(
+        headers={
+            "Upload-Offset": str(get_upload_offset(upload_id)),
+            "Upload-Length": str(upload["length"]),
+            "Cache-Control": "no-store"
+        }
+    )
+
+
+@router.patch("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Append a chunk to a resumable upload"""
+    upload = _get_upload_or_404(upload_id, current_user)
+    
+    try:
+        new_offset = await append_chunk(upload_id, upload_offset, request.stream(), upload["length"])
+    except UploadOffsetMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Upload-Offset": str(e.expected)}
+        )
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Chunk exceeds declared upload length"
+        )
+    
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={"Upload-Offset": str(new_offset)}
+    )
+
+
+@router.post("/uploads/{upload_id}/finalize", response_model=ContentUploadResponse, status_code=status.HTTP_201_CREATED)
+async def finalize_resumable_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Complete a resumable upload and process it like a regular upload"""
+    upload = _get_upload_or_404(upload_id, current_user)
+    
+    offset = get_upload_offset(upload_id)
+    if offset != upload["length"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload incomplete: {offset} of {upload['length']} bytes received",
+            headers={"Upload-Offset": str(offset)}
+        )
+    
+    content_type = _validate_upload_filename(upload["filename"])
+    unique_filename = generate_unique_filename(upload["filename"], use_original=True)
+    file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
+    try:
+        checksum = await finalize_upload(upload_id, file_path, upload.get("checksum"))
+    except UploadChecksumMismatchError as e:
+        # Corrupted in transit - the client has to upload again
+        delete_upload(upload_id)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    
+    mime_type = upload.get("mime_type") or mimetypes.guess_type(upload["filename"])[0]
+    
+    return _create_content(
+        db, current_user, content_type, upload["filename"], mime_type,
+        file_path, unique_filename, offset, checksum,
+        upload["title"], upload.get("description"), upload["duration"]
+    )
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_resumable_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Abort a resumable upload"""
+    _get_upload_or_404(upload_id, current_user)
+    delete_upload(upload_id)
+    return None
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingest_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get status of a background ingestion job (e.g. video processing)"""
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.get("/pages/{filename}")
+async def get_pdf_page(
+    filename: str,
+    db: Session = Depends(get_db)
+):
+    """Get a PDF page image, rendering it on first request (lazy PDF mode)
+    
+    nginx falls back to this endpoint when a page is not in /storage yet.
+    No auth, like /storage.
+    """
+    filename = os.path.basename(filename)
+    page = PDF_PAGE_FILENAME.match(filename)
+    if page:
+        content_id, item_number = int(page.group(1)), int(page.group(2))
+        item = db.query(ContentItem).filter(
+            ContentItem.content_id == content_id, ContentItem.item_number == item_number
+        ).first()
+    else:
+        # Pages stored before names carried the content id
+        file_path = os.path.join(settings.UPLOAD_DIR, filename)
+        item = db.query(ContentItem).filter(ContentItem.file_path == file_path).first()
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Page not found"
+        )
+    
+    if item.content.content_type == ContentType.PDF:
+        try:
+            await page_renderer.render_async(item.content.file_path, item.item_number, item.file_path)
+        except Exception as e:
+            logger.warning("Error rendering PDF page: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to render page"
+            )
+    
+    if not os.path.exists(item.file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Page not found"
+        )
+    
+    return FileResponse(item.file_path, media_type=item.mime_type or "image/jpeg")
+
+
 @router.get("/{content_id}", response_model=ContentResponse)
 async def get_content(
     content_id: int,
@@ -185,10 +588,35 @@ async def get_content(
 @router.get("/{content_id}/items", response_model=List[ContentItemResponse])
 async def get_content_items(
     content_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all items for a content (e.g., PDF pages)"""
+    etag, cached = response_cache.lookup(request, "content", content_id)
+    if cached is not None:
+        return cached
+    
+    items = content_items(db, content_id)
+    if items is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Content not found"
+        )
+    
+    return response_cache.render("content", content_id, etag, items)
+
+
+@router.get("/{content_id}/thumbnail")
+async def get_content_thumbnail(
+    content_id: int,
+    w: int = Query(300, ge=16, le=4096),
+    db: Session = Depends(get_db)
+):
+    """Get thumbnail of given width (cached on disk)
+    
+    No auth, like /storage, so it can be used directly in <img> tags.
+    """
     content = db.query(Content).filter(Content.id == content_id).first()
     if not content:
         raise HTTPException(
@@ -196,8 +624,39 @@ async def get_content_items(
             detail="Content not found"
         )
     
-    items = db.query(ContentItem).filter(ContentItem.content_id == content_id).order_by(ContentItem.item_number).all()
-    return items
+    # Source: image itself, first PDF page, or video poster frame
+    if content.content_type == ContentType.IMAGE:
+        source_path = content.file_path
+    elif content.content_type == ContentType.PDF:
+        first_item = db.query(ContentItem).filter(
+            ContentItem.content_id == content_id
+        ).order_by(ContentItem.item_number).first()
+        source_path = None
+        if first_item:
+            try:
+                source_path = await page_renderer.render_async(
+                    content.file_path, first_item.item_number, first_item.file_path
+                )
+            except Exception as e:
+                logger.warning("Error rendering PDF page: %s", e)
+    else:
+        source_path = content.thumbnail_path
+    
+    thumbnail_path = None
+    if source_path:
+        thumbnail_path = await run_in_threadpool(thumbnail_cache.get, source_path, w)
+    
+    if not thumbnail_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Thumbnail not available"
+        )
+    
+    return FileResponse(
+        thumbnail_path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
 
 
 @router.put("/{content_id}", response_model=ContentResponse)
@@ -243,8 +702,9 @@ async def delete_content(
     items = db.query(ContentItem).filter(ContentItem.content_id == content_id).all()
     files_to_delete = [item.file_path for item in items]
     
-    # Delete main file
+    # Delete main file (PDFs: also close the document kept open for lazy page renders)
     files_to_delete.append(db_content.file_path)
+    open_pdf_path = db_content.file_path if db_content.content_type == ContentType.PDF else None
     
     # Delete thumbnail
     if db_content.thumbnail_path:
@@ -253,8 +713,13 @@ async def delete_content(
     # Delete from database
     db.delete(db_content)
     db.commit()
+    playlist_snapshots.invalidate()  # Its items drop out of every playlist
+    response_cache.bump("content", content_id)
+    response_cache.bump("playlist")
     
     # Delete files from storage
+    if open_pdf_path:
+        page_renderer.forget(open_pdf_path)
     delete_multiple_files(files_to_delete)
     
     return None
@@ -1,7 +1,8 @@
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.core.security import oauth2_scheme, decode_access_token
 from app.models.user import User, UserRole
 
@@ -60,3 +61,19 @@ async def get_current_editor_user(
             detail="Editor access required"
         )
     return current_user
+
+
+def get_websocket_admin(token: Optional[str]) -> Optional[User]:
+    """Resolve admin user from a ?token= query parameter (browsers can't set WebSocket headers)"""
+    payload = decode_access_token(token) if token else None
+    if payload is None or payload.get("sub") is None:
+        return None
+    
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == payload["sub"]).first()
+        if user is None or not user.is_active or user.role != UserRole.ADMIN:
+            return None
+        return user
+    finally:
+        db.close()
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.config import settings
+from app.core.health import loop_monitor
+from app.core.loop_watchdog import loop_watchdog
+from app.models.user import User
+from app.api.deps import get_current_admin_user
+
+router = APIRouter()
+
+
+@router.get("/event-loop")
+async def get_event_loop_report(
+    limit: int = 20,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Event loop lag and top blocking handlers (admin only)"""
+    return {
+        "watchdog_enabled": loop_watchdog.running,
+        "threshold_ms": round(loop_watchdog.threshold * 1000, 1),
+        "lag_ms": round(loop_monitor.current_lag * 1000, 1),
+        "max_lag_ms": round(loop_monitor.max_lag * 1000, 1),
+        "stalls": loop_watchdog.stalls,
+        "top_offenders": loop_watchdog.top_offenders(limit)
+    }
+
+
+@router.delete("/event-loop", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_event_loop_report(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Clear recorded offenders (admin only)"""
+    loop_watchdog.reset()
+    return None
@@ -1,12 +1,18 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from datetime import datetime, time
+import os
 
 from app.core.database import get_db
+from app.core.jobs import jobs
+from app.core.playlist_snapshots import playlist_snapshots
+from app.core.read_models import playlist_list, playlist_with_content
+from app.core.response_cache import response_cache
 from app.models.user import User
 from app.models.playlist import Playlist, PlaylistItem, PlaylistSchedule
-from app.models.content import ContentItem
+from app.models.content import ContentItem, ContentType
 from app.schemas.playlist import (
     PlaylistCreate,
     PlaylistUpdate,
@@ -21,6 +27,9 @@ from app.schemas.playlist import (
     PlaylistScheduleResponse
 )
 from app.api.deps import get_current_active_user, get_current_admin_user
+from app.utils.page_renderer import page_renderer
+from app.utils.timeline import now_ms, position_at, cycle_order
+from app.api.websocket import build_playlist_data
 
 router = APIRouter()
 
@@ -32,8 +41,8 @@ async def list_playlists(
     current_user: User = Depends(get_current_active_user)
 ):
     """List all playlists"""
-    playlists = db.query(Playlist).offset(skip).limit(limit).all()
-    return playlists
+    # Column projection rendered directly (response_model documents the shape)
+    return ORJSONResponse(playlist_list(db, skip, limit))
 
 
 @router.post("", response_model=PlaylistResponse, status_code=status.HTTP_201_CREATED)
@@ -74,45 +83,56 @@ async def get_playlist(
 @router.get("/{playlist_id}/full", response_model=PlaylistWithContent)
 async def get_playlist_with_content(
     playlist_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get playlist with full content item details and schedules for display"""
-    from app.models.playlist import PlaylistSchedule
+    etag, cached = response_cache.lookup(request, "playlist", playlist_id)
+    if cached is not None:
+        return cached
     
-    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
+    playlist = playlist_with_content(db, playlist_id)
     if not playlist:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Playlist not found"
         )
     
-    # Get items with content details
-    items_detailed = []
-    for item in sorted(playlist.items, key=lambda x: x.order):
-        content_item = db.query(ContentItem).filter(ContentItem.id == item.content_item_id).first()
-        if content_item:
-            items_detailed.append({
-                "id": item.id,
-                "order": item.order,
-                "duration": item.duration_override or content_item.duration,
-                "content_item": {
-                    "id": content_item.id,
-                    "content_id": content_item.content_id,
-                    "item_number": content_item.item_number,
-                    "file_path": content_item.file_path,
-                    "mime_type": content_item.mime_type,
-                    "duration": content_item.duration
-                }
-            })
-    
-    # Get schedules
-    schedules = db.query(PlaylistSchedule).filter(PlaylistSchedule.playlist_id == playlist_id).all()
+    return response_cache.render("playlist", playlist_id, etag, playlist)
+
+
+@router.get("/{playlist_id}/timeline")
+async def get_playlist_timeline(
+    playlist_id: int,
+    at: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get playback timeline and the item on screen now (or at server time `at`, ms)"""
+    playlist_data = build_playlist_data(playlist_id, db)
+    if not playlist_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Playlist not found"
+        )
+    
+    server_time = at if at is not None else now_ms()
+    timeline = playlist_data["timeline"]
+    position = position_at(timeline, server_time)
+    if position:
+        position["playlist_item_id"] = playlist_data["items"][position["item_index"]]["id"]
+    
+    # Order of the current cycle as playlist item IDs (differs per cycle when shuffled)
+    cycle = position["cycle"] if position else 0
+    order = cycle_order(len(playlist_data["items"]), timeline["shuffle"], timeline["seed"], cycle & 0xFFFFFFFF)
     
     return {
-        **playlist.__dict__,
-        "items_detailed": items_detailed,
-        "schedules": [s.__dict__ for s in schedules]  # ← NEU!
+        "playlist_id": playlist_id,
+        "server_time": server_time,
+        "timeline": timeline,
+        "position": position,
+        "cycle_order": [playlist_data["items"][index]["id"] for index in order]
     }
 
 @router.put("/{playlist_id}", response_model=PlaylistResponse)
@@ -136,6 +156,8 @@ async def update_playlist(
     
     db.commit()
     db.refresh(db_playlist)
+    playlist_snapshots.invalidate(playlist_id)
+    response_cache.bump("playlist", playlist_id)
     
     return db_playlist
 
@@ -156,6 +178,8 @@ async def delete_playlist(
     
     db.delete(db_playlist)
     db.commit()
+    playlist_snapshots.invalidate(playlist_id)
+    response_cache.bump("playlist", playlist_id)
     
     return None
 
@@ -195,6 +219,18 @@ async def add_item_to_playlist(
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    playlist_snapshots.invalidate(playlist_id)
+    response_cache.bump("playlist", playlist_id)
+    
+    # Lazy PDF mode: render page now so displays don't wait for it
+    if content_item.content.content_type == ContentType.PDF and not os.path.exists(content_item.file_path):
+        jobs.submit(
+            "pdf_page",
+            page_renderer.render,
+            content_item.content.file_path,
+            content_item.item_number,
+            content_item.file_path
+        )
     
     return db_item
 
@@ -220,6 +256,8 @@ async def remove_item_from_playlist(
     
     db.delete(db_item)
     db.commit()
+    playlist_snapshots.invalidate(playlist_id)
+    response_cache.bump("playlist", playlist_id)
     
     return None
 
@@ -250,6 +288,8 @@ async def reorder_playlist_items(
             db_item.order = item_order["order"]
     
     db.commit()
+    playlist_snapshots.invalidate(playlist_id)
+    response_cache.bump("playlist", playlist_id)
     
     return {"message": "Playlist items reordered successfully"}
 
@@ -314,6 +354,7 @@ async def create_playlist_schedule(
     db.add(db_schedule)
     db.commit()
     db.refresh(db_schedule)
+    response_cache.bump("playlist", playlist_id)
     
     return db_schedule
 
@@ -366,6 +407,7 @@ async def update_playlist_schedule(
     
     db.commit()
     db.refresh(db_schedule)
+    response_cache.bump("playlist", playlist_id)
     
     return db_schedule
 
@@ -393,6 +435,7 @@ async def delete_playlist_schedule(
     
     db.delete(db_schedule)
     db.commit()
+    response_cache.bump("playlist", playlist_id)
     
     return None
 
@@ -0,0 +1,303 @@
+from typing import List, Optional
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.live_view import live_view
+from app.core.presence import utc_range, uptime_report
+from app.core.response_cache import response_cache
+from app.core.websocket_manager import manager
+from app.models.user import User
+from app.models.screen import Screen, ScreenGroup, screen_group_members
+from app.models.playlist import Playlist
+from app.schemas.screen import (
+    ScreenGroupCreate,
+    ScreenGroupUpdate,
+    ScreenGroupResponse,
+    ScreenGroupMembers,
+    ScreenGroupAssign,
+    ScreenGroupAssignResponse,
+    ScreenGroupUptime
+)
+from app.api.deps import get_current_active_user, get_current_admin_user
+from app.api.websocket import build_playlist_data, empty_playlist_data
+
+router = APIRouter()
+
+
+def _get_group_or_404(db: Session, group_id: int) -> ScreenGroup:
+    group = db.query(ScreenGroup).filter(ScreenGroup.id == group_id).first()
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Screen group not found"
+        )
+    return group
+
+
+def _member_ids_query(group_id: int):
+    return select(screen_group_members.c.screen_id).where(screen_group_members.c.group_id == group_id)
+
+
+def _group_response(db: Session, group: ScreenGroup) -> dict:
+    return {
+        "id": group.id,
+        "name": group.name,
+        "description": group.description,
+        "created_at": group.created_at,
+        "screen_ids": list(db.execute(_member_ids_query(group.id)).scalars())
+    }
+
+
+def _publish_members(db: Session, group_id: int):
+    """Push current membership to admin live views (only once someone watches)"""
+    if live_view.loaded:
+        live_view.set_group(group_id, db.execute(_member_ids_query(group_id)).scalars())
+
+
+def _add_members(db: Session, group_id: int, screen_ids: List[int]):
+    """Insert memberships that don't exist yet (404 if a screen is unknown)"""
+    screen_ids = set(screen_ids)
+    found = {screen_id for (screen_id,) in db.query(Screen.id).filter(Screen.id.in_(screen_ids)).all()}
+    missing = screen_ids - found
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Screens not found: {sorted(missing)}"
+        )
+    
+    existing = set(db.execute(_member_ids_query(group_id)).scalars())
+    new_ids = screen_ids - existing
+    if new_ids:
+        db.execute(
+            screen_group_members.insert(),
+            [{"group_id": group_id, "screen_id": screen_id} for screen_id in sorted(new_ids)]
+        )
+
+
+@router.get("", response_model=List[ScreenGroupResponse])
+async def list_screen_groups(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List all screen groups with member IDs"""
+    groups = db.query(ScreenGroup).order_by(ScreenGroup.name).all()
+    
+    # All memberships in one query
+    members = {}
+    for group_id, screen_id in db.execute(select(screen_group_members.c.group_id, screen_group_members.c.screen_id)):
+        members.setdefault(group_id, []).append(screen_id)
+    
+    return [
+        {
+            "id": group.id,
+            "name": group.name,
+            "description": group.description,
+            "created_at": group.created_at,
+            "screen_ids": members.get(group.id, [])
+        }
+        for group in groups
+    ]
+
+
+@router.post("", response_model=ScreenGroupResponse, status_code=status.HTTP_201_CREATED)
+async def create_screen_group(
+    group: ScreenGroupCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Create a screen group"""
+    if db.query(ScreenGroup).filter(ScreenGroup.name == group.name).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Screen group with this name already exists"
+        )
+    
+    db_group = ScreenGroup(name=group.name, description=group.description)
+    db.add(db_group)
+    db.flush()
+    
+    if group.screen_ids:
+        _add_members(db, db_group.id, group.screen_ids)
+    
+    db.commit()
+    db.refresh(db_group)
+    _publish_members(db, db_group.id)
+    
+    return _group_response(db, db_group)
+
+
+@router.get("/{group_id}", response_model=ScreenGroupResponse)
+async def get_screen_group(
+    group_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get screen group by ID"""
+    return _group_response(db, _get_group_or_404(db, group_id))
+
+
+@router.put("/{group_id}", response_model=ScreenGroupResponse)
+async def update_screen_group(
+    group_id: int,
+    group_update: ScreenGroupUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Update screen group"""
+    db_group = _get_group_or_404(db, group_id)
+    
+    if group_update.name and group_update.name != db_group.name:
+        if db.query(ScreenGroup).filter(ScreenGroup.name == group_update.name).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Screen group with this name already exists"
+            )
+    
+    for field, value in group_update.model_dump(exclude_unset=True).items():
+        setattr(db_group, field, value)
+    
+    db.commit()
+    db.refresh(db_group)
+    
+    return _group_response(db, db_group)
+
+
+@router.delete("/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_screen_group(
+    group_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Delete screen group (screens are kept)"""
+    db_group = _get_group_or_404(db, group_id)
+    
+    db.execute(screen_group_members.delete().where(screen_group_members.c.group_id == group_id))
+    db.delete(db_group)
+    db.commit()
+    live_view.remove_group(group_id)
+    
+    return None
+
+
+@router.post("/{group_id}/screens", response_model=ScreenGroupResponse)
+async def add_screens_to_group(
+    group_id: int,
+    members: ScreenGroupMembers,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Add screens to group"""
+    db_group = _get_group_or_404(db, group_id)
+    _add_members(db, group_id, members.screen_ids)
+    db.commit()
+    _publish_members(db, group_id)
+    
+    return _group_response(db, db_group)
+
+
+@router.delete("/{group_id}/screens/{screen_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_screen_from_group(
+    group_id: int,
+    screen_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Remove screen from group"""
+    _get_group_or_404(db, group_id)
+    
+    result = db.execute(screen_group_members.delete().where(
+        screen_group_members.c.group_id == group_id,
+        screen_group_members.c.screen_id == screen_id
+    ))
+    if not result.rowcount:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Screen is not in this group"
+        )
+    db.commit()
+    _publish_members(db, group_id)
+    
+    return None
+
+
+@router.put("/{group_id}/playlist", response_model=ScreenGroupAssignResponse)
+async def assign_playlist_to_group(
+    group_id: int,
+    assign: ScreenGroupAssign,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Assign playlist to all screens of a group and push it to connected members"""
+    _get_group_or_404(db, group_id)
+    
+    if assign.playlist_id is not None:
+        if not db.query(Playlist.id).filter(Playlist.id == assign.playlist_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Playlist not found"
+            )
+    
+    # One UPDATE for all members
+    member_ids = _member_ids_query(group_id)
+    updated = db.query(Screen).filter(Screen.id.in_(member_ids)).update(
+        {Screen.assigned_playlist_id: assign.playlist_id}, synchronize_session=False
+    )
+    db.commit()
+    response_cache.bump("screens")
+    
+    if live_view.loaded:
+        for screen_id in db.execute(member_ids).scalars():
+            live_view.update_screen(screen_id, assigned_playlist_id=assign.playlist_id)
+    
+    notified = 0
+    if assign.push and updated:
+        if assign.playlist_id is not None:
+            playlist_data = build_playlist_data(assign.playlist_id, db)
+        else:
+            playlist_data = empty_playlist_data()
+        
+        if playlist_data:
+            names = [name for (name,) in db.query(Screen.name).filter(Screen.id.in_(member_ids)).all()]
+            # One serialization, one frame for all connected members
+            notified = await manager.multicast(names, {"type": "playlist_update", "playlist": playlist_data})
+    
+    return {
+        "group_id": group_id,
+        "playlist_id": assign.playlist_id,
+        "screens_updated": updated,
+        "screens_notified": notified
+    }
+
+
+@router.get("/{group_id}/uptime", response_model=ScreenGroupUptime)
+async def get_group_uptime(
+    group_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Uptime of all group members over a time range (default last 7 days)"""
+    _get_group_or_404(db, group_id)
+    try:
+        start, end = utc_range(start, end, timedelta(days=7))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    screens = db.query(Screen).filter(Screen.id.in_(_member_ids_query(group_id))).order_by(Screen.name).all()
+    report = uptime_report(db, screens, start, end)
+    percents = [entry["uptime_percent"] for entry in report if entry["uptime_percent"] is not None]
+    
+    return {
+        "group_id": group_id,
+        "start": start,
+        "end": end,
+        "uptime_percent": round(sum(percents) / len(percents), 2) if percents else None,
+        "screens": report
+    }
@@ -1,12 +1,23 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.core.database import get_db
+from app.core.presence import utc_range, uptime_report, presence_intervals
+from app.core.telemetry import telemetry
+from app.core.live_view import live_view, screen_state
+from app.core.response_cache import response_cache
 from app.models.user import User
-from app.models.screen import Screen
-from app.schemas.screen import ScreenCreate, ScreenUpdate, ScreenResponse, ScreenStatus
+from app.models.screen import Screen, screen_group_members
+from app.schemas.screen import (
+    ScreenCreate,
+    ScreenUpdate,
+    ScreenResponse,
+    ScreenStatus,
+    ScreenUptime,
+    ScreenPresenceResponse
+)
 from app.api.deps import get_current_active_user, get_current_admin_user
 
 router = APIRouter()
@@ -14,14 +25,21 @@ router = APIRouter()
 
 @router.get("", response_model=List[ScreenResponse])
 async def list_screens(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """List all screens"""
-    screens = db.query(Screen).offset(skip).limit(limit).all()
-    return screens
+    etag, cached = response_cache.lookup(request, "screens", (skip, limit))
+    if cached is not None:
+        return cached
+    
+    # Validated here: the schema fills in display fields the model doesn't store
+    screens = db.query(Screen).order_by(Screen.id).offset(skip).limit(limit).all()
+    data = [ScreenResponse.model_validate(screen).model_dump() for screen in screens]
+    return response_cache.render("screens", (skip, limit), etag, data)
 
 
 @router.post("", response_model=ScreenResponse, status_code=status.HTTP_201_CREATED)
@@ -42,10 +60,51 @@ async def create_screen(
     db.add(db_screen)
     db.commit()
     db.refresh(db_screen)
+    live_view.update_screen(db_screen.id, **screen_state(db_screen))
+    response_cache.bump("screens")
     
     return db_screen
 
 
+def _uptime_range(start: Optional[datetime], end: Optional[datetime]):
+    try:
+        return utc_range(start, end, timedelta(days=7))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/uptime", response_model=List[ScreenUptime])
+async def get_screens_uptime(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    group_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Uptime per screen over a time range (default last 7 days)"""
+    start, end = _uptime_range(start, end)
+    
+    query = db.query(Screen)
+    if group_id is not None:
+        query = query.join(screen_group_members, screen_group_members.c.screen_id == Screen.id).filter(
+            screen_group_members.c.group_id == group_id
+        )
+    screens = query.order_by(Screen.name).all()
+    
+    return uptime_report(db, screens, start, end)
+
+
+@router.get("/telemetry")
+async def get_screens_telemetry(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Latest telemetry sample of every reporting screen (by screen name)"""
+    return telemetry.latest()
+
+
 @router.get("/{screen_id}", response_model=ScreenResponse)
 async def get_screen(
     screen_id: int,
@@ -91,6 +150,8 @@ async def update_screen(
     
     db.commit()
     db.refresh(db_screen)
+    live_view.update_screen(db_screen.id, **screen_state(db_screen))
+    response_cache.bump("screens")
     
     return db_screen
 
@@ -111,6 +172,9 @@ async def delete_screen(
     
     db.delete(db_screen)
     db.commit()
+    telemetry.forget(db_screen.name)
+    live_view.remove_screen(screen_id)
+    response_cache.bump("screens")
     
     return None
 
@@ -135,3 +199,50 @@ async def get_screen_status(
         "last_seen": screen.last_seen,
         "assigned_playlist": screen.assigned_playlist_id
     }
+
+
+@router.get("/{screen_id}/presence", response_model=ScreenPresenceResponse)
+async def get_screen_presence(
+    screen_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Online intervals and uptime of a screen (intervals kept for PRESENCE_RAW_DAYS)"""
+    screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    if not screen:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Screen not found"
+        )
+    
+    start, end = _uptime_range(start, end)
+    report = uptime_report(db, [screen], start, end)[0]
+    
+    return {
+        **report,
+        "start": start,
+        "end": end,
+        "intervals": [
+            {"started_at": started_at, "ended_at": ended_at}
+            for started_at, ended_at in presence_intervals(db, screen_id, start, end)
+        ]
+    }
+
+
+@router.get("/{screen_id}/telemetry")
+async def get_screen_telemetry(
+    screen_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Recent telemetry samples of a screen (in-memory ring buffer, oldest first)"""
+    screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    if not screen:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Screen not found"
+        )
+    
+    return {"screen_id": screen.id, "name": screen.name, "samples": telemetry.history_for(screen.name)}
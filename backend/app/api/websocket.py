@@ -1,52 +1,140 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from typing import Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
 import json
+import logging
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
+from app.core.logging_config import screen_id_var
+from app.core.admission import screen_admission, ws_admissions
+from app.core.drain import connection_drain
+from app.core.playlist_snapshots import playlist_snapshots
+from app.core.proof_of_play import play_events
+from app.core.read_models import display_playlist
+from app.core.response_cache import response_cache
+from app.core.presence import open_interval, close_interval
+from app.core.telemetry import telemetry
+from app.core.live_view import live_view, screen_state
 from app.core.websocket_manager import manager
 from app.models.screen import Screen
-from app.models.playlist import Playlist, PlaylistItem
-from app.models.content import ContentItem
+from app.utils.timeline import build_timeline, now_ms
+from app.api.deps import get_websocket_admin
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws")
 
 
+# WebSocket connections live for hours - never hold a pooled DB session for
+# the whole connection. Each operation opens a short session in the threadpool.
+
+def _register_screen(screen_name: str) -> dict:
+    """Find or auto-register screen and mark it online, returns its live view state"""
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        screen = db.query(Screen).filter(Screen.name == screen_name).first()
+        previous_last_seen = None
+        created = False
+        if not screen:
+            # Auto-register screen
+            screen = Screen(
+                name=screen_name,
+                location="Auto-registered",
+                is_active=True,
+                is_online=True,
+                last_seen=now
+            )
+            db.add(screen)
+            try:
+                db.flush()
+                created = True
+            except IntegrityError:
+                # A parallel connection of the same new screen registered it first
+                db.rollback()
+                screen = db.query(Screen).filter(Screen.name == screen_name).one()
+        
+        if not created:
+            # Update screen status
+            previous_last_seen = screen.last_seen.replace(tzinfo=None) if screen.last_seen else None
+            screen.is_online = True
+            screen.last_seen = now
+        
+        open_interval(db, screen.id, previous_last_seen, now)
+        db.commit()
+        return screen_state(screen)
+    finally:
+        db.close()
+
+
+def _update_screen_status(screen_name: str, is_online: bool = None):
+    """Touch last_seen (and optionally online flag) with a single UPDATE"""
+    now = datetime.utcnow()
+    values = {Screen.last_seen: now}
+    if is_online is not None:
+        values[Screen.is_online] = is_online
+    
+    db = SessionLocal()
+    try:
+        db.query(Screen).filter(Screen.name == screen_name).update(values, synchronize_session=False)
+        if is_online is False:
+            close_interval(db, screen_name, now)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _load_playlist_data(playlist_id: int):
+    db = SessionLocal()
+    try:
+        return build_playlist_data(playlist_id, db)
+    finally:
+        db.close()
+
+
 @router.websocket("/screen/{screen_name}")
 async def screen_websocket(
     websocket: WebSocket,
-    screen_name: str,
-    db: Session = Depends(get_db)
+    screen_name: str
 ):
     """WebSocket endpoint for display screens"""
+    screen_id_var.set(screen_name)  # Correlation id for all logs of this connection
     
-    # Find or create screen
-    screen = db.query(Screen).filter(Screen.name == screen_name).first()
-    if not screen:
-        # Auto-register screen
-        screen = Screen(
-            name=screen_name,
-            location="Auto-registered",
-            is_active=True,
-            is_online=True,
-            last_seen=datetime.utcnow()
-        )
-        db.add(screen)
-        db.commit()
-        db.refresh(screen)
-    else:
-        # Update screen status
-        screen.is_online = True
-        screen.last_seen = datetime.utcnow()
-        db.commit()
+    # Shutting down: send the display to the next instance
+    if connection_drain.active:
+        await websocket.accept()
+        await websocket.close(code=status.WS_1012_SERVICE_RESTART, reason=f"retry-after={connection_drain.retry_after():.1f}")
+        return
     
-    # Connect WebSocket
-    await manager.connect(websocket, screen_name)
+    # Admission control: spread reconnect waves (e.g. after a restart) over time.
+    # The close frame tells the display when to come back.
+    retry_after = screen_admission.acquire()
+    if retry_after:
+        ws_admissions.inc(result="deferred")
+        await websocket.accept()
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=f"retry-after={retry_after:.1f}")
+        return
+    ws_admissions.inc(result="admitted")
+    
+    # Connect WebSocket first: a previous socket of this screen is taken over
+    # now, so its late disconnect can't mark the screen offline after we register
+    session_id = await manager.connect(websocket, screen_name)
+    registered = False  # No offline write if registering failed (DB down, pool exhausted)
     
     try:
-        # Send initial playlist if assigned
-        if screen.assigned_playlist_id:
-            playlist_data = await get_playlist_data(screen.assigned_playlist_id, db)
+        # Find or create screen
+        state = await run_in_threadpool(_register_screen, screen_name)
+        registered = True
+        assigned_playlist_id = state["assigned_playlist_id"]
+        live_view.update_screen(state["id"], **state)
+        response_cache.bump("screens")  # Online flag changed; pongs only touch last_seen and don't bump
+        
+        # Send initial playlist if assigned (shared snapshot, built once per playlist)
+        if assigned_playlist_id:
+            playlist_data = await playlist_snapshots.get(assigned_playlist_id, _load_playlist_data)
             if playlist_data:
                 await manager.send_personal_message(
                     {
@@ -63,74 +151,180 @@ async def screen_websocket(
             
             # Handle different message types
             if message.get("type") == "pong":
-                # Heartbeat response
-                screen.last_seen = datetime.utcnow()
-                db.commit()
+                # Heartbeat response (not while draining: last_seen tells finish() who reconnected elsewhere)
+                if not connection_drain.active:
+                    await run_in_threadpool(_update_screen_status, screen_name)
+                logger.debug("Pong from %s", screen_name, extra={"event": "pong"})
+            
+            elif message.get("type") == "time_sync":
+                # NTP-style clock sync: client t0, server receive t1 / send t2
+                received = now_ms()
+                await manager.send_personal_message(
+                    {"type": "time_sync", "t0": message.get("t0"), "t1": received, "t2": now_ms()},
+                    screen_name
+                )
+            
+            elif message.get("type") == "play_event":
+                # Proof of play: buffered, written in batches
+                play_events.add(screen_name, message)
+            
+            elif message.get("type") == "telemetry":
+                # Health sample, kept in memory and streamed to admins
+                sample = telemetry.record(screen_name, message)
+                live_view.update_screen_by_name(
+                    screen_name,
+                    playlist_item_id=sample.get("playlist_item_id"),
+                    content_id=sample.get("content_id")
+                )
             
             elif message.get("type") == "status_update":
-                # Display status update (currently playing, etc.)
-                print(f"Status update from {screen_name}: {message.get('status')}")
+                # Legacy status report (older display pages)
+                telemetry.record(screen_name, message.get("status") or {})
             
             elif message.get("type") == "error":
                 # Display reported an error
-                print(f"Error from {screen_name}: {message.get('error')}")
+                telemetry.record_error(screen_name, message.get("error"))
+                logger.warning("Error from %s: %s", screen_name, message.get("error"), extra={"event": "display_error"})
     
     except WebSocketDisconnect:
-        manager.disconnect(screen_name)
-        
-        # Update screen status
-        screen.is_online = False
-        screen.last_seen = datetime.utcnow()
-        db.commit()
-        
-        print(f"Screen {screen_name} disconnected")
+        # A session replaced by a newer connection leaves the screen online
+        if manager.disconnect(screen_name, session_id) and registered:
+            await _screen_gone(screen_name)
+        logger.info("Screen %s disconnected", screen_name)
     
     except Exception as e:
-        print(f"WebSocket error for {screen_name}: {e}")
-        manager.disconnect(screen_name)
+        logger.exception("WebSocket error for %s: %s", screen_name, e)
+        if manager.disconnect(screen_name, session_id) and registered:
+            await _screen_gone(screen_name)
+
+
+async def _screen_gone(screen_name: str):
+    """Mark a disconnected screen offline (in bulk at shutdown while draining)"""
+    live_view.update_screen_by_name(screen_name, is_online=False, last_seen=datetime.utcnow())
+    if connection_drain.active:
+        connection_drain.track(screen_name)
+    else:
+        await run_in_threadpool(_update_screen_status, screen_name, False)
+        response_cache.bump("screens")
+
+
+@router.websocket("/admin/telemetry")
+async def admin_telemetry_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = None
+):
+    """Telemetry stream for admin dashboards (coalesced, max. one frame per interval)"""
+    user = await run_in_threadpool(get_websocket_admin, token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    
+    try:
+        # Inside the try: the snapshot send fails if the client is already gone
+        subscriber = await telemetry.subscribe(websocket)
         
-        screen.is_online = False
-        db.commit()
+        while True:
+            message = json.loads(await websocket.receive_text())
+            
+            if message.get("type") == "subscribe":
+                # {"type": "subscribe", "screens": ["lobby-1", ...]} or null for all
+                screens = message.get("screens")
+                telemetry.set_filter(subscriber, screens if isinstance(screens, list) else None)
+            
+            elif message.get("type") == "history":
+                screen = str(message.get("screen"))
+                await websocket.send_text(json.dumps({
+                    "type": "telemetry_history",
+                    "screen": screen,
+                    "samples": telemetry.history_for(screen)
+                }))
+    
+    except WebSocketDisconnect:
+        pass
+    
+    except Exception as e:
+        logger.warning("Admin telemetry socket error: %s", e)
+    
+    finally:
+        telemetry.unsubscribe(websocket)
 
 
-async def get_playlist_data(playlist_id: int, db: Session) -> dict:
-    """Get playlist data with all content item details"""
-    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
-    if not playlist:
-        return None
+@router.websocket("/admin/live")
+async def admin_live_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = None
+):
+    """Live view for admin dashboards: topic subscriptions, pushed diffs instead of polling"""
+    user = await run_in_threadpool(get_websocket_admin, token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    subscriber = await live_view.register(websocket)
     
-    items = []
     try:
-        for item in sorted(playlist.items, key=lambda x: x.order):
-            # Get the ContentItem using content_item_id
-            content_item = db.query(ContentItem).filter(ContentItem.id == item.content_item_id).first()
-            if content_item:
-                items.append({
-                    "id": item.id,
-                    "order": item.order,
-                    "duration": item.duration_override or content_item.duration,
-                    "content": {
-                        "id": content_item.id,
-                        "content_id": content_item.content_id,
-                        "item_number": content_item.item_number,
-                        "file_path": content_item.file_path,
-                        "content_type": "image",
-                        "mime_type": content_item.mime_type
-                    }
-                })
+        while True:
+            message = json.loads(await websocket.receive_text())
+            topics = message.get("topics")
+            if not isinstance(topics, list):
+                continue
+            
+            if message.get("type") == "subscribe":
+                # {"type": "subscribe", "topics": ["fleet", "jobs", "screen:3", "group:1"]}
+                snapshot = await live_view.subscribe(subscriber, topics)
+                await websocket.send_text(json.dumps({"type": "snapshot", "topics": snapshot}))
+            
+            elif message.get("type") == "unsubscribe":
+                live_view.unsubscribe(subscriber, topics)
+    
+    except WebSocketDisconnect:
+        pass
+    
     except Exception as e:
-        print(f"Error building playlist data: {e}")
-        return None
+        logger.warning("Admin live view socket error: %s", e)
     
+    finally:
+        live_view.unregister(websocket)
+
+
+async def get_playlist_data(playlist_id: int, db: Session) -> dict:
+    """Get playlist data with all content item details"""
+    return build_playlist_data(playlist_id, db)
+
+
+def empty_playlist_data() -> dict:
+    """Payload that clears a display (no playlist assigned), same shape as build_playlist_data"""
     return {
-        "id": playlist.id,
-        "name": playlist.name,
-        "loop": playlist.loop,
-        "shuffle": playlist.shuffle,
-        "items": items
+        "id": None,
+        "name": None,
+        "loop": True,
+        "shuffle": False,
+        "items": [],
+        "timeline": build_timeline([], True, False, seed=0)
     }
 
 
+def build_playlist_data(playlist_id: int, db: Session) -> dict:
+    """Playlist payload for displays (sync, for use in the threadpool)"""
+    try:
+        # Items in one joined query, content type from the content row
+        playlist = display_playlist(db, playlist_id)
+    except Exception as e:
+        logger.exception("Error building playlist data: %s", e)
+        return None
+    if playlist is None:
+        return None
+    
+    # Displays derive the current item from server time (no per-slide messages)
+    playlist["timeline"] = build_timeline(
+        [item["duration"] for item in playlist["items"]], playlist["loop"], playlist["shuffle"], seed=playlist["id"]
+    )
+    return playlist
+
+
 @router.post("/broadcast")
 async def broadcast_message(message: dict):
     """Broadcast message to all connected screens (admin use)"""
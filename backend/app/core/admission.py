@@ -0,0 +1,53 @@
+"""Admission control for display WebSockets.
+
+After a backend restart every display reconnects at once, and each connect
+costs a screen lookup, a commit and a playlist payload. Connects are admitted
+through a token bucket (WS_ADMISSION_RATE per second, bursts up to
+WS_ADMISSION_BURST). Everything beyond that is closed with 1013 (Try Again
+Later) and a ``retry-after=<seconds>`` reason. Deferred displays get
+consecutive slots behind the ones already waiting, so a backlog drains at
+the admission rate instead of coming back as the next wave.
+"""
+from typing import Optional
+import time
+
+from app.core.config import settings
+from app.core.metrics import registry, Counter
+
+ws_admissions = registry.register(Counter(
+    "ds_ws_admissions_total", "Display WebSocket connects by admission result", ("result",)
+))
+
+
+class TokenBucket:
+    """Token bucket with a virtual queue for deferred callers"""
+
+    def __init__(self, rate: float, burst: int, max_delay: float):
+        self.rate = rate
+        self.burst = burst
+        self.max_delay = max_delay
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._backlog_until = 0.0  # Monotonic time of the last slot handed out
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, now: Optional[float] = None) -> float:
+        """Take a token: 0.0 if admitted, otherwise seconds to wait before retrying"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        # Next free slot behind everyone already told to come back
+        self._backlog_until = min(max(self._backlog_until, now) + 1.0 / self.rate, now + self.max_delay)
+        return self._backlog_until - now
+
+
+# Global instance
+screen_admission = TokenBucket(
+    settings.WS_ADMISSION_RATE, settings.WS_ADMISSION_BURST, settings.WS_ADMISSION_MAX_DELAY
+)
@@ -0,0 +1,129 @@
+"""Graceful drain of display connections before shutdown.
+
+uvicorn closes every WebSocket as soon as it starts shutting down, before
+the lifespan shutdown runs. So SIGTERM is intercepted first:
+
+1. New display connects are refused (1012 + retry-after).
+2. Each display gets a ``reconnect`` message, delays staggered evenly over
+   DRAIN_STAGGER_SECONDS, so they move to the new instance one by one and
+   keep playing meanwhile.
+3. Once they are gone (or DRAIN_TIMEOUT after the stagger window),
+   buffered proof-of-play events are flushed and the signal is passed on
+   to uvicorn.
+
+Disconnects during a drain don't write to the database one by one. At
+shutdown, ``finish`` marks the drained screens offline in one bulk update,
+except those that have been seen since (reconnected to another instance).
+"""
+from typing import Optional, Set
+from datetime import datetime
+import asyncio
+import logging
+import signal
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.presence import mark_offline
+from app.core.proof_of_play import play_events
+from app.core.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionDrain:
+    """Drains display connections on SIGTERM, then lets uvicorn shut down"""
+
+    def __init__(self, stagger: float, timeout: float):
+        self.stagger = stagger
+        self.timeout = timeout
+        self.active = False
+        self.started_at: Optional[datetime] = None
+        self._drained: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def install_signal_handler(self):
+        """Run the drain before uvicorn's own SIGTERM handler (call from the lifespan)"""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+        if not callable(previous):
+            return
+        loop = asyncio.get_running_loop()
+
+        def handler(signum, frame):
+            if self._task is not None:
+                previous(signum, frame)  # Second SIGTERM: stop now
+                return
+            loop.call_soon_threadsafe(self._start, previous, signum, frame)
+
+        signal.signal(signal.SIGTERM, handler)
+
+    def _start(self, previous, signum, frame):
+        async def drain_then_exit():
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error("Connection drain failed: %s", e)
+            finally:
+                previous(signum, frame)
+
+        self._task = asyncio.create_task(drain_then_exit())
+
+    def retry_after(self) -> float:
+        """Hint for displays refused while draining"""
+        return self.stagger
+
+    async def drain(self) -> int:
+        """Ask all connected displays to reconnect (staggered), wait until they left"""
+        self.active = True
+        self.started_at = datetime.utcnow()
+        names = manager.get_connected_screens()
+        self._drained.update(names)
+        logger.info("Draining %d display connections over %.1fs", len(names), self.stagger)
+
+        step_ms = self.stagger * 1000 / len(names) if names else 0
+        await asyncio.gather(*(
+            manager.send_personal_message({"type": "reconnect", "delay_ms": int(index * step_ms)}, name)
+            for index, name in enumerate(names)
+        ))
+
+        deadline = time.monotonic() + self.stagger + self.timeout
+        while manager.active_connections and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        if manager.active_connections:
+            logger.warning("%d displays still connected after drain", len(manager.active_connections))
+
+        await play_events.flush()
+        return len(names)
+
+    def track(self, screen_name: str):
+        """Display left during a drain, marked offline by ``finish``"""
+        self._drained.add(screen_name)
+
+    async def finish(self) -> int:
+        """Bulk offline update for drained screens (lifespan shutdown)"""
+        if not self.active:
+            return 0
+        names = self._drained | set(manager.get_connected_screens())
+        if not names:
+            return 0
+        count = await run_in_threadpool(self._mark_offline, names)
+        logger.info("Marked %d drained screens offline", count)
+        return count
+
+    def _mark_offline(self, names: Set[str]) -> int:
+        db = SessionLocal()
+        try:
+            count = mark_offline(db, names, self.started_at, datetime.utcnow())
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+
+# Global instance
+connection_drain = ConnectionDrain(settings.DRAIN_STAGGER_SECONDS, settings.DRAIN_TIMEOUT)
@@ -0,0 +1,148 @@
+from typing import Optional
+from collections import deque
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import registry, Gauge
+
+
+event_loop_lag = registry.register(Gauge(
+    "ds_event_loop_lag_seconds", "Event loop lag (sleep overshoot) of the last sample"
+))
+
+
+class LoopLagMonitor:
+    """Measures event loop lag with a background sampler task
+
+    The sampler sleeps for a fixed interval; any overshoot is time the loop
+    spent running something else (blocking handlers, sync DB/PIL calls).
+    """
+
+    def __init__(self, interval: float, window: int = 20):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self.last_tick: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            lag = max(0.0, now - expected)
+            self.samples.append(lag)
+            self.last_tick = now
+            event_loop_lag.set(lag)
+
+    @property
+    def current_lag(self) -> float:
+        """Lag of last sample, or time since an overdue tick (loop stuck right now)"""
+        if self.last_tick is None:
+            return 0.0
+        overdue = asyncio.get_running_loop().time() - self.last_tick - self.interval
+        return max(self.samples[-1] if self.samples else 0.0, overdue, 0.0)
+
+    @property
+    def max_lag(self) -> float:
+        """Worst lag in the sample window"""
+        return max(self.samples, default=0.0)
+
+
+# Global instance
+loop_monitor = LoopLagMonitor(settings.LOOP_LAG_INTERVAL)
+
+
+def _ping_db():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def check_database() -> dict:
+    """Ping DB with a timeout"""
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(asyncio.to_thread(_ping_db), timeout=settings.HEALTH_DB_TIMEOUT)
+        return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"timeout after {settings.HEALTH_DB_TIMEOUT}s"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def get_pool_stats() -> dict:
+    """SQLAlchemy connection pool usage"""
+    pool = engine.pool
+    stats = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
+
+
+def _check_storage() -> dict:
+    try:
+        with tempfile.NamedTemporaryFile(dir=settings.UPLOAD_DIR, prefix=".health"):
+            pass
+        writable = True
+    except OSError:
+        writable = False
+
+    try:
+        free_bytes = shutil.disk_usage(settings.UPLOAD_DIR).free
+    except OSError:
+        free_bytes = 0
+
+    return {
+        "ok": writable and free_bytes >= settings.HEALTH_MIN_FREE_BYTES,
+        "path": settings.UPLOAD_DIR,
+        "exists": os.path.isdir(settings.UPLOAD_DIR),
+        "writable": writable,
+        "free_bytes": free_bytes
+    }
+
+
+async def check_storage() -> dict:
+    """Upload dir writable and enough free space"""
+    return await asyncio.to_thread(_check_storage)
+
+
+def check_event_loop() -> dict:
+    """Fails when the loop is saturated"""
+    current = loop_monitor.current_lag
+    return {
+        "ok": current < settings.LOOP_LAG_READY_THRESHOLD,
+        "lag_ms": round(current * 1000, 1),
+        "max_lag_ms": round(loop_monitor.max_lag * 1000, 1),
+        "threshold_ms": round(settings.LOOP_LAG_READY_THRESHOLD * 1000, 1)
+    }
+
+
+async def get_readiness() -> dict:
+    """Run all readiness checks"""
+    loop = check_event_loop()
+    database, storage = await asyncio.gather(check_database(), check_storage())
+    database["pool"] = get_pool_stats()
+
+    checks = {"database": database, "storage": storage, "event_loop": loop}
+    return {
+        "status": "ready" if all(check["ok"] for check in checks.values()) else "unavailable",
+        "checks": checks
+    }
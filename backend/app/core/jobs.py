@@ -0,0 +1,98 @@
+from typing import Callable, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime
+import logging
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+from app.core.metrics import ingest_job_duration
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Background worker pool for ingestion jobs (video processing etc.)"""
+
+    MAX_FINISHED_JOBS = 500  # Keep status of recent jobs only
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._lock = threading.Lock()
+        self.jobs: Dict[str, dict] = OrderedDict()
+        self.version = 0  # Bumped on every status change (live view polls this)
+
+    def submit(self, kind: str, func: Callable, *args) -> str:
+        """Queue a job, returns job ID"""
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "status": "pending",
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None
+        }
+
+        with self._lock:
+            self.jobs[job_id] = job
+            self._trim()
+            self.version += 1
+
+        # Run in the submitter's context so job logs keep the request id
+        self._executor.submit(copy_context().run, self._run, job, func, *args)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Get job status"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def snapshot(self) -> List[dict]:
+        """Copies of all tracked jobs, oldest first"""
+        with self._lock:
+            return [dict(job) for job in self.jobs.values()]
+
+    def _run(self, job: dict, func: Callable, *args):
+        self._update(job, status="running", started_at=datetime.utcnow())
+        start = time.perf_counter()
+        result = {"status": "done"}
+        try:
+            func(*args)
+        except Exception as e:
+            result = {"status": "failed", "error": str(e)}
+            logger.exception("Job %s %s failed: %s", job["kind"], job["id"], e)
+        finally:
+            self._update(job, finished_at=datetime.utcnow(), **result)
+            ingest_job_duration.observe(time.perf_counter() - start, kind=job["kind"], status=result["status"])
+
+    def _update(self, job: dict, **fields):
+        """Status change from a worker thread (with the version bump, under the lock)"""
+        with self._lock:
+            job.update(fields)
+            self.version += 1
+
+    def _trim(self):
+        """Drop oldest finished jobs beyond MAX_FINISHED_JOBS"""
+        excess = len(self.jobs) - self.MAX_FINISHED_JOBS
+        if excess <= 0:
+            return
+        for job_id in list(self.jobs):
+            if excess <= 0:
+                break
+            if self.jobs[job_id]["status"] in ("done", "failed"):
+                del self.jobs[job_id]
+                excess -= 1
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting jobs"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+# Global instance
+jobs = JobQueue(settings.INGEST_WORKERS)
@@ -0,0 +1,338 @@
+"""Admin live view: topic subscriptions with coalesced diffs.
+
+Admin tabs open ``/ws/admin/live`` and subscribe to topics instead of
+polling REST endpoints:
+
+    fleet          screen/online/connected counts
+    jobs           ingestion jobs (status changes)
+    screen:<id>    one screen (online state, assignment, current item)
+    group:<id>     all members of a screen group, keyed by screen id
+
+Screen state is loaded from the database and kept current by the code
+paths that change it in this process (WebSocket connect/disconnect,
+telemetry, screen and group endpoints). A change only marks topics dirty;
+every 1 / LIVE_VIEW_MAX_RATE seconds each subscriber gets one frame with the
+diff of its dirty topics against what it was last sent.
+
+State is per worker process, like the display connections themselves, so
+changes made by other workers (screens connected there, their last_seen,
+edits made directly in the database) are only seen by reloading: every
+LIVE_VIEW_RESYNC_SECONDS the rows are read again and subscribers get the
+diff. Telemetry fields (current item) only exist on the worker the screen
+is connected to.
+"""
+from typing import Dict, Iterable, List, Optional, Set
+from datetime import datetime
+import asyncio
+import json
+import logging
+import re
+import time
+
+from fastapi import WebSocket
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import jobs
+from app.core.metrics import registry, Counter, Gauge
+from app.core.websocket_manager import manager
+from app.models.screen import Screen, screen_group_members
+
+logger = logging.getLogger(__name__)
+
+
+live_view_subscribers = registry.register(Gauge(
+    "ds_live_view_subscribers", "Admin live view WebSockets"
+))
+live_view_frames = registry.register(Counter(
+    "ds_live_view_frames_total", "Coalesced diff frames sent to admin live views"
+))
+
+
+TOPIC_PATTERN = re.compile(r"^(fleet|jobs|screen:\d+|group:\d+)$")
+MAX_TOPICS = 1000  # Per subscriber
+SEND_TIMEOUT = 5.0
+SCREEN_FIELDS = ("id", "name", "location", "is_active", "is_online", "last_seen", "assigned_playlist_id")
+JOB_FIELDS = ("id", "kind", "status", "created_at", "started_at", "finished_at", "error")
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def screen_state(screen) -> dict:
+    """Live view fields of a Screen row"""
+    return {field: _json_value(getattr(screen, field)) for field in SCREEN_FIELDS}
+
+
+def _diff(old: dict, new: dict) -> Optional[dict]:
+    changes = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    removed = [key for key in old if key not in new]
+    if not changes and not removed:
+        return None
+    return {"changes": changes, "removed": removed}
+
+
+class _Subscriber:
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.topics: Set[str] = set()
+        self.dirty: Set[str] = set()
+        self.sent: Dict[str, dict] = {}  # Topic state as last sent
+        self.sending = False
+
+
+class LiveViewHub:
+    """In-memory screen/group state and coalescing diff fan-out"""
+
+    def __init__(self, max_rate: float, resync_interval: float):
+        self.interval = 1.0 / max_rate
+        self.resync_interval = resync_interval
+        self.screens: Dict[int, dict] = {}
+        self.screen_ids: Dict[str, int] = {}  # name -> id
+        self.groups: Dict[int, Set[int]] = {}
+        self.loaded = False
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._synced_at = 0.0
+        self._local_changes: Optional[Set[tuple]] = None  # Made while a reload runs
+        self._resync_task: Optional[asyncio.Task] = None
+        self._subscribers: Dict[int, _Subscriber] = {}
+        self._jobs_version = jobs.version
+        self._task: Optional[asyncio.Task] = None
+
+    # ----- state -----
+
+    async def ensure_loaded(self):
+        """Load screens and group memberships (first subscriber, _run reloads them periodically)"""
+        if not self.loaded:
+            await self._resync()
+
+    def _resync_due(self) -> bool:
+        return self.resync_interval > 0 and time.monotonic() - self._synced_at >= self.resync_interval
+
+    async def _resync(self):
+        """(Re)load screens and groups from the database, subscribers get the diff"""
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self.loaded and not self._resync_due():
+                return  # Reloaded while we waited
+            self._synced_at = time.monotonic()  # Per attempt: a failing database isn't retried every tick
+            self._local_changes = set()
+            try:
+                screens, groups = await run_in_threadpool(self._load)
+            finally:
+                local_changes, self._local_changes = self._local_changes, None
+            self._apply(screens, groups, local_changes)
+
+    def _apply(self, screens: List[dict], groups: Dict[int, Set[int]], local_changes: Set[tuple]):
+        """Replace the state with a fresh load, keeping changes made in this process meanwhile"""
+        fresh = {}
+        for state in screens:
+            # Telemetry fields aren't in the database
+            current = self.screens.get(state["id"], {})
+            fresh[state["id"]] = dict(current, **state)
+        for kind, key in local_changes:
+            current = (self.screens if kind == "screen" else self.groups).get(key)
+            target = fresh if kind == "screen" else groups
+            if current is None:
+                target.pop(key, None)
+            else:
+                target[key] = current
+
+        self.screens = fresh
+        self.screen_ids = {state["name"]: screen_id for screen_id, state in fresh.items() if "name" in state}
+        self.groups = groups
+        if self.loaded:
+            # Only topics whose state differs from what was sent end up in a frame
+            for subscriber in self._subscribers.values():
+                subscriber.dirty.update(topic for topic in subscriber.topics if topic != "jobs")
+        self.loaded = True
+
+    def _local_change(self, kind: str, key: int):
+        if self._local_changes is not None:
+            self._local_changes.add((kind, key))
+
+    @staticmethod
+    def _load():
+        db = SessionLocal()
+        try:
+            screens = [screen_state(screen) for screen in db.query(Screen).all()]
+            groups: Dict[int, Set[int]] = {}
+            for group_id, screen_id in db.execute(select(screen_group_members.c.group_id, screen_group_members.c.screen_id)):
+                groups.setdefault(group_id, set()).add(screen_id)
+            return screens, groups
+        finally:
+            db.close()
+
+    def update_screen(self, screen_id: int, **fields):
+        """Merge changed fields (copy-on-write, so sent snapshots stay intact)"""
+        if not self.loaded:
+            return
+        current = self.screens.get(screen_id, {"id": screen_id})
+        fields = {key: _json_value(value) for key, value in fields.items()}
+        if all(current.get(key) == value for key, value in fields.items()) and screen_id in self.screens:
+            return
+
+        state = dict(current, **fields)
+        self.screens[screen_id] = state
+        if not fields.keys().isdisjoint(SCREEN_FIELDS):
+            self._local_change("screen", screen_id)
+        if "name" in state:
+            self.screen_ids[state["name"]] = screen_id
+        self._touch(self._screen_topics(screen_id))
+
+    def update_screen_by_name(self, name: str, **fields):
+        screen_id = self.screen_ids.get(name)
+        if screen_id is not None:
+            self.update_screen(screen_id, **fields)
+
+    def remove_screen(self, screen_id: int):
+        if not self.loaded:
+            return
+        topics = self._screen_topics(screen_id)
+        state = self.screens.pop(screen_id, None)
+        self._local_change("screen", screen_id)
+        if state:
+            self.screen_ids.pop(state.get("name"), None)
+        for members in self.groups.values():
+            members.discard(screen_id)
+        self._touch(topics)
+
+    def set_group(self, group_id: int, screen_ids: Iterable[int]):
+        if not self.loaded:
+            return
+        self.groups[group_id] = set(screen_ids)
+        self._local_change("group", group_id)
+        self._touch({f"group:{group_id}", "fleet"})
+
+    def remove_group(self, group_id: int):
+        if not self.loaded:
+            return
+        self.groups.pop(group_id, None)
+        self._local_change("group", group_id)
+        self._touch({f"group:{group_id}", "fleet"})
+
+    def _screen_topics(self, screen_id: int) -> Set[str]:
+        topics = {f"screen:{screen_id}", "fleet"}
+        topics.update(f"group:{group_id}" for group_id, members in self.groups.items() if screen_id in members)
+        return topics
+
+    def _touch(self, topics: Set[str]):
+        for subscriber in self._subscribers.values():
+            subscriber.dirty.update(topics & subscriber.topics)
+
+    def topic_state(self, topic: str) -> dict:
+        kind, _, key = topic.partition(":")
+        if kind == "screen":
+            return self.screens.get(int(key), {})
+        if kind == "group":
+            return {str(screen_id): self.screens[screen_id] for screen_id in self.groups.get(int(key), ()) if screen_id in self.screens}
+        if kind == "jobs":
+            return {job["id"]: {field: _json_value(job[field]) for field in JOB_FIELDS} for job in jobs.snapshot()}
+
+        return {
+            "screens": len(self.screens),
+            "online": sum(1 for state in self.screens.values() if state.get("is_online")),
+            "active": sum(1 for state in self.screens.values() if state.get("is_active")),
+            "groups": len(self.groups),
+            "connected": len(manager.active_connections)
+        }
+
+    # ----- subscribers -----
+
+    async def register(self, websocket: WebSocket) -> _Subscriber:
+        await self.ensure_loaded()
+        subscriber = _Subscriber(websocket)
+        self._subscribers[id(websocket)] = subscriber
+        live_view_subscribers.set(len(self._subscribers))
+        return subscriber
+
+    def unregister(self, websocket: WebSocket):
+        self._subscribers.pop(id(websocket), None)
+        live_view_subscribers.set(len(self._subscribers))
+
+    async def subscribe(self, subscriber: _Subscriber, topics: List[str]) -> dict:
+        """Add topics, returns their full state (the client's baseline for diffs)"""
+        valid = [topic for topic in topics if isinstance(topic, str) and TOPIC_PATTERN.match(topic)]
+        valid = valid[:max(MAX_TOPICS - len(subscriber.topics), 0)]
+
+        snapshot = {}
+        for topic in valid:
+            state = self.topic_state(topic)
+            subscriber.topics.add(topic)
+            subscriber.sent[topic] = state
+            subscriber.dirty.discard(topic)
+            snapshot[topic] = state
+        return snapshot
+
+    def unsubscribe(self, subscriber: _Subscriber, topics: List[str]):
+        for topic in topics:
+            subscriber.topics.discard(topic)
+            subscriber.dirty.discard(topic)
+            subscriber.sent.pop(topic, None)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._resync_task:
+            self._resync_task.cancel()
+            self._resync_task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if jobs.version != self._jobs_version:
+                self._jobs_version = jobs.version
+                self._touch({"jobs"})
+
+            if self._subscribers and self._resync_due() and (self._resync_task is None or self._resync_task.done()):
+                self._resync_task = asyncio.create_task(self._periodic_resync())
+
+            for subscriber in list(self._subscribers.values()):
+                # Slow clients accumulate dirty topics instead of queued frames
+                if subscriber.dirty and not subscriber.sending:
+                    frame = self._build_frame(subscriber)
+                    if frame:
+                        subscriber.sending = True
+                        asyncio.create_task(self._push(subscriber, frame))
+
+    async def _periodic_resync(self):
+        try:
+            await self._resync()
+        except Exception as e:
+            logger.warning("Live view resync failed: %s", e)
+
+    def _build_frame(self, subscriber: _Subscriber) -> Optional[str]:
+        dirty, subscriber.dirty = subscriber.dirty, set()
+        topics = {}
+        for topic in dirty:
+            state = self.topic_state(topic)
+            diff = _diff(subscriber.sent.get(topic, {}), state)
+            if diff:
+                subscriber.sent[topic] = state
+                topics[topic] = diff
+        if not topics:
+            return None
+        return json.dumps({"type": "update", "topics": topics})
+
+    async def _push(self, subscriber: _Subscriber, frame: str):
+        try:
+            await asyncio.wait_for(subscriber.websocket.send_text(frame), SEND_TIMEOUT)
+            live_view_frames.inc()
+        except Exception as e:
+            logger.warning("Dropping live view subscriber: %s", e)
+            self.unregister(subscriber.websocket)
+        finally:
+            subscriber.sending = False
+
+
+# Global instance
+live_view = LiveViewHub(settings.LIVE_VIEW_MAX_RATE, settings.LIVE_VIEW_RESYNC_SECONDS)
@@ -0,0 +1,172 @@
+from typing import Dict, Optional
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopWatchdog:
+    """Detects event loop stalls and records what was blocking it
+
+    A task on the loop updates a heartbeat timestamp; a watchdog thread
+    checks it and, as soon as the heartbeat is older than the threshold,
+    samples the loop thread's stack. The handler route is resolved from the
+    stack (endpoint code objects), so sync DB/PIL calls inside ``async def``
+    handlers show up with their route and line. Cheaper than asyncio debug
+    mode, which instruments every callback.
+    """
+
+    MAX_OFFENDERS = 200
+    STACK_LIMIT = 20
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.offenders: Dict[tuple, dict] = {}
+        self.stalls = 0
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._stall: Optional[dict] = None
+        self._endpoints: Dict[object, str] = {}
+        self._loop_thread_id: Optional[int] = None
+        self._beat_task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, routes=()):
+        """Start heartbeat task and watchdog thread (call from the event loop)"""
+        if self.running:
+            return
+
+        # Map handler code -> route path to attribute stalls
+        self._endpoints = {
+            route.endpoint.__code__: route.path
+            for route in routes
+            if hasattr(getattr(route, "endpoint", None), "__code__")
+        }
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._beat_task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._beat_task:
+            self._beat_task.cancel()
+            self._beat_task = None
+        self._thread = None
+
+    async def _beat(self):
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.threshold / 4)
+
+    def _watch(self):
+        while not self._stop.wait(self.threshold / 4):
+            last_beat = self._last_beat
+            blocked = time.monotonic() - last_beat
+
+            if self._stall is None:
+                if blocked > self.threshold:
+                    self._stall = self._sample(last_beat)
+            elif last_beat > self._stall["last_beat"]:
+                # Loop is running again - stall ended around the new heartbeat
+                self._record(self._stall, last_beat - self._stall["last_beat"] - self.threshold / 4)
+                self._stall = None
+
+    def _sample(self, last_beat: float) -> dict:
+        """Capture the loop thread's stack while it is blocked"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.extract_stack(frame, limit=None) if frame else []
+
+        route = None
+        depth = 0
+        walk = frame
+        while walk is not None:
+            route = self._endpoints.get(walk.f_code)
+            if route:
+                break
+            depth += 1
+            walk = walk.f_back
+
+        # Blame the innermost frame of our code below the handler (not middleware)
+        inner = stack[len(stack) - depth - 1:] if route else stack
+        blamed = next((f for f in reversed(inner) if f.filename.startswith(APP_DIR)), None)
+        if blamed is None and stack:
+            blamed = stack[-1]
+        location = "unknown"
+        if blamed is not None:
+            filename = blamed.filename
+            if filename.startswith(APP_DIR):
+                filename = os.path.relpath(filename, os.path.dirname(APP_DIR))
+            location = f"{filename}:{blamed.lineno} {blamed.name}"
+
+        return {
+            "last_beat": last_beat,
+            "route": route or "-",
+            "location": location,
+            "stack": traceback.format_list(stack[-self.STACK_LIMIT:])
+        }
+
+    def _record(self, stall: dict, duration: float):
+        duration = max(duration, self.threshold)
+        key = (stall["route"], stall["location"])
+
+        with self._lock:
+            self.stalls += 1
+            entry = self.offenders.get(key)
+            if entry is None:
+                if len(self.offenders) >= self.MAX_OFFENDERS:
+                    # Forget the least significant offender
+                    smallest = min(self.offenders, key=lambda k: self.offenders[k]["total_ms"])
+                    del self.offenders[smallest]
+                entry = self.offenders[key] = {
+                    "route": stall["route"],
+                    "location": stall["location"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration * 1000
+            entry["max_ms"] = max(entry["max_ms"], duration * 1000)
+            entry["last_stack"] = stall["stack"]
+
+        logger.warning(
+            "Event loop blocked for %.0fms (route %s, at %s)\n%s",
+            duration * 1000, stall["route"], stall["location"], "".join(stall["stack"]),
+            extra={"event": "loop_blocked", "route": stall["route"], "blocked_ms": round(duration * 1000, 1)}
+        )
+
+    def top_offenders(self, limit: int = 20) -> list:
+        """Offenders sorted by total blocked time"""
+        with self._lock:
+            entries = [dict(entry) for entry in self.offenders.values()]
+        entries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        for entry in entries:
+            entry["total_ms"] = round(entry["total_ms"], 1)
+            entry["max_ms"] = round(entry["max_ms"], 1)
+        return entries[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.offenders.clear()
+            self.stalls = 0
+
+
+# Global instance
+loop_watchdog = LoopWatchdog(settings.SLOW_CALLBACK_THRESHOLD)
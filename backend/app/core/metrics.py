@@ -0,0 +1,349 @@
+"""Lightweight Prometheus-style metrics (text exposition format 0.0.4).
+
+Metrics are kept per worker process. Recording is a dict lookup plus a few
+additions under a lock, so instrumentation can stay enabled in production.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+import abc
+import threading
+import time
+
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(abc.ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def collect(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    @abc.abstractmethod
+    def _samples(self) -> List[str]:
+        """Exposition lines of all label combinations"""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * (len(self.buckets) + 2)
+            data[index] += 1
+            data[-1] += value
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager observing elapsed seconds"""
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        data = self._values.get(self._key(labels))
+        return int(sum(data[:-1])) if data else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(data)) for key, data in self._values.items()]
+
+        lines = []
+        for key, data in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), data[:-1]):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(data[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Registry:
+    """Collection of metrics rendered at /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+registry = Registry()
+
+
+# ===== METRICS =====
+
+http_request_duration = registry.register(Histogram(
+    "ds_http_request_duration_seconds", "HTTP request latency by route",
+    ("method", "route", "status")
+))
+db_query_duration = registry.register(Histogram(
+    "ds_db_query_duration_seconds", "Database query latency",
+    ("operation",), buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+))
+db_queries = registry.register(Counter(
+    "ds_db_queries_total", "Database queries executed", ("operation",)
+))
+db_pool_in_use = registry.register(Gauge(
+    "ds_db_pool_connections_in_use", "Connections checked out of the pool"
+))
+db_pool_saturated = registry.register(Counter(
+    "ds_db_pool_saturated_total", "Checkouts that took the last free pool connection"
+))
+db_pool_timeouts = registry.register(Counter(
+    "ds_db_pool_timeouts_total", "Requests rejected after waiting DB_POOL_TIMEOUT for a connection"
+))
+websocket_connections = registry.register(Gauge(
+    "ds_websocket_connections", "Connected display WebSockets"
+))
+websocket_takeovers = registry.register(Counter(
+    "ds_websocket_takeovers_total", "Display connections replaced by a newer connection of the same screen"
+))
+websocket_send_queue = registry.register(Gauge(
+    "ds_websocket_send_queue_depth", "WebSocket sends in flight (not yet flushed to the socket)"
+))
+broadcast_duration = registry.register(Histogram(
+    "ds_broadcast_duration_seconds", "Time to fan a message out to all recipients",
+    ("kind",)
+))
+broadcast_recipients = registry.register(Histogram(
+    "ds_broadcast_recipients", "Recipients per broadcast",
+    ("kind",), buckets=(1, 10, 50, 100, 500, 1000, 5000)
+))
+play_events_received = registry.register(Counter(
+    "ds_play_events_received_total", "Proof-of-play events reported by displays", ("result",)
+))
+play_events_written = registry.register(Counter(
+    "ds_play_events_written_total", "Proof-of-play events bulk-inserted"
+))
+play_events_dropped = registry.register(Counter(
+    "ds_play_events_dropped_total", "Proof-of-play events dropped (invalid, unknown screen, buffer full or rejected by the DB)",
+    ("reason",)
+))
+play_event_flush_duration = registry.register(Histogram(
+    "ds_play_event_flush_seconds", "Time to bulk-insert one batch incl. hourly aggregates",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+))
+ingest_job_duration = registry.register(Histogram(
+    "ds_ingest_job_duration_seconds", "Background ingestion job duration",
+    ("kind", "status"), buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+))
+pdf_pages_rendered = registry.register(Counter(
+    "ds_pdf_pages_rendered_total", "PDF pages rasterized (rate() = pages/sec)", ("backend",)
+))
+pdf_render_duration = registry.register(Histogram(
+    "ds_pdf_page_render_seconds", "Time to render and save one PDF page",
+    ("backend",), buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+))
+
+
+def instrument_engine(engine):
+    """Count and time all queries on a SQLAlchemy engine, track pool usage"""
+    from sqlalchemy import event
+
+    pool = engine.pool
+    max_overflow = getattr(pool, "_max_overflow", None)
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        in_use = pool.checkedout() if hasattr(pool, "checkedout") else 0
+        db_pool_in_use.set(in_use)
+        if max_overflow is not None and max_overflow >= 0 and in_use >= pool.size() + max_overflow:
+            db_pool_saturated.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        if hasattr(pool, "checkedout"):
+            # Connection being returned is still counted during the event
+            db_pool_in_use.set(max(0, pool.checkedout() - 1))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        operation = statement.lstrip()[:6].upper()
+        if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            operation = "OTHER"
+        db_queries.inc(operation=operation)
+        db_query_duration.observe(elapsed, operation=operation)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        # Drop the start time of the failed query
+        conn = context.connection
+        if conn is not None and conn.info.get("_query_start"):
+            conn.info["_query_start"].pop()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Route template keeps cardinality bounded (/content/{content_id})
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status_code
+            )
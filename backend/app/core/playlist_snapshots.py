@@ -0,0 +1,87 @@
+"""Per-worker cache of display playlist payloads.
+
+Displays of the same playlist get the same ``playlist_update`` payload, so a
+reconnect wave should build it once per playlist, not once per screen.
+Concurrent misses for a playlist share one build; writes to playlists or
+content call ``invalidate``. Other workers don't see those calls, so entries
+also expire after PLAYLIST_SNAPSHOT_TTL seconds.
+"""
+from typing import Callable, Dict, Optional, Tuple
+import asyncio
+import itertools
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import registry, Counter
+from app.utils.timeline import now_ms
+
+playlist_snapshot_lookups = registry.register(Counter(
+    "ds_playlist_snapshot_lookups_total", "Playlist payload lookups on display connect", ("result",)
+))
+
+
+class PlaylistSnapshots:
+    """Playlist id -> payload, with single-flight loading"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[float, Optional[dict]]] = {}
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._generations = itertools.count(1)
+        self._generation = 0  # Bumped by invalidate, stale builds are not stored
+
+    async def get(self, playlist_id: int, loader: Callable[[int], Optional[dict]]) -> Optional[dict]:
+        """Cached payload, or build it with the sync ``loader`` in the threadpool"""
+        entry = self._entries.get(playlist_id)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            playlist_snapshot_lookups.inc(result="hit")
+            return self._fresh(entry[1])
+
+        pending = self._loading.get(playlist_id)
+        if pending is not None:
+            playlist_snapshot_lookups.inc(result="shared")
+            return self._fresh(await asyncio.shield(pending))
+
+        playlist_snapshot_lookups.inc(result="miss")
+        future = asyncio.get_running_loop().create_future()
+        self._loading[playlist_id] = future
+        generation = self._generation
+        try:
+            payload = await run_in_threadpool(loader, playlist_id)
+            if generation == self._generation:
+                self._entries[playlist_id] = (time.monotonic(), payload)
+            future.set_result(payload)
+            return self._fresh(payload)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._loading.pop(playlist_id, None)
+            if not future.done():
+                future.cancel()
+
+    def invalidate(self, playlist_id: Optional[int] = None):
+        """Drop one playlist, or everything (e.g. content changed)
+
+        Also called from background job threads: next() on the counter is
+        atomic, ``+= 1`` would not be.
+        """
+        self._generation = next(self._generations)
+        if playlist_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(playlist_id, None)
+
+    @staticmethod
+    def _fresh(payload: Optional[dict]) -> Optional[dict]:
+        # Play-once playlists start when they are sent, not when they were cached
+        if payload and not payload["timeline"]["loop"]:
+            payload = dict(payload, timeline=dict(payload["timeline"], epoch=now_ms()))
+        return payload
+
+
+# Global instance
+playlist_snapshots = PlaylistSnapshots(settings.PLAYLIST_SNAPSHOT_TTL)
@@ -0,0 +1,294 @@
+"""Screen presence history and uptime.
+
+Connect/disconnect transitions are stored as run-length intervals
+(``screen_presence``: one row per connection). Completed UTC days are rolled
+up into ``screen_uptime_daily``; raw intervals older than PRESENCE_RAW_DAYS
+are then deleted. Uptime over a range sums daily rows for the full days and
+reads raw intervals only for the partial days at the edges, so a year for
+thousands of screens is one indexed aggregate plus a few hundred rows.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+import asyncio
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.screen import Screen, ScreenPresence, ScreenUptimeDaily
+
+logger = logging.getLogger(__name__)
+
+
+MERGE_GAP = timedelta(seconds=5)  # Reconnects within this extend the previous interval
+ROLLUP_INTERVAL = 3600.0  # Seconds between rollup/prune runs
+DAY = timedelta(days=1)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min)
+
+
+# ===== TRANSITIONS (called from the WebSocket handler's DB helpers) =====
+
+def open_interval(db: Session, screen_id: int, previous_last_seen: Optional[datetime], now: datetime):
+    """Screen connected: extend the running/just-closed interval or start a new one"""
+    latest = db.query(ScreenPresence).filter(
+        ScreenPresence.screen_id == screen_id
+    ).order_by(ScreenPresence.started_at.desc()).first()
+
+    if latest is not None:
+        if latest.ended_at is None:
+            grace = timedelta(seconds=settings.PRESENCE_GRACE_SECONDS)
+            if previous_last_seen and now - previous_last_seen <= grace:
+                return  # Takeover/reconnect while still counted online
+            # Worker died without closing - the last heartbeat is the best estimate
+            latest.ended_at = max(previous_last_seen or latest.started_at, latest.started_at)
+        elif now - latest.ended_at <= MERGE_GAP:
+            latest.ended_at = None
+            return
+
+    db.add(ScreenPresence(screen_id=screen_id, started_at=now))
+
+
+def close_interval(db: Session, screen_name: str, now: datetime):
+    """Screen disconnected: close its open interval (single UPDATE)"""
+    screen_ids = db.query(Screen.id).filter(Screen.name == screen_name).scalar_subquery()
+    db.query(ScreenPresence).filter(
+        ScreenPresence.screen_id == screen_ids,
+        ScreenPresence.ended_at.is_(None)
+    ).update({ScreenPresence.ended_at: now}, synchronize_session=False)
+
+
+def mark_offline(db: Session, screen_names: Iterable[str], seen_before: datetime, now: datetime) -> int:
+    """Bulk disconnect (shutdown drain): screens not seen since ``seen_before``"""
+    screen_ids = [screen_id for (screen_id,) in db.query(Screen.id).filter(
+        Screen.name.in_(list(screen_names)),
+        or_(Screen.last_seen.is_(None), Screen.last_seen < seen_before)
+    )]
+    if not screen_ids:
+        return 0
+
+    db.query(Screen).filter(Screen.id.in_(screen_ids)).update(
+        {Screen.is_online: False}, synchronize_session=False
+    )
+    db.query(ScreenPresence).filter(
+        ScreenPresence.screen_id.in_(screen_ids),
+        ScreenPresence.ended_at.is_(None)
+    ).update({ScreenPresence.ended_at: now}, synchronize_session=False)
+    return len(screen_ids)
+
+
+# ===== QUERIES =====
+
+def utc_range(start: Optional[datetime], end: Optional[datetime], default: timedelta) -> Tuple[datetime, datetime]:
+    """Normalize a query range to naive UTC (default: ``default`` up to now)"""
+    def naive(value: datetime) -> datetime:
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    end = naive(end) if end else datetime.utcnow()
+    start = naive(start) if start else end - default
+    if start >= end:
+        raise ValueError("start must be before end")
+    return start, end
+
+
+def raw_online_seconds(db: Session, start: datetime, end: datetime,
+                       screen_ids: Optional[Iterable[int]] = None) -> Dict[int, float]:
+    """Online seconds per screen in [start, end) from raw intervals"""
+    now = datetime.utcnow()
+    grace = timedelta(seconds=settings.PRESENCE_GRACE_SECONDS)
+
+    query = db.query(
+        ScreenPresence.screen_id, ScreenPresence.started_at, ScreenPresence.ended_at, Screen.last_seen
+    ).join(Screen, Screen.id == ScreenPresence.screen_id).filter(
+        ScreenPresence.started_at < end,
+        or_(ScreenPresence.ended_at.is_(None), ScreenPresence.ended_at > start)
+    )
+    if screen_ids is not None:
+        query = query.filter(ScreenPresence.screen_id.in_(list(screen_ids)))
+
+    totals: Dict[int, float] = {}
+    for screen_id, started_at, ended_at, last_seen in query:
+        if ended_at is None:
+            # Still open: online until now, unless heartbeats stopped (crashed worker)
+            ended_at = min(now, max(last_seen or started_at, started_at) + grace)
+        seconds = (min(ended_at, end) - max(started_at, start)).total_seconds()
+        if seconds > 0:
+            totals[screen_id] = totals.get(screen_id, 0.0) + seconds
+    return totals
+
+
+def _rollup_horizon(db: Session) -> Optional[date]:
+    """First day that is not rolled up yet"""
+    last = db.query(func.max(ScreenUptimeDaily.day)).scalar()
+    return last + DAY if last else None
+
+
+def _daily_seconds(db: Session, first_day: date, end_day: date,
+                   screen_ids: Optional[Iterable[int]] = None) -> Dict[int, float]:
+    """Online seconds per screen from daily rows in [first_day, end_day)"""
+    query = db.query(ScreenUptimeDaily.screen_id, func.sum(ScreenUptimeDaily.online_seconds)).filter(
+        ScreenUptimeDaily.day >= first_day,
+        ScreenUptimeDaily.day < end_day
+    )
+    if screen_ids is not None:
+        query = query.filter(ScreenUptimeDaily.screen_id.in_(list(screen_ids)))
+    return {screen_id: float(seconds or 0) for screen_id, seconds in query.group_by(ScreenUptimeDaily.screen_id)}
+
+
+def _add(totals: Dict[int, float], part: Dict[int, float], factor: float = 1.0):
+    for screen_id, seconds in part.items():
+        totals[screen_id] = totals.get(screen_id, 0.0) + seconds * factor
+
+
+def online_seconds(db: Session, start: datetime, end: datetime,
+                   screen_ids: Optional[Iterable[int]] = None) -> Dict[int, float]:
+    """
+    Online seconds per screen in [start, end) (naive UTC)
+
+    Exact while raw intervals exist; partial days older than PRESENCE_RAW_DAYS
+    are prorated from their daily row.
+    """
+    if screen_ids is not None:
+        screen_ids = list(screen_ids)
+    totals: Dict[int, float] = {}
+    horizon = _rollup_horizon(db)
+    raw_cutoff = _day_start(datetime.utcnow().date() - timedelta(days=settings.PRESENCE_RAW_DAYS))
+
+    def partial_day(segment_start: datetime, segment_end: datetime):
+        # Raw intervals, or the prorated daily row once raw data is pruned
+        day = segment_start.date()
+        if segment_start < raw_cutoff and horizon and day < horizon:
+            fraction = (segment_end - segment_start) / DAY
+            _add(totals, _daily_seconds(db, day, day + DAY, screen_ids), fraction)
+        else:
+            _add(totals, raw_online_seconds(db, segment_start, segment_end, screen_ids))
+
+    first_full = start.date() if start == _day_start(start.date()) else start.date() + DAY
+    last_full = end.date()  # Exclusive
+
+    if start < _day_start(first_full):
+        partial_day(start, min(end, _day_start(first_full)))
+
+    if first_full < last_full:
+        rolled_end = min(last_full, horizon) if horizon else first_full
+        if first_full < rolled_end:
+            _add(totals, _daily_seconds(db, first_full, rolled_end, screen_ids))
+        if max(first_full, rolled_end) < last_full:
+            _add(totals, raw_online_seconds(db, _day_start(max(first_full, rolled_end)), _day_start(last_full), screen_ids))
+
+    if last_full >= first_full and _day_start(last_full) < end:
+        partial_day(_day_start(last_full), end)
+
+    return totals
+
+
+def uptime_report(db: Session, screens: List[Screen], start: datetime, end: datetime) -> List[dict]:
+    """Online seconds and uptime percent per screen (range clipped to screen lifetime and now)"""
+    seconds = online_seconds(db, start, end, [screen.id for screen in screens])
+    end = min(end, datetime.utcnow())
+
+    report = []
+    for screen in screens:
+        observed_from = max(start, screen.created_at.replace(tzinfo=None)) if screen.created_at else start
+        observed = max((end - observed_from).total_seconds(), 0)
+        online = min(seconds.get(screen.id, 0.0), observed)
+        report.append({
+            "screen_id": screen.id,
+            "name": screen.name,
+            "online_seconds": int(online),
+            "uptime_percent": round(100.0 * online / observed, 2) if observed else None
+        })
+    return report
+
+
+def presence_intervals(db: Session, screen_id: int, start: datetime, end: datetime) -> List[Tuple[datetime, Optional[datetime]]]:
+    """Raw intervals overlapping [start, end) (only within PRESENCE_RAW_DAYS)"""
+    return db.query(ScreenPresence.started_at, ScreenPresence.ended_at).filter(
+        ScreenPresence.screen_id == screen_id,
+        ScreenPresence.started_at < end,
+        or_(ScreenPresence.ended_at.is_(None), ScreenPresence.ended_at > start)
+    ).order_by(ScreenPresence.started_at).all()
+
+
+# ===== DOWNSAMPLING =====
+
+def rollup_presence(today: Optional[date] = None) -> int:
+    """Roll completed days into screen_uptime_daily and prune old raw intervals"""
+    today = today or datetime.utcnow().date()
+    db = SessionLocal()
+    try:
+        day = _rollup_horizon(db)
+        if day is None:
+            first = db.query(func.min(ScreenPresence.started_at)).scalar()
+            if first is None:
+                return 0
+            day = first.date()
+
+        days = 0
+        while day < today:
+            seconds = raw_online_seconds(db, _day_start(day), _day_start(day + DAY))
+            if seconds:
+                db.add_all([
+                    ScreenUptimeDaily(day=day, screen_id=screen_id, online_seconds=int(round(value)))
+                    for screen_id, value in seconds.items()
+                ])
+            db.commit()
+            day += DAY
+            days += 1
+
+        # Only delete what is already covered by daily rows
+        horizon = _rollup_horizon(db)
+        cutoff = today - timedelta(days=settings.PRESENCE_RAW_DAYS)
+        if horizon:
+            cutoff = min(cutoff, horizon)
+            db.query(ScreenPresence).filter(
+                ScreenPresence.ended_at.isnot(None),
+                ScreenPresence.ended_at < _day_start(cutoff)
+            ).delete(synchronize_session=False)
+            db.commit()
+        return days
+    except IntegrityError:
+        # Another worker rolled up the same day
+        db.rollback()
+        return 0
+    finally:
+        db.close()
+
+
+class PresenceRollup:
+    """Background task running rollup_presence periodically"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                days = await run_in_threadpool(rollup_presence)
+                if days:
+                    logger.info("Rolled up %d days of presence history", days)
+            except Exception as e:
+                logger.error("Presence rollup failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+
+# Global instance
+presence_rollup = PresenceRollup(ROLLUP_INTERVAL)
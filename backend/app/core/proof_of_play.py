@@ -0,0 +1,306 @@
+"""Proof-of-play ingestion.
+
+Displays report every item they showed (``play_event`` WebSocket message).
+Events are validated on arrival, buffered in memory and written in batches:
+one executemany INSERT into the append-only ``play_events`` table plus one
+upsert that adds the batch's counts to ``play_stats_hourly``. Dashboards
+read the hourly table only and never scan raw events.
+"""
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import (
+    play_events_received,
+    play_events_written,
+    play_events_dropped,
+    play_event_flush_duration
+)
+from app.models.analytics import PlayEvent, PlayStatHourly
+from app.models.screen import Screen
+
+logger = logging.getLogger(__name__)
+
+
+PLAY_RESULTS = ("completed", "interrupted", "error")
+MAX_PLAY_DURATION_MS = 24 * 3600 * 1000
+MAX_CLOCK_SKEW_MS = 24 * 3600 * 1000  # Display clock vs. server clock
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1  # Range of the INTEGER id columns
+PRUNE_INTERVAL = 3600.0  # Seconds between retention runs
+
+# Errors that say nothing about the rows: keep the batch and retry later
+DB_UNAVAILABLE = (OperationalError, InterfaceError, PoolTimeoutError)
+
+
+def _as_int(value) -> Optional[int]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    try:
+        return int(value)
+    except (ValueError, OverflowError):  # NaN, inf
+        return None
+
+
+def _as_id(value) -> Optional[int]:
+    number = _as_int(value)
+    if number is None or not INT32_MIN <= number <= INT32_MAX:
+        return None
+    return number
+
+
+def parse_play_event(screen_name: str, message: dict) -> Optional[dict]:
+    """Validate a display report, returns buffer row or None"""
+    try:
+        return _parse_play_event(screen_name, message)
+    except (ValueError, OverflowError, OSError, TypeError):
+        return None
+
+
+def _parse_play_event(screen_name: str, message: dict) -> Optional[dict]:
+    started_ms = _as_int(message.get("started_at"))
+    duration_ms = _as_int(message.get("duration_ms"))
+    content_id = _as_id(message.get("content_id"))
+    result = message.get("result", "completed")
+    if started_ms is None or duration_ms is None or content_id is None or result not in PLAY_RESULTS:
+        return None
+
+    # Display clock: anything far off is a broken clock (or a broken client)
+    if abs(started_ms - time.time() * 1000) > MAX_CLOCK_SKEW_MS:
+        return None
+
+    return {
+        "screen_name": screen_name,
+        "started_at": datetime.utcfromtimestamp(started_ms / 1000),
+        "playlist_id": _as_id(message.get("playlist_id")),
+        "playlist_item_id": _as_id(message.get("playlist_item_id")),
+        "content_item_id": _as_id(message.get("content_item_id")),
+        "content_id": content_id,
+        "duration_ms": min(max(duration_ms, 0), MAX_PLAY_DURATION_MS),
+        "result": result
+    }
+
+
+def _hourly_deltas(rows: List[dict]) -> List[dict]:
+    """Sum a batch into per (hour, screen, content) increments"""
+    stats: Dict[Tuple[datetime, int, int], dict] = {}
+    for row in rows:
+        hour = row["started_at"].replace(minute=0, second=0, microsecond=0)
+        key = (hour, row["screen_id"], row["content_id"])
+        stat = stats.get(key)
+        if stat is None:
+            stat = stats[key] = {
+                "hour": hour,
+                "screen_id": row["screen_id"],
+                "content_id": row["content_id"],
+                "plays": 0,
+                "completed": 0,
+                "errors": 0,
+                "total_duration_ms": 0
+            }
+        stat["plays"] += 1
+        stat["completed"] += row["result"] == "completed"
+        stat["errors"] += row["result"] == "error"
+        stat["total_duration_ms"] += row["duration_ms"]
+    return list(stats.values())
+
+
+def _upsert_hourly(db, deltas: List[dict]):
+    """Add increments to play_stats_hourly (one statement where the DB supports it)"""
+    table = PlayStatHourly.__table__
+    counters = ("plays", "completed", "errors", "total_duration_ms")
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table)
+        stmt = stmt.on_duplicate_key_update({
+            name: table.c[name] + stmt.inserted[name] for name in counters
+        })
+        db.execute(stmt, deltas)
+    elif dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert_insert
+        stmt = upsert_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["hour", "screen_id", "content_id"],
+            set_={name: table.c[name] + stmt.excluded[name] for name in counters}
+        )
+        db.execute(stmt, deltas)
+    else:
+        for delta in deltas:
+            key = (table.c.hour == delta["hour"]) & (table.c.screen_id == delta["screen_id"]) & \
+                (table.c.content_id == delta["content_id"])
+            result = db.execute(
+                table.update().where(key).values({name: table.c[name] + delta[name] for name in counters})
+            )
+            if not result.rowcount:
+                db.execute(table.insert(), [delta])
+
+
+def write_play_events(batch: List[dict]) -> int:
+    """Bulk insert a batch and update hourly aggregates in one transaction"""
+    db = SessionLocal()
+    try:
+        names = {row["screen_name"] for row in batch}
+        screen_ids = dict(db.query(Screen.name, Screen.id).filter(Screen.name.in_(names)).all())
+
+        rows = []
+        for event in batch:
+            screen_id = screen_ids.get(event["screen_name"])
+            if screen_id is None:
+                play_events_dropped.inc(reason="unknown_screen")
+                continue
+            row = dict(event, screen_id=screen_id)
+            del row["screen_name"]
+            rows.append(row)
+
+        if rows:
+            db.execute(insert(PlayEvent), rows)
+            _upsert_hourly(db, _hourly_deltas(rows))
+            db.commit()
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def prune_play_events(retention_days: int) -> int:
+    """Delete raw events past retention (hourly stats stay)"""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    db = SessionLocal()
+    try:
+        deleted = db.query(PlayEvent).filter(PlayEvent.started_at < cutoff).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+class PlayEventBuffer:
+    """In-memory buffer with a background task that flushes in batches"""
+
+    def __init__(self, batch_size: int, flush_interval: float, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._last_prune = 0.0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, screen_name: str, message: dict) -> bool:
+        """Buffer one reported play (no I/O, safe to call per message)"""
+        event = parse_play_event(screen_name, message)
+        if event is None:
+            play_events_dropped.inc(reason="invalid")
+            return False
+
+        play_events_received.inc(result=event["result"])
+        if len(self._pending) >= self.max_pending:
+            self._pending.popleft()
+            play_events_dropped.inc(reason="buffer_full")
+        self._pending.append(event)
+
+        if self._wake is not None and len(self._pending) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write what is left"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered events, returns number of rows inserted"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                count = min(len(self._pending), self.batch_size)
+                batch = [self._pending.popleft() for _ in range(count)]
+                start = time.perf_counter()
+                try:
+                    written += await self._write(batch)
+                except DB_UNAVAILABLE as e:
+                    # Keep the batch for the next attempt (bounded by max_pending)
+                    logger.error("Writing %d play events failed: %s", len(batch), e)
+                    room = max(self.max_pending - len(self._pending), 0)
+                    keep = batch[len(batch) - room:] if room < len(batch) else batch
+                    self._pending.extendleft(reversed(keep))
+                    if len(keep) < len(batch):
+                        play_events_dropped.inc(len(batch) - len(keep), reason="buffer_full")
+                    break
+                play_event_flush_duration.observe(time.perf_counter() - start)
+        if written:
+            play_events_written.inc(written)
+        return written
+
+    async def _write(self, batch: List[dict]) -> int:
+        """Write a batch; if the DB rejects its data, bisect it and drop only the rejected rows"""
+        try:
+            return await run_in_threadpool(write_play_events, batch)
+        except DB_UNAVAILABLE:
+            raise
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error("Dropping play event rejected by the database: %s (%s)", batch[0], e)
+                play_events_dropped.inc(reason="rejected")
+                return 0
+            middle = len(batch) // 2
+            return await self._write(batch[:middle]) + await self._write(batch[middle:])
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            await self.flush()
+
+            now = time.monotonic()
+            if now - self._last_prune >= PRUNE_INTERVAL:
+                self._last_prune = now
+                try:
+                    deleted = await run_in_threadpool(prune_play_events, settings.PLAY_EVENT_RETENTION_DAYS)
+                    if deleted:
+                        logger.info("Pruned %d play events older than %d days", deleted, settings.PLAY_EVENT_RETENTION_DAYS)
+                except Exception as e:
+                    logger.error("Pruning play events failed: %s", e)
+
+
+# Global instance
+play_events = PlayEventBuffer(
+    settings.PLAY_EVENT_BATCH_SIZE,
+    settings.PLAY_EVENT_FLUSH_INTERVAL,
+    settings.PLAY_EVENT_BUFFER_MAX
+)
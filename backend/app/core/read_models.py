@@ -0,0 +1,157 @@
+"""Read models for the list/detail endpoints.
+
+Rows are selected column by column as plain dicts - no ORM identity map,
+no lazy loads per row and no Pydantic validation of our own data. Child
+collections (content items, playlist items, schedules) come from one query
+per table for the whole page, grouped in Python. The dicts have exactly
+the fields of the corresponding response schemas and are rendered with
+orjson (ORJSONResponse), which handles datetime, time and enum values.
+``display_playlist`` is the playlist payload pushed to displays.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.content import Content, ContentItem
+from app.models.playlist import Playlist, PlaylistItem, PlaylistSchedule
+
+IN_CHUNK = 1000  # Ids per IN (...) list
+
+CONTENT_COLUMNS = (
+    Content.id, Content.title, Content.description, Content.duration, Content.file_path,
+    Content.file_name, Content.file_size, Content.checksum, Content.content_type, Content.mime_type,
+    Content.thumbnail_path, Content.pdf_page_count, Content.created_by, Content.created_at
+)
+CONTENT_ITEM_COLUMNS = (
+    ContentItem.id, ContentItem.content_id, ContentItem.item_number, ContentItem.file_path,
+    ContentItem.mime_type, ContentItem.duration
+)
+PLAYLIST_COLUMNS = (
+    Playlist.id, Playlist.name, Playlist.description, Playlist.loop, Playlist.shuffle,
+    Playlist.is_active, Playlist.created_by, Playlist.created_at
+)
+PLAYLIST_ITEM_COLUMNS = (
+    PlaylistItem.id, PlaylistItem.playlist_id, PlaylistItem.content_item_id,
+    PlaylistItem.order, PlaylistItem.duration_override
+)
+SCHEDULE_COLUMNS = (
+    PlaylistSchedule.id, PlaylistSchedule.playlist_id, PlaylistSchedule.start_time, PlaylistSchedule.end_time,
+    PlaylistSchedule.monday, PlaylistSchedule.tuesday, PlaylistSchedule.wednesday, PlaylistSchedule.thursday,
+    PlaylistSchedule.friday, PlaylistSchedule.saturday, PlaylistSchedule.sunday, PlaylistSchedule.is_active
+)
+
+
+def _rows(db: Session, statement) -> List[dict]:
+    return [dict(row) for row in db.execute(statement).mappings()]
+
+
+def _children(db: Session, columns: Sequence, parent_column, parent_ids: List[int], order_by) -> Dict[int, List[dict]]:
+    """Child rows grouped by parent id, one query per IN_CHUNK parents"""
+    grouped: Dict[int, List[dict]] = {parent_id: [] for parent_id in parent_ids}
+    for start in range(0, len(parent_ids), IN_CHUNK):
+        chunk = parent_ids[start:start + IN_CHUNK]
+        statement = select(*columns).where(parent_column.in_(chunk)).order_by(order_by)
+        for row in _rows(db, statement):
+            grouped[row[parent_column.key]].append(row)
+    return grouped
+
+
+def content_list(db: Session, skip: int, limit: int) -> List[dict]:
+    """ContentResponse rows including their items"""
+    contents = _rows(db, select(*CONTENT_COLUMNS).order_by(Content.id).offset(skip).limit(limit))
+    items = _children(db, CONTENT_ITEM_COLUMNS, ContentItem.content_id, [row["id"] for row in contents], ContentItem.id)
+    for row in contents:
+        row["items"] = items[row["id"]]
+    return contents
+
+
+def content_items(db: Session, content_id: int) -> Optional[List[dict]]:
+    """ContentItemResponse rows by item number, None if the content doesn't exist"""
+    if db.execute(select(Content.id).where(Content.id == content_id)).first() is None:
+        return None
+    return _rows(db, select(*CONTENT_ITEM_COLUMNS).where(ContentItem.content_id == content_id).order_by(ContentItem.item_number))
+
+
+def _with_playlist_children(db: Session, playlists: List[dict]) -> List[dict]:
+    ids = [row["id"] for row in playlists]
+    items = _children(db, PLAYLIST_ITEM_COLUMNS, PlaylistItem.playlist_id, ids, PlaylistItem.id)
+    schedules = _children(db, SCHEDULE_COLUMNS, PlaylistSchedule.playlist_id, ids, PlaylistSchedule.id)
+    for row in playlists:
+        row["items"] = items[row["id"]]
+        row["schedules"] = schedules[row["id"]]
+    return playlists
+
+
+def playlist_list(db: Session, skip: int, limit: int) -> List[dict]:
+    """PlaylistResponse rows including items and schedules"""
+    playlists = _rows(db, select(*PLAYLIST_COLUMNS).order_by(Playlist.id).offset(skip).limit(limit))
+    return _with_playlist_children(db, playlists)
+
+
+def playlist_with_content(db: Session, playlist_id: int) -> Optional[dict]:
+    """PlaylistWithContent: playlist, items, schedules and items_detailed (by order)"""
+    playlists = _rows(db, select(*PLAYLIST_COLUMNS).where(Playlist.id == playlist_id))
+    if not playlists:
+        return None
+    playlist = _with_playlist_children(db, playlists)[0]
+
+    detailed = db.execute(
+        select(PlaylistItem.id, PlaylistItem.order, PlaylistItem.duration_override, *CONTENT_ITEM_COLUMNS)
+        .join(ContentItem, ContentItem.id == PlaylistItem.content_item_id)
+        .where(PlaylistItem.playlist_id == playlist_id)
+        .order_by(PlaylistItem.order, PlaylistItem.id)
+    )
+    playlist["items_detailed"] = [
+        {
+            "id": item_id,
+            "order": order,
+            "duration": duration_override or duration,
+            "content_item": {
+                "id": content_item_id,
+                "content_id": content_id,
+                "item_number": item_number,
+                "file_path": file_path,
+                "mime_type": mime_type,
+                "duration": duration
+            }
+        }
+        for item_id, order, duration_override, content_item_id, content_id, item_number, file_path, mime_type, duration
+        in detailed
+    ]
+    return playlist
+
+
+def display_playlist(db: Session, playlist_id: int) -> Optional[dict]:
+    """Playlist with its items by order as pushed to displays, None if it doesn't exist"""
+    playlist = db.execute(
+        select(Playlist.id, Playlist.name, Playlist.loop, Playlist.shuffle).where(Playlist.id == playlist_id)
+    ).mappings().first()
+    if playlist is None:
+        return None
+
+    rows = db.execute(
+        select(PlaylistItem.id, PlaylistItem.order, PlaylistItem.duration_override, *CONTENT_ITEM_COLUMNS, Content.content_type)
+        .join(ContentItem, ContentItem.id == PlaylistItem.content_item_id)
+        .join(Content, Content.id == ContentItem.content_id)
+        .where(PlaylistItem.playlist_id == playlist_id)
+        .order_by(PlaylistItem.order, PlaylistItem.id)
+    )
+    items = [
+        {
+            "id": item_id,
+            "order": order,
+            "duration": duration_override or duration,
+            "content": {
+                "id": content_item_id,
+                "content_id": content_id,
+                "item_number": item_number,
+                "file_path": file_path,
+                "content_type": content_type.value,
+                "mime_type": mime_type
+            }
+        }
+        for item_id, order, duration_override, content_item_id, content_id, item_number, file_path, mime_type, duration,
+        content_type in rows
+    ]
+    return {**playlist, "items": items}
@@ -0,0 +1,123 @@
+"""ETag revalidation and rendered-body cache for read-heavy GET endpoints.
+
+Every cached resource (kind + key, e.g. ``("playlist", 5)``) has a version
+number. Write handlers ``bump`` the versions they affect; the ETag is the
+current version, so a matching If-None-Match is answered with 304 before
+the endpoint runs its query. Rendered JSON bodies are kept in an LRU keyed
+by ETag (RESPONSE_CACHE_MAX_BYTES, 0 = ETags only). Versions are an LRU as
+well (RESPONSE_CACHE_MAX_KEYS): lookups of ids that were deleted or never
+existed, or of arbitrary list pages, don't pile up. A dropped version just
+gets a new number on its next lookup, i.e. one extra render.
+
+Versions live per worker and ETags carry a per-process token, so another
+worker's ETag never matches. Bumps on other workers aren't seen either, so
+versions also expire after RESPONSE_CACHE_TTL seconds.
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Set, Tuple
+import itertools
+import threading
+import time
+import uuid
+
+import orjson
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+from app.core.metrics import registry, Counter
+
+response_cache_lookups = registry.register(Counter(
+    "ds_response_cache_lookups_total", "Cacheable GET requests by outcome", ("result",)
+))
+
+
+def _if_none_match(request: Request) -> Set[str]:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return set()
+    # Weak comparison (RFC 9110): W/"x" matches "x"
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+class ResponseCache:
+    """Per-resource versions (ETags) and an LRU of rendered bodies"""
+
+    def __init__(self, max_bytes: int, ttl: float, max_keys: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._lock = threading.Lock()  # Background jobs bump from worker threads
+        self._instance = uuid.uuid4().hex[:8]
+        self._counter = itertools.count(1)
+        self._versions: "OrderedDict[Tuple[str, Hashable], Tuple[int, float]]" = OrderedDict()  # -> (version, assigned at)
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()  # ETag -> body
+        self._size = 0
+
+    def etag(self, kind: str, key: Hashable) -> str:
+        """Current ETag of a resource"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._versions.get((kind, key))
+            if entry is None or now - entry[1] >= self.ttl:
+                entry = (next(self._counter), now)
+                self._versions[(kind, key)] = entry
+            self._versions.move_to_end((kind, key))
+            while len(self._versions) > self.max_keys:
+                self._versions.popitem(last=False)
+        return f'"{self._instance}-{entry[0]}"'
+
+    def bump(self, kind: str, key: Optional[Hashable] = None):
+        """New version for one resource, or for every resource of a kind (drops the entries, so deletes leave nothing behind)"""
+        with self._lock:
+            if key is None:
+                for stale in [entry for entry in self._versions if entry[0] == kind]:
+                    del self._versions[stale]
+            else:
+                self._versions.pop((kind, key), None)
+
+    def lookup(self, request: Request, kind: str, key: Hashable) -> Tuple[str, Optional[Response]]:
+        """ETag and a ready response (304 or cached body), or None to render"""
+        etag = self.etag(kind, key)
+        if etag in _if_none_match(request):
+            response_cache_lookups.inc(result="not_modified")
+            return etag, Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self._headers(etag))
+
+        with self._lock:
+            body = self._bodies.get(etag)
+            if body is not None:
+                self._bodies.move_to_end(etag)
+        if body is None:
+            response_cache_lookups.inc(result="miss")
+            return etag, None
+
+        response_cache_lookups.inc(result="hit")
+        return etag, self._response(etag, body)
+
+    def render(self, kind: str, key: Hashable, etag: str, data: Any) -> Response:
+        """Render ``data`` (read at version ``etag``) and keep the body"""
+        body = orjson.dumps(data)
+        with self._lock:
+            entry = self._versions.get((kind, key))
+            # Not stored if a write bumped the version while the query ran
+            current = entry and f'"{self._instance}-{entry[0]}"' == etag
+            if current and etag not in self._bodies and len(body) <= self.max_bytes:
+                self._bodies[etag] = body
+                self._size += len(body)
+                while self._size > self.max_bytes:
+                    _, evicted = self._bodies.popitem(last=False)
+                    self._size -= len(evicted)
+        return self._response(etag, body)
+
+    @staticmethod
+    def _headers(etag: str) -> dict:
+        # Browsers keep the body but revalidate every time
+        return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    def _response(self, etag: str, body: bytes) -> Response:
+        return Response(body, media_type="application/json", headers=self._headers(etag))
+
+
+# Global instance
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL, settings.RESPONSE_CACHE_MAX_KEYS
+)
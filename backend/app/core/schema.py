@@ -0,0 +1,87 @@
+"""Database schema check at startup.
+
+Migrations are applied by ``alembic upgrade head`` before the server starts
+(see docker-compose.yml). Instead of ``Base.metadata.create_all`` on every
+boot, workers compare the database's ``alembic_version`` with the newest
+migration in ``alembic/versions`` - one small query. The migration files are
+scanned as text; importing alembic and loading its script directory would
+cost more than the rest of the startup.
+
+SCHEMA_MODE:
+    check   refuse to start when migrations are pending (default)
+    create  ``create_all`` for development and scratch databases
+    off     no check
+"""
+from typing import Set, Tuple
+import logging
+import os
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import engine, Base
+
+logger = logging.getLogger(__name__)
+
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic", "versions")
+_QUOTED = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+class SchemaOutdatedError(RuntimeError):
+    pass
+
+
+def scan_migrations(versions_dir: str = VERSIONS_DIR) -> Tuple[Set[str], Set[str]]:
+    """All revisions and the heads (revisions no other migration builds on)"""
+    revisions: Set[str] = set()
+    parents: Set[str] = set()
+    for name in os.listdir(versions_dir):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(versions_dir, name), encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("revision"):
+                    revisions.update(_QUOTED.findall(line)[:1])
+                elif line.startswith("down_revision"):
+                    parents.update(_QUOTED.findall(line))
+    return revisions, revisions - parents
+
+
+def database_revisions() -> Set[str]:
+    """Revisions stamped in alembic_version (empty if the table is missing)"""
+    try:
+        with engine.connect() as connection:
+            return {row[0] for row in connection.execute(text("SELECT version_num FROM alembic_version"))}
+    except SQLAlchemyError:
+        return set()
+
+
+def ensure_schema(mode: str = None):
+    """Startup check according to SCHEMA_MODE"""
+    mode = mode or settings.SCHEMA_MODE
+    if mode == "off":
+        return
+    if mode == "create":
+        import app.models  # noqa: F401 - register all tables on Base.metadata
+        Base.metadata.create_all(bind=engine)
+        logger.info("Database tables ready (create_all)")
+        return
+
+    known, heads = scan_migrations()
+    current = database_revisions()
+    if current == heads:
+        logger.info("Database schema at %s", ", ".join(sorted(heads)))
+        return
+
+    if current and not current & known:
+        # Newer than this code (e.g. rolled back deploy): migrations are additive, keep running
+        logger.warning("Database schema %s is newer than this release (%s)", ", ".join(sorted(current)), ", ".join(sorted(heads)))
+        return
+
+    raise SchemaOutdatedError(
+        f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+        f"expected {', '.join(sorted(heads))} - run 'alembic upgrade head' (or set SCHEMA_MODE=create for development)"
+    )
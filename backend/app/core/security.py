@@ -1,11 +1,14 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import logging
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # OAuth2 Scheme - MUSS am Anfang sein!
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -19,7 +22,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
             plain_password = plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
         return pwd_context.verify(plain_password, hashed_password)
     except Exception as e:
-        print(f"Password verification error: {e}")
+        logger.warning("Password verification error: %s", e)
         return False
 
 
@@ -30,7 +33,7 @@ def get_password_hash(password: str) -> str:
             password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
         return pwd_context.hash(password)
     except Exception as e:
-        print(f"Password hashing error: {e}")
+        logger.error("Password hashing error: %s", e)
         raise
 
 
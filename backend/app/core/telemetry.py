@@ -0,0 +1,188 @@
+"""Display telemetry: in-memory ring buffers and a throttled admin stream.
+
+Displays send ``telemetry`` messages every few seconds. Samples are
+normalized to a fixed schema and kept in a bounded deque per screen; nothing
+is written to the database. Admin dashboards subscribe over
+``/ws/admin/telemetry`` and get at most one frame per TELEMETRY_PUSH_INTERVAL
+containing the latest sample of each screen that changed since their last
+frame. Updates in between are coalesced (last one wins), so the frame rate
+per admin is fixed no matter how many screens report.
+"""
+from typing import Deque, Dict, Iterable, List, Optional, Set
+from collections import deque
+import asyncio
+import json
+import logging
+import time
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+from app.core.metrics import registry, Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+
+telemetry_samples = registry.register(Counter(
+    "ds_telemetry_samples_total", "Telemetry samples received from displays"
+))
+telemetry_subscribers = registry.register(Gauge(
+    "ds_telemetry_admin_subscribers", "Admin WebSockets subscribed to telemetry"
+))
+telemetry_frames = registry.register(Counter(
+    "ds_telemetry_frames_total", "Coalesced telemetry frames sent to admins"
+))
+
+
+# field -> (type, min, max); unknown fields are dropped
+TELEMETRY_FIELDS = {
+    "playlist_id": (int, 0, None),
+    "playlist_item_id": (int, 0, None),
+    "content_id": (int, 0, None),
+    "buffer_health": (float, 0.0, 1.0),  # Share of playlist items loaded and decodable
+    "memory_mb": (float, 0.0, None),
+    "fps": (float, 0.0, 1000.0),
+    "cache_hit_ratio": (float, 0.0, 1.0),
+    "js_errors": (int, 0, None),  # Errors since page load
+    "uptime_s": (int, 0, None),  # Seconds since page load
+}
+MAX_ERROR_LENGTH = 500
+SEND_TIMEOUT = 5.0  # Seconds before a stuck admin socket is dropped
+
+
+def normalize_sample(message: dict) -> dict:
+    """Coerce a display report to the telemetry schema (invalid values become None)"""
+    sample = {}
+    for field, (kind, low, high) in TELEMETRY_FIELDS.items():
+        value = message.get(field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        value = kind(value)
+        if low is not None:
+            value = max(value, low)
+        if high is not None:
+            value = min(value, high)
+        sample[field] = value
+
+    error = message.get("last_error")
+    if isinstance(error, str) and error:
+        sample["last_error"] = error[:MAX_ERROR_LENGTH]
+    return sample
+
+
+class _Subscriber:
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.dirty: Set[str] = set()
+        self.screens: Optional[Set[str]] = None  # None = all screens
+        self.sending = False
+
+    def wants(self, screen: str) -> bool:
+        return self.screens is None or screen in self.screens
+
+
+class TelemetryHub:
+    """Per-screen ring buffers plus coalescing fan-out to admin subscribers"""
+
+    def __init__(self, history: int, push_interval: float):
+        self.history = history
+        self.push_interval = push_interval
+        self._samples: Dict[str, Deque[dict]] = {}
+        self._subscribers: Dict[int, _Subscriber] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # ----- ingestion (called per display message, no I/O) -----
+
+    def record(self, screen: str, message: dict) -> dict:
+        """Store a sample and mark the screen dirty for all subscribers"""
+        sample = normalize_sample(message)
+        sample["ts"] = round(time.time(), 3)
+
+        ring = self._samples.get(screen)
+        if ring is None:
+            ring = self._samples[screen] = deque(maxlen=self.history)
+        ring.append(sample)
+        telemetry_samples.inc()
+
+        for subscriber in self._subscribers.values():
+            if subscriber.wants(screen):
+                subscriber.dirty.add(screen)
+        return sample
+
+    def record_error(self, screen: str, error) -> dict:
+        """Display reported an error: new sample with last_error, js_errors + 1"""
+        previous = self.latest_for(screen) or {}
+        message = {field: value for field, value in previous.items() if field in TELEMETRY_FIELDS}
+        message["js_errors"] = previous.get("js_errors", 0) + 1
+        message["last_error"] = str(error)
+        return self.record(screen, message)
+
+    def forget(self, screen: str):
+        """Drop history of a screen (e.g. deleted)"""
+        self._samples.pop(screen, None)
+
+    # ----- queries -----
+
+    def latest_for(self, screen: str) -> Optional[dict]:
+        ring = self._samples.get(screen)
+        return ring[-1] if ring else None
+
+    def latest(self, screens: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        names = self._samples.keys() if screens is None else screens
+        return {name: self._samples[name][-1] for name in names if self._samples.get(name)}
+
+    def history_for(self, screen: str) -> List[dict]:
+        return list(self._samples.get(screen, ()))
+
+    # ----- admin stream -----
+
+    async def subscribe(self, websocket: WebSocket) -> _Subscriber:
+        """Register an (accepted) admin socket and send the current snapshot"""
+        subscriber = _Subscriber(websocket)
+        self._subscribers[id(websocket)] = subscriber
+        telemetry_subscribers.set(len(self._subscribers))
+        await websocket.send_text(json.dumps({"type": "telemetry_snapshot", "screens": self.latest()}))
+        return subscriber
+
+    def unsubscribe(self, websocket: WebSocket):
+        self._subscribers.pop(id(websocket), None)
+        telemetry_subscribers.set(len(self._subscribers))
+
+    def set_filter(self, subscriber: _Subscriber, screens: Optional[List[str]]):
+        """Limit a subscriber to some screens (None = all); re-sends their latest state"""
+        subscriber.screens = set(screens) if screens is not None else None
+        subscriber.dirty = set(self.latest(subscriber.screens).keys())
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.push_interval)
+            for subscriber in list(self._subscribers.values()):
+                # A slow admin keeps accumulating dirty screens instead of queueing frames
+                if subscriber.dirty and not subscriber.sending:
+                    subscriber.sending = True
+                    asyncio.create_task(self._push(subscriber))
+
+    async def _push(self, subscriber: _Subscriber):
+        dirty, subscriber.dirty = subscriber.dirty, set()
+        frame = json.dumps({"type": "telemetry", "screens": self.latest(dirty)})
+        try:
+            await asyncio.wait_for(subscriber.websocket.send_text(frame), SEND_TIMEOUT)
+            telemetry_frames.inc()
+        except Exception as e:
+            logger.warning("Dropping telemetry subscriber: %s", e)
+            self.unsubscribe(subscriber.websocket)
+        finally:
+            subscriber.sending = False
+
+
+# Global instance
+telemetry = TelemetryHub(settings.TELEMETRY_HISTORY, settings.TELEMETRY_PUSH_INTERVAL)
@@ -1,73 +1,167 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 from fastapi import WebSocket
 import json
+import time
+import uuid
 import asyncio
+import logging
+
+from app.core.metrics import (
+    websocket_connections, websocket_takeovers, websocket_send_queue, broadcast_duration, broadcast_recipients
+)
+
+logger = logging.getLogger(__name__)
+
+SESSION_REPLACED = 4000  # Close code for a socket taken over by a newer connection
+CLOSE_TIMEOUT = 5.0  # Seconds to wait for a stale socket to close
 
 
 class ConnectionManager:
     """Manages WebSocket connections for displays"""
     
     def __init__(self):
+        # One current connection per screen; every connect is a new session
         self.active_connections: Dict[str, WebSocket] = {}
-        self.heartbeat_tasks: Dict[str, asyncio.Task] = {}
+        self.sessions: Dict[str, str] = {}  # screen -> current session id
+        self.heartbeat_tasks: Dict[str, asyncio.Task] = {}  # session id -> task
     
-    async def connect(self, websocket: WebSocket, screen_id: str):
-        """Accept and register a new WebSocket connection"""
+    async def connect(self, websocket: WebSocket, screen_id: str) -> str:
+        """Accept a connection and make it the screen's current session, returns the session id"""
         await websocket.accept()
+        session_id = uuid.uuid4().hex
+        
+        # Takeover: no await between reading and replacing the old session
+        stale = self.active_connections.get(screen_id)
+        stale_session = self.sessions.get(screen_id)
         self.active_connections[screen_id] = websocket
+        self.sessions[screen_id] = session_id
+        self.heartbeat_tasks[session_id] = asyncio.create_task(self._heartbeat(screen_id, session_id))
         
-        # Start heartbeat
-        task = asyncio.create_task(self._heartbeat(screen_id))
-        self.heartbeat_tasks[screen_id] = task
+        if stale_session is not None:
+            self._stop_heartbeat(stale_session)
+        if stale is not None:
+            websocket_takeovers.inc()
+            logger.info(
+                "Screen %s reconnected, closing previous connection", screen_id,
+                extra={"event": "takeover", "screen": screen_id}
+            )
+            asyncio.create_task(self._close_stale(stale))
+        websocket_connections.set(len(self.active_connections))
         
-        print(f"Screen {screen_id} connected. Total connections: {len(self.active_connections)}")
+        logger.info(
+            "Screen %s connected. Total connections: %d", screen_id, len(self.active_connections),
+            extra={"event": "connect", "screen": screen_id}
+        )
+        return session_id
     
-    def disconnect(self, screen_id: str):
-        """Remove a WebSocket connection"""
-        if screen_id in self.active_connections:
-            del self.active_connections[screen_id]
+    def disconnect(self, screen_id: str, session_id: Optional[str] = None) -> bool:
+        """
+        Remove a WebSocket connection
+        
+        With a session id only that session is removed. Returns False if the
+        session was taken over (the screen is still connected), else True.
+        """
+        current = self.sessions.get(screen_id)
+        if session_id is not None and current is not None and current != session_id:
+            self._stop_heartbeat(session_id)
+            return False
         
-        # Cancel heartbeat
-        if screen_id in self.heartbeat_tasks:
-            self.heartbeat_tasks[screen_id].cancel()
-            del self.heartbeat_tasks[screen_id]
+        self.active_connections.pop(screen_id, None)
+        self.sessions.pop(screen_id, None)
+        if current is not None:
+            self._stop_heartbeat(current)
+        websocket_connections.set(len(self.active_connections))
         
-        print(f"Screen {screen_id} disconnected. Total connections: {len(self.active_connections)}")
+        logger.info(
+            "Screen %s disconnected. Total connections: %d", screen_id, len(self.active_connections),
+            extra={"event": "disconnect", "screen": screen_id}
+        )
+        return True
+    
+    def _stop_heartbeat(self, session_id: str):
+        task = self.heartbeat_tasks.pop(session_id, None)
+        if task is not None:
+            task.cancel()
+    
+    def _drop(self, screen_id: str, connection: WebSocket):
+        """Remove a broken connection unless it has been replaced meanwhile"""
+        if self.active_connections.get(screen_id) is connection:
+            self.disconnect(screen_id, self.sessions.get(screen_id))
+    
+    async def _close_stale(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=SESSION_REPLACED, reason="replaced by a newer connection"), CLOSE_TIMEOUT
+            )
+        except Exception:
+            pass  # Already dead, which is usually why the display reconnected
     
     async def send_personal_message(self, message: dict, screen_id: str):
         """Send message to a specific screen"""
-        if screen_id in self.active_connections:
+        connection = self.active_connections.get(screen_id)
+        if connection is not None:
+            websocket_send_queue.inc()
             try:
-                await self.active_connections[screen_id].send_json(message)
+                await connection.send_json(message)
             except Exception as e:
-                print(f"Error sending message to {screen_id}: {e}")
-                self.disconnect(screen_id)
+                logger.warning("Error sending message to %s: %s", screen_id, e, extra={"screen": screen_id})
+                self._drop(screen_id, connection)
+            finally:
+                websocket_send_queue.dec()
     
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected screens"""
-        disconnected = []
+    async def _send_frame(self, screen_id: str, connection: WebSocket, frame: str) -> bool:
+        """Send an already encoded frame, False if the connection is broken"""
+        websocket_send_queue.inc()
+        try:
+            await connection.send_text(frame)
+            return True
+        except Exception as e:
+            logger.warning("Error broadcasting to %s: %s", screen_id, e, extra={"screen": screen_id})
+            return False
+        finally:
+            websocket_send_queue.dec()
+    
+    async def _fan_out(self, recipients: List[tuple], message: dict, kind: str) -> int:
+        """Encode once, send to all recipients concurrently, drop broken connections"""
+        start = time.perf_counter()
+        frame = json.dumps(message)
         
-        for screen_id, connection in self.active_connections.items():
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(f"Error broadcasting to {screen_id}: {e}")
-                disconnected.append(screen_id)
+        results = await asyncio.gather(*(
+            self._send_frame(screen_id, connection, frame) for screen_id, connection in recipients
+        ))
+        
+        broadcast_duration.observe(time.perf_counter() - start, kind=kind)
+        broadcast_recipients.observe(len(recipients), kind=kind)
         
         # Clean up disconnected clients
-        for screen_id in disconnected:
-            self.disconnect(screen_id)
+        for (screen_id, connection), ok in zip(recipients, results):
+            if not ok:
+                self._drop(screen_id, connection)
+        return sum(results)
+    
+    async def broadcast(self, message: dict):
+        """Broadcast message to all connected screens"""
+        await self._fan_out(list(self.active_connections.items()), message, "all")
+    
+    async def multicast(self, screen_ids: Iterable[str], message: dict) -> int:
+        """Send one message to the connected screens among screen_ids, returns recipients"""
+        recipients = [
+            (screen_id, self.active_connections[screen_id])
+            for screen_id in screen_ids
+            if screen_id in self.active_connections
+        ]
+        return await self._fan_out(recipients, message, "group")
     
-    async def _heartbeat(self, screen_id: str):
+    async def _heartbeat(self, screen_id: str, session_id: str):
         """Send periodic heartbeat to keep connection alive"""
-        while screen_id in self.active_connections:
+        while self.sessions.get(screen_id) == session_id:
             try:
                 await self.send_personal_message({"type": "ping"}, screen_id)
                 await asyncio.sleep(30)  # Ping every 30 seconds
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                print(f"Heartbeat error for {screen_id}: {e}")
+                logger.warning("Heartbeat error for %s: %s", screen_id, e, extra={"screen": screen_id})
                 break
     
     def get_connected_screens(self) -> List[str]:
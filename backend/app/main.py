@@ -1,34 +1,75 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+import logging
 import os
 
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api import auth, screens, content, playlists, websocket, users
+from app.core.schema import ensure_schema
+from app.core.jobs import jobs
+from app.core.metrics import registry, MetricsMiddleware, db_pool_timeouts
+from app.core.health import loop_monitor, get_readiness
+from app.core.loop_watchdog import loop_watchdog
+from app.core.logging_config import setup_logging, shutdown_logging, CorrelationIdMiddleware
+from app.core.proof_of_play import play_events
+from app.core.presence import presence_rollup
+from app.core.telemetry import telemetry
+from app.core.live_view import live_view
+from app.core.drain import connection_drain
+from app.utils.resumable_upload import cleanup_expired_uploads
+from app.api import auth, screens, screen_groups, content, playlists, websocket, users, diagnostics, analytics
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
+    setup_logging()
+    
     # Startup: Create upload directory
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    print(f"✓ Upload directory ready: {settings.UPLOAD_DIR}")
+    logger.info("Upload directory ready: %s", settings.UPLOAD_DIR)
+    
+    # Remove abandoned resumable uploads
+    removed = cleanup_expired_uploads()
+    if removed:
+        logger.info("Removed %d expired resumable uploads", removed)
+    
+    # Migrations run before the server (alembic upgrade head) - only verify the revision
+    ensure_schema()
     
-    # Create tables if they don't exist (for development only)
-    # In production, use Alembic migrations
-    Base.metadata.create_all(bind=engine)
-    print("✓ Database tables ready")
+    loop_monitor.start()
+    play_events.start()
+    presence_rollup.start()
+    telemetry.start()
+    live_view.start()
+    connection_drain.install_signal_handler()  # SIGTERM: drain displays before uvicorn closes them
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start(app.routes)
+        logger.info("Event loop watchdog active (threshold %ss)", settings.SLOW_CALLBACK_THRESHOLD)
     
     yield
     
     # Shutdown
-    print("✓ Application shutdown")
+    await connection_drain.finish()  # One bulk offline update for drained screens
+    await play_events.stop()  # Write buffered proof-of-play events
+    presence_rollup.stop()
+    telemetry.stop()
+    live_view.stop()
+    loop_watchdog.stop()
+    loop_monitor.stop()
+    jobs.shutdown(wait=False)
+    logger.info("Application shutdown")
+    shutdown_logging()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
+    default_response_class=ORJSONResponse,  # orjson instead of json.dumps for every JSON response
     lifespan=lifespan
 )
 
@@ -39,14 +80,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Upload-Offset", "Upload-Length", "X-Request-ID"],  # Resumable uploads, log correlation
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+app.add_middleware(CorrelationIdMiddleware)
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """All DB connections busy - fail fast instead of queueing requests forever"""
+    db_pool_timeouts.inc()
+    logger.warning("DB pool exhausted: %s %s", request.method, request.url.path)
+    return JSONResponse(
+        {"detail": "Database busy, please retry"},
+        status_code=503,
+        headers={"Retry-After": "1"}
+    )
+
 # Include routers - WICHTIG: WebSocket OHNE prefix!
 app.include_router(auth.router, prefix=f"{settings.API_PREFIX}/auth", tags=["Authentication"])
 app.include_router(users.router, prefix=f"{settings.API_PREFIX}/users", tags=["Users"]) 
 app.include_router(screens.router, prefix=f"{settings.API_PREFIX}/screens", tags=["Screens"])
+app.include_router(screen_groups.router, prefix=f"{settings.API_PREFIX}/screen-groups", tags=["Screen Groups"])
 app.include_router(content.router, prefix=f"{settings.API_PREFIX}/content", tags=["Content"])
 app.include_router(playlists.router, prefix=f"{settings.API_PREFIX}/playlists", tags=["Playlists"])
+app.include_router(analytics.router, prefix=f"{settings.API_PREFIX}/analytics", tags=["Analytics"])
+app.include_router(diagnostics.router, prefix=f"{settings.API_PREFIX}/diagnostics", tags=["Diagnostics"])
 app.include_router(websocket.router, tags=["WebSocket"])  # ← KEIN PREFIX!
 
 
@@ -62,9 +124,30 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Detailed health check"""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "storage": os.path.exists(settings.UPLOAD_DIR)
-    }
+    """Detailed health check (same checks as readiness, always 200)"""
+    return await get_readiness()
+
+
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe - process and event loop respond"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness probe - DB, storage and event loop; 503 if any check fails"""
+    report = await get_readiness()
+    status_code = 200 if report["status"] == "ready" else 503
+    return JSONResponse(report, status_code=status_code)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(
+        content=registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
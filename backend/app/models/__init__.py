@@ -1,16 +1,22 @@
 from app.core.database import Base
 from app.models.user import User
-from app.models.screen import Screen
+from app.models.screen import Screen, ScreenGroup, ScreenPresence, ScreenUptimeDaily
 from app.models.content import Content, ContentType, ContentItem
 from app.models.playlist import Playlist, PlaylistItem
+from app.models.analytics import PlayEvent, PlayStatHourly
 
 __all__ = [
     "Base",
     "User", 
     "Screen", 
+    "ScreenGroup",
+    "ScreenPresence",
+    "ScreenUptimeDaily",
     "Content", 
     "ContentType",
     "ContentItem",
     "Playlist", 
-    "PlaylistItem"
+    "PlaylistItem",
+    "PlayEvent",
+    "PlayStatHourly"
 ]
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index
+from app.core.database import Base
+
+
+# BIGINT autoincrement only works as INTEGER PRIMARY KEY on SQLite
+EventId = BigInteger().with_variant(Integer(), "sqlite")
+
+
+class PlayEvent(Base):
+    """Proof-of-play: ein Eintrag pro tatsächlich angezeigtem Item (append-only)
+
+    Rows are only ever inserted in batches and pruned by age, never updated.
+    No foreign keys: the record must survive deleted screens and content.
+    """
+    __tablename__ = "play_events"
+
+    id = Column(EventId, primary_key=True, autoincrement=True)
+    started_at = Column(DateTime, nullable=False)  # UTC, display clock (within 1 day of the server's)
+    screen_id = Column(Integer, nullable=False)
+    playlist_id = Column(Integer, nullable=True)
+    playlist_item_id = Column(Integer, nullable=True)
+    content_item_id = Column(Integer, nullable=True)
+    content_id = Column(Integer, nullable=False)
+    duration_ms = Column(Integer, nullable=False)
+    result = Column(String(20), nullable=False)  # completed, interrupted, error
+
+    __table_args__ = (
+        Index("ix_play_events_started_at", "started_at"),
+        Index("ix_play_events_screen_started", "screen_id", "started_at"),
+    )
+
+
+class PlayStatHourly(Base):
+    """Plays per content and screen per hour, maintained incrementally on flush"""
+    __tablename__ = "play_stats_hourly"
+
+    hour = Column(DateTime, primary_key=True)  # UTC, start of hour
+    screen_id = Column(Integer, primary_key=True)
+    content_id = Column(Integer, primary_key=True)
+    plays = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    total_duration_ms = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_play_stats_hourly_content_hour", "content_id", "hour"),
+    )
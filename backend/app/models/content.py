@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, Enum as SQLEnum, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -19,7 +19,8 @@ class Content(Base):
     description = Column(Text)
     file_path = Column(String(500), nullable=False)
     file_name = Column(String(255), nullable=False)
-    file_size = Column(Integer)  # in bytes
+    file_size = Column(BigInteger)  # in bytes
+    checksum = Column(String(64), nullable=True)  # SHA-256 of uploaded file
     content_type = Column(SQLEnum(ContentType), nullable=False)
     mime_type = Column(String(100))
     duration = Column(Integer, default=10)  # Display duration in seconds
@@ -1,8 +1,18 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Index, Table, Text
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 
+# Screen <-> group membership (a screen can be in many groups, i.e. tags)
+screen_group_members = Table(
+    "screen_group_members",
+    Base.metadata,
+    Column("group_id", Integer, ForeignKey("screen_groups.id", ondelete="CASCADE"), primary_key=True),
+    Column("screen_id", Integer, ForeignKey("screens.id", ondelete="CASCADE"), primary_key=True, index=True)
+)
+
+
 class Screen(Base):
     __tablename__ = "screens"
     
@@ -20,4 +30,46 @@ class Screen(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    groups = relationship("ScreenGroup", secondary=screen_group_members, back_populates="screens")
+
+
+class ScreenGroup(Base):
+    """Gruppe/Tag von Screens - Zuweisung und Push an alle Mitglieder"""
+    __tablename__ = "screen_groups"
+    
+    # No extra indexes: migration 004 only has the primary key and the unique name
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), unique=True, nullable=False)
+    description = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    screens = relationship("Screen", secondary=screen_group_members, back_populates="groups")
 
+
+class ScreenPresence(Base):
+    """Online-Intervall eines Screens (run-length: one row per connection, not per heartbeat)"""
+    __tablename__ = "screen_presence"
+    
+    id = Column(Integer, primary_key=True)
+    screen_id = Column(Integer, ForeignKey("screens.id", ondelete="CASCADE"), nullable=False)
+    started_at = Column(DateTime, nullable=False)  # UTC
+    ended_at = Column(DateTime, nullable=True)  # NULL = still connected
+    
+    __table_args__ = (
+        Index("ix_screen_presence_screen_started", "screen_id", "started_at"),
+        Index("ix_screen_presence_ended_at", "ended_at"),
+    )
+
+
+class ScreenUptimeDaily(Base):
+    """Online seconds per screen and UTC day (downsampled presence history)"""
+    __tablename__ = "screen_uptime_daily"
+    
+    day = Column(Date, primary_key=True)
+    screen_id = Column(Integer, ForeignKey("screens.id", ondelete="CASCADE"), primary_key=True)
+    online_seconds = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index("ix_screen_uptime_daily_screen_day", "screen_id", "day"),
+    )
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class PlayStatHourlyResponse(BaseModel):
+    hour: datetime
+    screen_id: int
+    content_id: int
+    plays: int
+    completed: int
+    errors: int
+    total_duration_ms: int
+    
+    class Config:
+        from_attributes = True
+
+
+class PlaySummary(BaseModel):
+    key: int  # content_id or screen_id, depending on group_by
+    title: Optional[str] = None
+    plays: int
+    completed: int
+    errors: int
+    total_duration_ms: int
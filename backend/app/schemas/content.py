@@ -37,6 +37,7 @@ class ContentResponse(ContentBase):
     file_path: str
     file_name: str
     file_size: int
+    checksum: Optional[str] = None
     content_type: ContentType
     mime_type: str
     thumbnail_path: Optional[str]
@@ -56,4 +57,23 @@ class ContentUploadResponse(BaseModel):
     content_type: ContentType
     pdf_page_count: Optional[int]
     items_count: int
+    checksum: Optional[str] = None
+    job_id: Optional[str] = None  # Background processing (videos)
     message: str
+
+
+class ResumableUploadCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    length: int = Field(..., ge=1)  # Total size in bytes
+    title: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = None
+    duration: int = Field(default=10, ge=1)
+    mime_type: Optional[str] = None
+    checksum: Optional[str] = Field(default=None, pattern="^[0-9a-fA-F]{64}$")  # SHA-256, verified at finalize
+
+
+class ResumableUploadResponse(BaseModel):
+    id: str
+    filename: str
+    length: int
+    offset: int
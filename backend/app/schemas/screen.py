@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -44,3 +44,68 @@ class ScreenStatus(BaseModel):
     is_online: bool
     last_seen: Optional[datetime]
     assigned_playlist: Optional[str]
+
+
+class ScreenUptime(BaseModel):
+    screen_id: int
+    name: str
+    online_seconds: int
+    uptime_percent: Optional[float]  # None if the screen did not exist in the range
+
+
+class PresenceInterval(BaseModel):
+    started_at: datetime
+    ended_at: Optional[datetime]  # None = still online
+
+
+class ScreenPresenceResponse(ScreenUptime):
+    start: datetime
+    end: datetime
+    intervals: List[PresenceInterval]
+
+
+class ScreenGroupBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    description: Optional[str] = None
+
+
+class ScreenGroupCreate(ScreenGroupBase):
+    screen_ids: List[int] = []
+
+
+class ScreenGroupUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    description: Optional[str] = None
+
+
+class ScreenGroupResponse(ScreenGroupBase):
+    id: int
+    screen_ids: List[int] = []
+    created_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class ScreenGroupMembers(BaseModel):
+    screen_ids: List[int] = Field(..., min_length=1)
+
+
+class ScreenGroupAssign(BaseModel):
+    playlist_id: Optional[int] = None  # None = unassign
+    push: bool = True  # Send playlist_update to connected members
+
+
+class ScreenGroupAssignResponse(BaseModel):
+    group_id: int
+    playlist_id: Optional[int]
+    screens_updated: int
+    screens_notified: int
+
+
+class ScreenGroupUptime(BaseModel):
+    group_id: int
+    start: datetime
+    end: datetime
+    uptime_percent: Optional[float]  # Average over member screens
+    screens: List[ScreenUptime]
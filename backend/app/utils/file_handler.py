@@ -1,21 +1,40 @@
 import os
+import abc
 import uuid
+import json
+import logging
+import math
+import shutil
+import struct
+import hashlib
+import time
+import threading
+import subprocess
+import importlib.util
 from pathlib import Path
-from typing import Tuple, List
+from typing import TYPE_CHECKING, Dict, Tuple, List, AsyncIterator, Iterator, Optional
 from fastapi import UploadFile
-from PIL import Image
+import aiofiles
 import io
 import re
 
-# PDF conversion imports
-try:
-    from pdf2image import convert_from_path
-    PDF_SUPPORT = True
-except ImportError:
-    PDF_SUPPORT = False
+if TYPE_CHECKING:
+    from PIL import Image
+
+# PDF backends: pypdfium2 (in-process) preferred, poppler (pdf2image) as fallback.
+# Only located here - imaging/PDF libraries are imported on first use, so
+# workers that never touch a PDF don't pay for them at startup.
+PDFIUM_SUPPORT = importlib.util.find_spec("pypdfium2") is not None
+POPPLER_SUPPORT = importlib.util.find_spec("pdf2image") is not None
+
+PDF_SUPPORT = PDFIUM_SUPPORT or POPPLER_SUPPORT
 
 from app.core.config import settings
+from app.core.metrics import pdf_pages_rendered, pdf_render_duration
 from app.models.content import ContentType
+from app.utils.thumbnails import open_for_thumbnail, render_thumbnail
+
+logger = logging.getLogger(__name__)
 
 
 def sanitize_filename(filename: str) -> str:
@@ -74,28 +93,310 @@ def generate_unique_filename(original_filename: str, use_original: bool = True,
         return f"{unique_id}{ext}"
 
 
-async def save_upload_file(upload_file: UploadFile) -> Tuple[str, str, int]:
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit"""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"File exceeds maximum size of {max_size // (1024 * 1024)}MB")
+
+
+def get_max_upload_size(content_type: ContentType) -> int:
+    """Get size limit in bytes for a content type"""
+    if content_type == ContentType.PDF:
+        return settings.MAX_PDF_SIZE
+    if content_type == ContentType.VIDEO:
+        return settings.MAX_VIDEO_SIZE
+    return settings.MAX_UPLOAD_SIZE
+
+
+async def stream_to_file(
+    chunks: AsyncIterator[bytes],
+    original_filename: str,
+    max_size: int
+) -> Tuple[str, str, int, str]:
     """
-    Save uploaded file to storage
+    Stream chunks to storage, enforcing the size limit and hashing on the fly
     
+    Chunks are coalesced into UPLOAD_CHUNK_SIZE buffers and written to a
+    ``.part`` file off the event loop (aiofiles). The file is renamed into
+    place only once complete, so readers never see partial uploads.
+    
+    Args:
+        chunks: Async iterator of raw bytes (e.g. ``request.stream()``)
+        original_filename: Original filename (used for naming)
+        max_size: Maximum allowed size in bytes
+        
     Returns:
-        Tuple of (file_path, unique_filename, file_size)
+        Tuple of (file_path, unique_filename, file_size, sha256)
+        
+    Raises:
+        UploadTooLargeError: As soon as more than max_size bytes arrive
     """
-    # Generate unique filename using original name
-    unique_filename = generate_unique_filename(upload_file.filename, use_original=True)
+    unique_filename = generate_unique_filename(original_filename, use_original=True)
     file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
+    temp_path = f"{file_path}.part"
     
-    # Save file
+    digest = hashlib.sha256()
     file_size = 0
-    with open(file_path, "wb") as f:
-        while chunk := await upload_file.read(8192):
-            f.write(chunk)
-            file_size += len(chunk)
+    buffer = bytearray()
+    
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                file_size += len(chunk)
+                if file_size > max_size:
+                    raise UploadTooLargeError(max_size)
+                
+                digest.update(chunk)
+                buffer += chunk
+                if len(buffer) >= settings.UPLOAD_CHUNK_SIZE:
+                    await f.write(bytes(buffer))
+                    buffer.clear()
+            
+            if buffer:
+                await f.write(bytes(buffer))
+        
+        os.replace(temp_path, file_path)
+    except BaseException:
+        # Cleanup partial file (also on client disconnect / cancellation)
+        delete_file(temp_path)
+        raise
+    
+    return file_path, unique_filename, file_size, digest.hexdigest()
+
+
+async def _iter_upload_file(upload_file: UploadFile) -> AsyncIterator[bytes]:
+    """Read an UploadFile in large chunks"""
+    while chunk := await upload_file.read(settings.UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def save_upload_file(upload_file: UploadFile, max_size: int = None) -> Tuple[str, str, int, str]:
+    """
+    Save uploaded file to storage
+    
+    Returns:
+        Tuple of (file_path, unique_filename, file_size, sha256)
+    """
+    if max_size is None:
+        max_size = settings.MAX_UPLOAD_SIZE
+    
+    # Starlette already knows the spooled size - reject before copying anything
+    if upload_file.size is not None and upload_file.size > max_size:
+        raise UploadTooLargeError(max_size)
+    
+    return await stream_to_file(_iter_upload_file(upload_file), upload_file.filename, max_size)
+
+
+# ===== PDF BACKENDS =====
+
+class PdfDocument(abc.ABC):
+    """An opened PDF - page count is read on open, page sizes on first use"""
+    
+    backend = "base"
+    
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.page_count = 0
+        self._page_sizes: Dict[int, Tuple[float, float]] = {}
+    
+    def page_size(self, page_num: int) -> Tuple[float, float]:
+        """(width, height) of a page (1-based) in points"""
+        if not 1 <= page_num <= self.page_count:
+            raise ValueError(f"PDF has no page {page_num}")
+        size = self._page_sizes.get(page_num)
+        if size is None:
+            size = self._page_sizes[page_num] = self._read_page_size(page_num)
+        return size
+    
+    @abc.abstractmethod
+    def _read_page_size(self, page_num: int) -> Tuple[float, float]:
+        """Size of one page, read from the document"""
+    
+    @abc.abstractmethod
+    def render_page(self, page_num: int, dpi: int) -> "Image.Image":
+        """Render a single page (1-based) to a PIL image"""
+    
+    def iter_pages(self, dpi: int) -> Iterator["Image.Image"]:
+        """Render all pages in order"""
+        for page_num in range(1, self.page_count + 1):
+            yield self.render_page(page_num, dpi)
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+
+
+# pdfium is not thread-safe: serialize all calls within the process
+_pdfium_lock = threading.Lock()
+
+
+class PdfiumDocument(PdfDocument):
+    """In-process rendering via pypdfium2 - no subprocess, no temp files"""
+    
+    backend = "pdfium"
     
-    return file_path, unique_filename, file_size
+    def __init__(self, pdf_path: str):
+        super().__init__(pdf_path)
+        import pypdfium2 as pdfium
+        with _pdfium_lock:
+            self._doc = pdfium.PdfDocument(pdf_path)
+            self.page_count = len(self._doc)
+    
+    def _read_page_size(self, page_num: int) -> Tuple[float, float]:
+        with _pdfium_lock:
+            page = self._doc[page_num - 1]
+            try:
+                return tuple(page.get_size())
+            finally:
+                page.close()
+    
+    def render_page(self, page_num: int, dpi: int) -> "Image.Image":
+        if not 1 <= page_num <= self.page_count:
+            raise ValueError(f"PDF has no page {page_num}")
+        with _pdfium_lock:
+            page = self._doc[page_num - 1]
+            try:
+                bitmap = page.render(scale=dpi / 72)
+            finally:
+                page.close()
+        try:
+            # to_pil() shares the bitmap buffer - copy before it is freed (no pdfium call, no lock)
+            return bitmap.to_pil().convert("RGB")
+        finally:
+            with _pdfium_lock:
+                bitmap.close()
+    
+    def close(self):
+        with _pdfium_lock:
+            self._doc.close()
+
+
+class PopplerDocument(PdfDocument):
+    """Rendering via poppler's pdftoppm subprocess (pdf2image)"""
+    
+    backend = "poppler"
+    
+    def __init__(self, pdf_path: str):
+        super().__init__(pdf_path)
+        import PyPDF2
+        # Parsed once per open document: pages are read from it on demand
+        self._reader = PyPDF2.PdfReader(pdf_path)
+        self.page_count = len(self._reader.pages)
+    
+    def _read_page_size(self, page_num: int) -> Tuple[float, float]:
+        box = self._reader.pages[page_num - 1].mediabox
+        return float(box.width), float(box.height)
+    
+    def render_page(self, page_num: int, dpi: int) -> "Image.Image":
+        from pdf2image import convert_from_path
+        page_images = convert_from_path(
+            self.pdf_path,
+            dpi=dpi,
+            fmt='jpeg',
+            first_page=page_num,
+            last_page=page_num
+        )
+        if not page_images:
+            raise ValueError(f"PDF has no page {page_num}")
+        return page_images[0]
+    
+    def iter_pages(self, dpi: int) -> Iterator["Image.Image"]:
+        # One pdftoppm run for all pages instead of one per page
+        from pdf2image import convert_from_path
+        yield from convert_from_path(self.pdf_path, dpi=dpi, fmt='jpeg')
+
+
+PDF_BACKENDS = {
+    "pdfium": (PDFIUM_SUPPORT, PdfiumDocument),
+    "poppler": (POPPLER_SUPPORT, PopplerDocument),
+}
+
+
+def open_pdf(pdf_path: str, backend: Optional[str] = None) -> PdfDocument:
+    """
+    Open PDF with the configured backend
+    
+    Args:
+        pdf_path: Path to PDF file
+        backend: "pdfium", "poppler" or "auto" (default: settings.PDF_BACKEND)
+        
+    Returns:
+        PdfDocument (use as context manager)
+    """
+    backend = backend or settings.PDF_BACKEND
+    
+    if backend == "auto":
+        for name in ("pdfium", "poppler"):
+            available, document_class = PDF_BACKENDS[name]
+            if available:
+                return document_class(pdf_path)
+        raise ImportError("No PDF backend installed (pypdfium2 or pdf2image)")
+    
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {backend}")
+    
+    available, document_class = PDF_BACKENDS[backend]
+    if not available:
+        raise ImportError(f"PDF backend {backend} is not installed")
+    return document_class(pdf_path)
+
+
+PDF_PAGE_FILENAME = re.compile(r"^pdf_(\d+)_page_(\d+)\.jpg$")
 
 
-def convert_pdf_to_images(pdf_path: str, content_id: int, original_filename: str) -> List[Tuple[str, str]]:
+def get_pdf_page_path(content_id: int, page_num: int) -> str:
+    """Get storage path of a rendered PDF page (by content id: uploads with the same name don't share pages)"""
+    return os.path.join(settings.UPLOAD_DIR, f"pdf_{content_id}_page_{page_num}.jpg")
+
+
+def get_thumbnail_path(file_name: str) -> str:
+    """Get storage path of a content thumbnail (by stored file name, which is unique)"""
+    return os.path.join(settings.UPLOAD_DIR, f"{Path(file_name).stem}_thumb.jpg")
+
+
+def _save_page_image(image: "Image.Image", output_path: str):
+    """Save rendered page atomically (readers never see half-written JPEGs)"""
+    temp_path = f"{output_path}.tmp"
+    try:
+        image.save(temp_path, 'JPEG', quality=settings.PDF_QUALITY, optimize=False)
+        os.replace(temp_path, output_path)
+    except Exception:
+        delete_file(temp_path)
+        raise
+
+
+def render_pdf_page(pdf_path: str, page_num: int, output_path: str, document: Optional[PdfDocument] = None) -> str:
+    """Render a single PDF page to JPEG (lazy mode, ``document``: already opened PDF)"""
+    pdf = document or open_pdf(pdf_path)
+    try:
+        start = time.perf_counter()
+        image = pdf.render_page(page_num, settings.PDF_DPI)
+        _save_page_image(image, output_path)
+        pdf_render_duration.observe(time.perf_counter() - start, backend=pdf.backend)
+        pdf_pages_rendered.inc(backend=pdf.backend)
+    finally:
+        if document is None:
+            pdf.close()
+    return output_path
+
+
+def convert_pdf_to_images(
+    pdf_path: str,
+    content_id: int,
+    original_filename: str,
+    thumbnail_path: Optional[str] = None,
+    thumbnail_size: Tuple[int, int] = (300, 400),
+    document: Optional[PdfDocument] = None
+) -> List[Tuple[str, str]]:
     """
     Convert PDF to JPEG images (one per page)
     
@@ -103,36 +404,38 @@ def convert_pdf_to_images(pdf_path: str, content_id: int, original_filename: str
         pdf_path: Path to PDF file
         content_id: Content ID for naming
         original_filename: Original PDF filename
+        thumbnail_path: If set, thumbnail of page 1 is written here
+            (from the rendered page in memory, no JPEG re-decode)
+        thumbnail_size: Thumbnail bounding box
+        document: Already opened PDF (avoids parsing the file again)
         
     Returns:
         List of (file_path, filename) tuples
     """
-    if not PDF_SUPPORT:
-        raise ImportError("pdf2image is not installed")
-    
     images = []
-    base_name = sanitize_filename(original_filename)
+    pdf = document or open_pdf(pdf_path)
     
     try:
-        # Convert PDF pages to images
-        page_images = convert_from_path(
-            pdf_path,
-            dpi=settings.PDF_DPI,
-            fmt='jpeg'
-        )
-        
-        if len(page_images) > settings.MAX_PDF_PAGES:
-            raise ValueError(f"PDF has {len(page_images)} pages, max is {settings.MAX_PDF_PAGES}")
+        if pdf.page_count > settings.MAX_PDF_PAGES:
+            raise ValueError(f"PDF has {pdf.page_count} pages, max is {settings.MAX_PDF_PAGES}")
         
-        # Save each page as JPEG
-        for page_num, image in enumerate(page_images, 1):
-            filename = f"{base_name}_page_{page_num}.jpg"
-            file_path = os.path.join(settings.UPLOAD_DIR, filename)
+        # Convert PDF pages to images (one page in memory at a time for pdfium)
+        start = time.perf_counter()
+        for page_num, image in enumerate(pdf.iter_pages(settings.PDF_DPI), 1):
+            file_path = get_pdf_page_path(content_id, page_num)
+            filename = os.path.basename(file_path)
             
             # Save with 100% quality for UHD screens
             image.save(file_path, 'JPEG', quality=settings.PDF_QUALITY, optimize=False)
             
             images.append((file_path, filename))
+            
+            if page_num == 1 and thumbnail_path:
+                render_thumbnail(image, thumbnail_path, thumbnail_size)
+            
+            pdf_render_duration.observe(time.perf_counter() - start, backend=pdf.backend)
+            pdf_pages_rendered.inc(backend=pdf.backend)
+            start = time.perf_counter()
         
         return images
     
@@ -141,6 +444,10 @@ def convert_pdf_to_images(pdf_path: str, content_id: int, original_filename: str
         for _, filename in images:
             delete_file(os.path.join(settings.UPLOAD_DIR, filename))
         raise ValueError(f"Error converting PDF: {str(e)}")
+    
+    finally:
+        if document is None:
+            pdf.close()
 
 
 def get_pdf_page_count(pdf_path: str) -> int:
@@ -149,27 +456,345 @@ def get_pdf_page_count(pdf_path: str) -> int:
         return 0
     
     try:
-        import PyPDF2
-        with open(pdf_path, 'rb') as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            return len(pdf_reader.pages)
+        with open_pdf(pdf_path) as pdf:
+            return pdf.page_count
     except Exception as e:
-        print(f"Error reading PDF: {e}")
+        logger.warning("Error reading PDF %s: %s", pdf_path, e)
         return 0
 
 
 def create_thumbnail(image_path: str, thumbnail_path: str, size: Tuple[int, int] = (300, 200)):
-    """Create thumbnail for image"""
+    """Create thumbnail for image (JPEGs are decoded at reduced scale)"""
+    try:
+        with open_for_thumbnail(image_path, size) as img:
+            return render_thumbnail(img, thumbnail_path, size)
+    except Exception as e:
+        logger.warning("Error creating thumbnail for %s: %s", image_path, e)
+        return None
+
+
+# ===== VIDEO PROCESSING =====
+
+MP4_EXTENSIONS = ['.mp4', '.mov', '.m4v']
+
+# Boxes that contain other boxes on the way down to stco/co64
+_MP4_CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+
+def _find_binary(name: str) -> Optional[str]:
+    """Find ffmpeg/ffprobe binary, None if not installed"""
+    return shutil.which(name)
+
+
+def _iter_mp4_boxes(data, start: int, end: int):
+    """
+    Iterate ISO-BMFF boxes in a file object or bytes buffer
+    
+    Yields:
+        (box_type, offset, size, header_size)
+    """
+    offset = start
+    while offset + 8 <= end:
+        if isinstance(data, (bytes, bytearray)):
+            header = bytes(data[offset:offset + 16])
+        else:
+            data.seek(offset)
+            header = data.read(16)
+        if len(header) < 8:
+            break
+        
+        size, box_type = struct.unpack(">I4s", header[:8])
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                break
+            size = struct.unpack(">Q", header[8:16])[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset  # Box extends to end of file
+        
+        if size < header_size or offset + size > end:
+            break
+        
+        yield box_type, offset, size, header_size
+        offset += size
+
+
+def _probe_mp4(file_path: str) -> dict:
+    """Read duration and resolution from MP4 moov atom (no ffprobe needed)"""
+    info = {"duration": None, "width": None, "height": None}
+    file_end = os.path.getsize(file_path)
+    
+    with open(file_path, "rb") as f:
+        moov = next((b for b in _iter_mp4_boxes(f, 0, file_end) if b[0] == b"moov"), None)
+        if not moov:
+            return info
+        
+        _, offset, size, header_size = moov
+        f.seek(offset)
+        buf = f.read(size)
+    
+    for box_type, box_offset, box_size, box_header in _iter_mp4_boxes(buf, header_size, size):
+        body = box_offset + box_header
+        
+        if box_type == b"mvhd":
+            version = buf[body]
+            if version == 1:
+                timescale, duration = struct.unpack(">IQ", buf[body + 20:body + 32])
+            else:
+                timescale, duration = struct.unpack(">II", buf[body + 12:body + 20])
+            if timescale:
+                info["duration"] = duration / timescale
+        
+        elif box_type == b"trak" and not info["width"]:
+            tkhd = next((b for b in _iter_mp4_boxes(buf, body, box_offset + box_size) if b[0] == b"tkhd"), None)
+            if tkhd:
+                tkhd_body = tkhd[1] + tkhd[3]
+                dims_offset = tkhd_body + (88 if buf[tkhd_body] == 1 else 76)
+                width, height = struct.unpack(">II", buf[dims_offset:dims_offset + 8])
+                # 16.16 fixed point; audio tracks have 0x0
+                if width and height:
+                    info["width"] = width >> 16
+                    info["height"] = height >> 16
+    
+    return info
+
+
+def probe_video(file_path: str) -> dict:
+    """
+    Get video duration (seconds) and resolution
+    
+    Uses ffprobe if installed, otherwise parses the MP4 container directly.
+    
+    Returns:
+        Dict with duration, width, height (None if unknown)
+    """
+    ffprobe = _find_binary("ffprobe")
+    if ffprobe:
+        try:
+            result = subprocess.run(
+                [
+                    ffprobe, "-v", "error",
+                    "-select_streams", "v:0",
+                    "-show_entries", "stream=width,height:format=duration",
+                    "-of", "json",
+                    file_path
+                ],
+                capture_output=True, check=True, timeout=settings.VIDEO_PROCESS_TIMEOUT
+            )
+            data = json.loads(result.stdout)
+            stream = (data.get("streams") or [{}])[0]
+            duration = data.get("format", {}).get("duration")
+            return {
+                "duration": float(duration) if duration else None,
+                "width": stream.get("width"),
+                "height": stream.get("height")
+            }
+        except Exception as e:
+            logger.warning("ffprobe failed for %s: %s", file_path, e)
+    
+    if Path(file_path).suffix.lower() in MP4_EXTENSIONS:
+        try:
+            return _probe_mp4(file_path)
+        except Exception as e:
+            logger.warning("Error probing video %s: %s", file_path, e)
+    
+    return {"duration": None, "width": None, "height": None}
+
+
+def extract_video_poster(file_path: str, thumbnail_path: str, duration: Optional[float] = None,
+                         size: Tuple[int, int] = (300, 200)) -> Optional[str]:
+    """Extract a poster frame as JPEG thumbnail (requires ffmpeg)"""
+    ffmpeg = _find_binary("ffmpeg")
+    if not ffmpeg:
+        return None
+    
+    # Skip black intro frames, but stay inside short clips
+    seek = settings.VIDEO_POSTER_OFFSET
+    if duration:
+        seek = min(seek, duration / 2)
+    
     try:
-        with Image.open(image_path) as img:
-            img.thumbnail(size)
-            img.save(thumbnail_path, "JPEG", quality=85)
-        return thumbnail_path
+        subprocess.run(
+            [
+                ffmpeg, "-y", "-v", "error",
+                "-ss", f"{seek:.3f}",
+                "-i", file_path,
+                "-frames:v", "1",
+                "-vf", f"scale={size[0]}:{size[1]}:force_original_aspect_ratio=decrease",
+                thumbnail_path
+            ],
+            capture_output=True, check=True, timeout=settings.VIDEO_PROCESS_TIMEOUT
+        )
+        return thumbnail_path if os.path.exists(thumbnail_path) else None
     except Exception as e:
-        print(f"Error creating thumbnail: {e}")
+        logger.warning("Error extracting video poster: %s", e)
+        delete_file(thumbnail_path)
         return None
 
 
+def _patch_chunk_offsets(buf: bytearray, start: int, end: int, delta: int) -> bool:
+    """Shift all stco/co64 chunk offsets in a moov buffer by delta
+    
+    Returns:
+        False if a 32-bit offset would overflow
+    """
+    for box_type, offset, size, header_size in _iter_mp4_boxes(buf, start, end):
+        body = offset + header_size
+        
+        if box_type in _MP4_CONTAINER_BOXES:
+            if not _patch_chunk_offsets(buf, body, offset + size, delta):
+                return False
+        
+        elif box_type == b"stco":
+            count = struct.unpack(">I", buf[body + 4:body + 8])[0]
+            entries = body + 8
+            offsets = struct.unpack(f">{count}I", buf[entries:entries + count * 4])
+            if offsets and max(offsets) + delta > 0xFFFFFFFF:
+                return False
+            struct.pack_into(f">{count}I", buf, entries, *(o + delta for o in offsets))
+        
+        elif box_type == b"co64":
+            count = struct.unpack(">I", buf[body + 4:body + 8])[0]
+            entries = body + 8
+            offsets = struct.unpack(f">{count}Q", buf[entries:entries + count * 8])
+            struct.pack_into(f">{count}Q", buf, entries, *(o + delta for o in offsets))
+    
+    return True
+
+
+def _copy_range(src, dst, offset: int, length: int):
+    src.seek(offset)
+    while length > 0:
+        chunk = src.read(min(settings.UPLOAD_CHUNK_SIZE, length))
+        if not chunk:
+            break
+        dst.write(chunk)
+        length -= len(chunk)
+
+
+def _relocate_moov(file_path: str, output_path: str) -> bool:
+    """
+    Pure-Python faststart: move moov atom in front of mdat
+    
+    Returns:
+        True if output_path was written, False if not needed/possible
+    """
+    file_end = os.path.getsize(file_path)
+    
+    with open(file_path, "rb") as src:
+        boxes = list(_iter_mp4_boxes(src, 0, file_end))
+        moov = next((b for b in boxes if b[0] == b"moov"), None)
+        mdat = next((b for b in boxes if b[0] == b"mdat"), None)
+        
+        # Already faststart (or not an MP4 we understand)
+        if not moov or not mdat or moov[1] < mdat[1]:
+            return False
+        
+        _, moov_offset, moov_size, moov_header = moov
+        src.seek(moov_offset)
+        moov_buf = bytearray(src.read(moov_size))
+        
+        # Everything from mdat on moves back by the size of moov
+        if not _patch_chunk_offsets(moov_buf, moov_header, moov_size, moov_size):
+            return False
+        
+        with open(output_path, "wb") as dst:
+            for box_type, offset, size, _ in boxes:
+                if offset == mdat[1]:
+                    dst.write(moov_buf)
+                if box_type != b"moov":
+                    _copy_range(src, dst, offset, size)
+    
+    return True
+
+
+def _moov_after_mdat(file_path: str) -> bool:
+    """True if the moov atom comes after mdat (False: already faststart or not understood)"""
+    with open(file_path, "rb") as f:
+        # Top-level boxes in file order: whichever comes first decides
+        for box_type, _, _, _ in _iter_mp4_boxes(f, 0, os.path.getsize(file_path)):
+            if box_type == b"moov":
+                return False
+            if box_type == b"mdat":
+                return True
+    return False
+
+
+def make_video_faststart(file_path: str) -> bool:
+    """
+    Remux MP4 so the moov atom comes first (playback starts before download ends)
+    
+    Files that already have moov first are left alone. Otherwise uses
+    ffmpeg if installed, or relocates the moov atom in Python. The file is
+    replaced atomically.
+    
+    Returns:
+        True if the file was rewritten
+    """
+    if Path(file_path).suffix.lower() not in MP4_EXTENSIONS:
+        return False
+    
+    base, ext = os.path.splitext(file_path)
+    temp_path = f"{base}.faststart{ext}"
+    
+    try:
+        if not _moov_after_mdat(file_path):
+            return False
+        
+        ffmpeg = _find_binary("ffmpeg")
+        if ffmpeg:
+            subprocess.run(
+                [
+                    ffmpeg, "-y", "-v", "error",
+                    "-i", file_path,
+                    "-map", "0", "-c", "copy",
+                    "-movflags", "+faststart",
+                    temp_path
+                ],
+                capture_output=True, check=True, timeout=settings.VIDEO_PROCESS_TIMEOUT
+            )
+        elif not _relocate_moov(file_path, temp_path):
+            return False
+        
+        os.replace(temp_path, file_path)
+        return True
+    except Exception as e:
+        logger.warning("Error creating faststart video: %s", e)
+        delete_file(temp_path)
+        return False
+
+
+def process_video_file(file_path: str, thumbnail_path: str) -> dict:
+    """
+    Video ingestion: faststart remux, probe and poster frame
+    
+    Returns:
+        Dict with duration, width, height, thumbnail_path, remuxed
+    """
+    remuxed = make_video_faststart(file_path)
+    info = probe_video(file_path)
+    info["thumbnail_path"] = extract_video_poster(file_path, thumbnail_path, info["duration"])
+    info["remuxed"] = remuxed
+    return info
+
+
+def hash_file(file_path: str) -> str:
+    """Get SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(settings.UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def video_duration_seconds(duration: Optional[float], default: int) -> int:
+    """Round video length up to whole seconds for display duration"""
+    if not duration:
+        return default
+    return max(1, math.ceil(duration))
+
+
 def delete_file(file_path: str):
     """Delete file from storage"""
     try:
@@ -177,7 +802,7 @@ def delete_file(file_path: str):
             os.remove(file_path)
             return True
     except Exception as e:
-        print(f"Error deleting file: {e}")
+        logger.warning("Error deleting file %s: %s", file_path, e)
     return False
 
 
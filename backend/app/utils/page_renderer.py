@@ -0,0 +1,132 @@
+import os
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+from fastapi.concurrency import run_in_threadpool
+
+from app.utils.file_handler import PdfDocument, open_pdf, render_pdf_page
+
+
+class _OpenDocument:
+    def __init__(self, document: PdfDocument):
+        self.document = document  # Keeps page count and the page sizes read so far
+        self.users = 0
+        self.evicted = False
+
+
+class PageRenderer:
+    """On-demand PDF page rendering with request coalescing
+
+    Rendered pages are written to their final ContentItem.file_path, so the
+    upload directory itself is the render cache (nginx serves them directly
+    once they exist). Concurrent requests for the same page - from HTTP
+    handlers or background jobs - share a single render.
+
+    The most recently used PDFs stay open, so rendering page N doesn't parse
+    the whole file again for every page.
+    """
+
+    MAX_OPEN_DOCUMENTS = 8
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._documents: "OrderedDict[str, _OpenDocument]" = OrderedDict()
+
+    def render(self, pdf_path: str, page_num: int, output_path: str) -> str:
+        """Render page if not cached yet (blocking)"""
+        if os.path.exists(output_path):
+            return output_path
+
+        with self._lock:
+            future = self._inflight.get(output_path)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[output_path] = future
+
+        # Someone else is already rendering this page
+        if not is_owner:
+            return future.result()
+
+        try:
+            with self._document(pdf_path) as document:
+                render_pdf_page(pdf_path, page_num, output_path, document=document)
+            future.set_result(output_path)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(output_path, None)
+
+        return output_path
+
+    async def render_async(self, pdf_path: str, page_num: int, output_path: str) -> str:
+        """Render page if not cached yet, without blocking the event loop"""
+        if os.path.exists(output_path):
+            return output_path
+
+        with self._lock:
+            future = self._inflight.get(output_path)
+        if future is not None:
+            return await asyncio.wrap_future(future)
+
+        return await run_in_threadpool(self.render, pdf_path, page_num, output_path)
+
+    def forget(self, pdf_path: str):
+        """Close the cached document of a deleted PDF"""
+        with self._lock:
+            entry = self._documents.pop(pdf_path, None)
+            unused = self._retire(entry) if entry else []
+        self._close(unused)
+
+    @contextmanager
+    def _document(self, pdf_path: str) -> Iterator[PdfDocument]:
+        """Open document from the cache (opened outside the lock on a miss)"""
+        with self._lock:
+            entry = self._documents.get(pdf_path)
+            if entry is not None:
+                self._documents.move_to_end(pdf_path)
+                entry.users += 1
+
+        if entry is None:
+            document = open_pdf(pdf_path)
+            unused = []
+            with self._lock:
+                entry = self._documents.get(pdf_path)
+                if entry is None:
+                    entry = self._documents[pdf_path] = _OpenDocument(document)
+                    while len(self._documents) > self.MAX_OPEN_DOCUMENTS:
+                        _, oldest = self._documents.popitem(last=False)
+                        unused.extend(self._retire(oldest))
+                else:
+                    unused.append(document)  # Opened concurrently by another thread
+                entry.users += 1
+            self._close(unused)
+
+        try:
+            yield entry.document
+        finally:
+            with self._lock:
+                entry.users -= 1
+                unused = [entry.document] if entry.evicted and entry.users == 0 else []
+            self._close(unused)
+
+    @staticmethod
+    def _retire(entry: _OpenDocument) -> List[PdfDocument]:
+        """Mark dropped from the cache, returns the document if nobody renders with it"""
+        entry.evicted = True
+        return [entry.document] if entry.users == 0 else []
+
+    @staticmethod
+    def _close(documents: List[PdfDocument]):
+        for document in documents:
+            document.close()
+
+
+# Global instance
+page_renderer = PageRenderer()
@@ -0,0 +1,189 @@
+import os
+import json
+import uuid
+import time
+import asyncio
+from typing import AsyncIterator, Dict, Optional
+import aiofiles
+
+from app.core.config import settings
+from app.utils.file_handler import UploadTooLargeError, delete_file, hash_file
+
+
+# Per-upload locks so two PATCH requests can't append at the same time
+_upload_locks: Dict[str, asyncio.Lock] = {}
+
+
+class UploadOffsetMismatchError(ValueError):
+    """Raised when a chunk does not start at the current upload offset"""
+
+    def __init__(self, expected: int, received: int):
+        self.expected = expected
+        self.received = received
+        super().__init__(f"Upload offset mismatch: expected {expected}, got {received}")
+
+
+class UploadChecksumMismatchError(ValueError):
+    """Raised when the received file does not match the checksum declared at create"""
+
+    def __init__(self, expected: str, received: str):
+        self.expected = expected
+        self.received = received
+        super().__init__(f"Checksum mismatch: expected {expected}, got {received}")
+
+
+def get_staging_dir() -> str:
+    """Get (and create) directory for in-progress uploads"""
+    staging_dir = os.path.join(settings.UPLOAD_DIR, ".staging")
+    os.makedirs(staging_dir, exist_ok=True)
+    return staging_dir
+
+
+def _part_path(upload_id: str) -> str:
+    return os.path.join(get_staging_dir(), f"{upload_id}.part")
+
+
+def _meta_path(upload_id: str) -> str:
+    return os.path.join(get_staging_dir(), f"{upload_id}.json")
+
+
+def _is_valid_upload_id(upload_id: str) -> bool:
+    """Upload ids are uuid4 hex - reject anything else (path traversal)"""
+    return len(upload_id) == 32 and all(c in "0123456789abcdef" for c in upload_id)
+
+
+def create_upload(metadata: dict) -> dict:
+    """
+    Create a new resumable upload session
+
+    Args:
+        metadata: Upload metadata (filename, length, title, ...)
+
+    Returns:
+        Stored metadata including the new upload id
+    """
+    upload_id = uuid.uuid4().hex
+    metadata = {**metadata, "id": upload_id, "created_at": time.time()}
+
+    # Create empty staging file
+    open(_part_path(upload_id), "wb").close()
+    with open(_meta_path(upload_id), "w") as f:
+        json.dump(metadata, f)
+
+    return metadata
+
+
+def get_upload(upload_id: str) -> Optional[dict]:
+    """Get upload metadata, or None if the upload does not exist"""
+    if not _is_valid_upload_id(upload_id):
+        return None
+    try:
+        with open(_meta_path(upload_id)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_upload_offset(upload_id: str) -> int:
+    """Get number of bytes received so far"""
+    try:
+        return os.path.getsize(_part_path(upload_id))
+    except OSError:
+        return 0
+
+
+async def append_chunk(upload_id: str, offset: int, chunks: AsyncIterator[bytes], length: int) -> int:
+    """
+    Append a chunk to the staging file
+
+    Bytes are written as they arrive, so an interrupted request still
+    advances the offset and the client resumes from wherever it got to.
+
+    Args:
+        upload_id: Upload id
+        offset: Offset the client claims the chunk starts at
+        chunks: Async iterator of raw bytes
+        length: Declared total upload length
+
+    Returns:
+        New upload offset
+
+    Raises:
+        UploadOffsetMismatchError: If offset is not the current offset
+        UploadTooLargeError: If the chunk would exceed the declared length
+    """
+    lock = _upload_locks.setdefault(upload_id, asyncio.Lock())
+
+    async with lock:
+        current = get_upload_offset(upload_id)
+        if offset != current:
+            raise UploadOffsetMismatchError(current, offset)
+
+        async with aiofiles.open(_part_path(upload_id), "ab") as f:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                if current + len(chunk) > length:
+                    raise UploadTooLargeError(length)
+                await f.write(chunk)
+                current += len(chunk)
+
+        return current
+
+
+async def finalize_upload(upload_id: str, file_path: str, expected_checksum: Optional[str] = None) -> str:
+    """
+    Move a completed upload into storage
+
+    Returns:
+        SHA-256 of the file
+
+    Raises:
+        UploadChecksumMismatchError: If expected_checksum is given and differs
+            (the staging file is left in place)
+    """
+    lock = _upload_locks.setdefault(upload_id, asyncio.Lock())
+
+    async with lock:
+        checksum = await asyncio.to_thread(hash_file, _part_path(upload_id))
+        if expected_checksum and checksum != expected_checksum.lower():
+            raise UploadChecksumMismatchError(expected_checksum.lower(), checksum)
+        os.replace(_part_path(upload_id), file_path)
+        delete_file(_meta_path(upload_id))
+
+    _upload_locks.pop(upload_id, None)
+    return checksum
+
+
+def delete_upload(upload_id: str):
+    """Abort an upload and remove its staging files"""
+    delete_file(_part_path(upload_id))
+    delete_file(_meta_path(upload_id))
+    _upload_locks.pop(upload_id, None)
+
+
+def cleanup_expired_uploads() -> int:
+    """Remove uploads that were not finished within UPLOAD_SESSION_TTL_HOURS"""
+    staging_dir = get_staging_dir()
+    cutoff = time.time() - settings.UPLOAD_SESSION_TTL_HOURS * 3600
+    removed = 0
+
+    for filename in os.listdir(staging_dir):
+        if not filename.endswith(".json"):
+            continue
+        upload_id = filename[:-len(".json")]
+
+        # Last activity = last chunk written
+        try:
+            last_activity = max(
+                os.path.getmtime(_meta_path(upload_id)),
+                os.path.getmtime(_part_path(upload_id)) if os.path.exists(_part_path(upload_id)) else 0
+            )
+        except OSError:
+            continue
+
+        if last_activity < cutoff:
+            delete_upload(upload_id)
+            removed += 1
+
+    return removed
@@ -0,0 +1,175 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+def open_for_thumbnail(image_path: str, size) -> "Image.Image":
+    """
+    Open image with reduced decoding for a target size
+
+    For JPEGs, ``draft()`` lets libjpeg decode at 1/2, 1/4 or 1/8 scale
+    directly, so a 300x400 preview of a 300-DPI page never decodes the
+    full ~33 MP bitmap. A height of None means "width only": the box gets
+    the image's aspect ratio, since draft() only reduces as far as both
+    box sides allow.
+    """
+    from PIL import Image  # Imported on first use (startup time)
+    img = Image.open(image_path)
+    if img.format == "JPEG":
+        box_width, box_height = size
+        if box_height is None:
+            box_height = max(1, box_width * img.height // img.width)  # Floor: draft() divides sizes by the box
+        img.draft("RGB", (box_width, box_height))
+    return img
+
+
+def render_thumbnail(img: "Image.Image", thumbnail_path: str, size) -> str:
+    """Write a JPEG thumbnail of an (in-memory) image
+
+    Unlike ``Image.thumbnail`` the source image is left untouched, so a
+    rendered PDF page can be thumbnailed before (or after) it is saved.
+    """
+    from PIL import Image
+    width, height = img.size
+    ratio = min(size[0] / width, size[1] / height if size[1] else 1, 1)
+    thumb = img
+    if ratio < 1:
+        # reducing_gap: cheap integer reduce() first, then resample
+        thumb = img.resize(
+            (max(1, round(width * ratio)), max(1, round(height * ratio))),
+            Image.LANCZOS,
+            reducing_gap=3.0
+        )
+    if thumb.mode not in ("RGB", "L"):
+        thumb = thumb.convert("RGB")
+
+    # Write to temp file first - other workers may be reading the cache
+    temp_path = f"{thumbnail_path}.tmp{threading.get_ident()}"
+    thumb.save(temp_path, "JPEG", quality=85)
+    os.replace(temp_path, thumbnail_path)
+    return thumbnail_path
+
+
+class ThumbnailCache:
+    """On-disk thumbnail cache with LRU eviction
+
+    Thumbnails are keyed by source path, source mtime and width, so a
+    replaced source file never serves a stale thumbnail. The cache lives in
+    UPLOAD_DIR and is shared by all workers; each worker keeps its own LRU
+    index and evicts down to THUMBNAIL_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # path -> size
+        self._total_size = 0
+        self._loaded = False
+
+    @property
+    def cache_dir(self) -> str:
+        return os.path.join(settings.UPLOAD_DIR, ".thumbcache")
+
+    def _load(self):
+        """Build LRU index from files on disk (oldest access first)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".jpg"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+
+        for _, path, size in sorted(files):
+            self._entries[path] = size
+            self._total_size += size
+        self._loaded = True
+
+    @staticmethod
+    def snap_width(width: int) -> int:
+        """Round requested width up to a configured size (bounds cache cardinality)"""
+        for allowed in sorted(settings.THUMBNAIL_WIDTHS):
+            if width <= allowed:
+                return allowed
+        return max(settings.THUMBNAIL_WIDTHS)
+
+    def _cache_path(self, source_path: str, width: int) -> str:
+        mtime = os.path.getmtime(source_path)
+        key = hashlib.sha1(f"{source_path}:{mtime}:{width}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.jpg")
+
+    def get(self, source_path: str, width: int) -> Optional[str]:
+        """
+        Get path of a cached thumbnail, rendering it on a miss
+
+        Args:
+            source_path: Original image (JPEG/PNG/...)
+            width: Requested width (snapped to THUMBNAIL_WIDTHS)
+
+        Returns:
+            Path of thumbnail, None if source can't be read
+        """
+        if not os.path.exists(source_path):
+            return None
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+        width = self.snap_width(width)
+        cache_path = self._cache_path(source_path, width)
+
+        with self._lock:
+            if cache_path in self._entries:
+                self._entries.move_to_end(cache_path)
+                hit = True
+            else:
+                hit = False
+
+        if hit and os.path.exists(cache_path):
+            # Refresh mtime so LRU order survives restarts
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return cache_path
+
+        # Height follows the source's aspect ratio
+        size = (width, None)
+        try:
+            with open_for_thumbnail(source_path, size) as img:
+                render_thumbnail(img, cache_path, size)
+        except Exception as e:
+            logger.warning("Error creating thumbnail for %s: %s", source_path, e)
+            return None
+
+        self._add(cache_path, os.path.getsize(cache_path))
+        return cache_path
+
+    def _add(self, cache_path: str, size: int):
+        with self._lock:
+            if cache_path in self._entries:
+                self._total_size -= self._entries.pop(cache_path)
+            self._entries[cache_path] = size
+            self._total_size += size
+
+            # Evict least recently used
+            while self._total_size > settings.THUMBNAIL_CACHE_MAX_BYTES and len(self._entries) > 1:
+                old_path, old_size = self._entries.popitem(last=False)
+                self._total_size -= old_size
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+
+
+# Global instance
+thumbnail_cache = ThumbnailCache()
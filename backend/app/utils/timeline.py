@@ -0,0 +1,136 @@
+"""Deterministic playback timeline for synchronized displays.
+
+A timeline maps server time to "which item is on screen" without any
+per-slide messages: every display that got the same timeline and knows the
+server clock (see the ``time_sync`` WebSocket message) shows the same item.
+
+Looping playlists are anchored at the Unix epoch, so all screens showing a
+playlist agree on the current slot regardless of when they connected.
+
+Shuffled playlists get a new order every cycle. The order is never stored:
+``shuffle_index(slot, count, seed, cycle)`` maps a slot to an item with a
+keyed Feistel permutation (O(1) memory). display.html implements the same
+32-bit arithmetic, so server and screens agree on every cycle's order.
+"""
+from typing import List, Optional
+import time
+
+
+MIN_ITEM_DURATION_MS = 1000
+FEISTEL_ROUNDS = 4
+
+_MASK32 = 0xFFFFFFFF
+
+
+def now_ms() -> int:
+    """Server wall clock in milliseconds (timeline/clock sync time base)"""
+    return int(time.time() * 1000)
+
+
+def _mix32(h: int) -> int:
+    """32-bit avalanche mix (murmur3 finalizer)"""
+    h &= _MASK32
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & _MASK32
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & _MASK32
+    h ^= h >> 16
+    return h
+
+
+def shuffle_index(slot: int, count: int, seed: int, cycle: int) -> int:
+    """
+    Item index shown in ``slot`` of shuffled ``cycle``
+
+    Bijection on range(count) from a balanced Feistel network over the next
+    even power of two, cycle-walking values outside the range back in
+    (fewer than 4 steps on average).
+    """
+    if count <= 1:
+        return slot
+
+    half = ((count - 1).bit_length() + 1) // 2
+    mask = (1 << half) - 1
+    keys = [
+        _mix32(seed ^ _mix32(cycle ^ _mix32(round_num + 1)))
+        for round_num in range(FEISTEL_ROUNDS)
+    ]
+
+    value = slot
+    while True:
+        left, right = value >> half, value & mask
+        for key in keys:
+            left, right = right, left ^ (_mix32(right ^ key) & mask)
+        value = (left << half) | right
+        if value < count:
+            return value
+
+
+def cycle_order(count: int, shuffle: bool, seed: int, cycle: int) -> List[int]:
+    """Materialized playback order of one cycle (for APIs/analytics)"""
+    if not shuffle:
+        return list(range(count))
+    return [shuffle_index(slot, count, seed, cycle) for slot in range(count)]
+
+
+def build_timeline(durations: List[int], loop: bool, shuffle: bool, seed: int,
+                   epoch: Optional[int] = None) -> dict:
+    """
+    Compute playback timeline
+
+    Args:
+        durations: Item durations in seconds (playlist order)
+        loop: Playlist loops
+        shuffle: New seeded order every cycle
+        seed: Shuffle seed (same seed = same orders on every screen)
+        epoch: Start of cycle 0 in ms; default Unix epoch for looping
+            playlists, now for play-once playlists
+
+    Returns:
+        Dict with item ``durations`` (ms, playlist order) and ``cycle_ms``
+        (total length of one pass)
+    """
+    item_durations = [max(int((duration or 0) * 1000), MIN_ITEM_DURATION_MS) for duration in durations]
+
+    if epoch is None:
+        epoch = 0 if loop else now_ms()
+
+    return {
+        "epoch": epoch,
+        "cycle_ms": sum(item_durations),
+        "loop": loop,
+        "shuffle": shuffle,
+        "seed": seed & _MASK32,
+        "durations": item_durations
+    }
+
+
+def position_at(timeline: dict, at_ms: int) -> Optional[dict]:
+    """Slot on screen at server time ``at_ms`` (None if empty or play-once finished)"""
+    cycle_ms = timeline["cycle_ms"]
+    if not cycle_ms:
+        return None
+
+    elapsed = max(at_ms - timeline["epoch"], 0)
+    cycle, into_cycle = divmod(elapsed, cycle_ms)
+    if cycle and not timeline["loop"]:
+        return None
+
+    durations = timeline["durations"]
+    count = len(durations)
+    offset = 0
+    for slot in range(count):
+        item_index = slot
+        if timeline["shuffle"]:
+            item_index = shuffle_index(slot, count, timeline["seed"], cycle & _MASK32)
+        duration = durations[item_index]
+        if into_cycle < offset + duration:
+            return {
+                "cycle": cycle,
+                "slot": slot,
+                "item_index": item_index,
+                "elapsed_ms": into_cycle - offset,
+                "remaining_ms": offset + duration - into_cycle
+            }
+        offset += duration
+    return None
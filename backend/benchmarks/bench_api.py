@@ -0,0 +1,149 @@
+"""HTTP API scenarios: login, content listing, playlist /full, PDF upload.
+
+Usage (from backend/):
+    python -m benchmarks.bench_api [--url URL --username U --password P]
+                                   [--requests N] [--concurrency C] [--items N]
+
+Without --url a uvicorn server is started against a scratch SQLite DB
+(use --database-url for a local MySQL container). Setup data (images, a
+playlist with --items entries, a PDF) is created through the API, so the
+same script works against any deployment. Requires httpx
+(benchmarks/requirements.txt).
+"""
+from contextlib import nullcontext
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.common import (
+    BENCH_USERNAME, BENCH_PASSWORD, local_server, make_test_image, make_test_pdf, summarize, write_report
+)
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> httpx.Response:
+    return await client.post("/api/v1/auth/login", data={"username": username, "password": password})
+
+
+async def run_scenario(name: str, request, total: int, concurrency: int) -> dict:
+    """Fire ``total`` requests with ``concurrency`` in flight, collect latencies"""
+    latencies = []
+    errors = {}
+    remaining = iter(range(total))
+
+    async def worker():
+        for i in remaining:
+            start = time.perf_counter()
+            try:
+                response = await request(i)
+                if response.status_code >= 400:
+                    errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+                    continue
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = {"scenario": name, "requests": total, "concurrency": concurrency, "errors": errors}
+    result.update(summarize(latencies, elapsed))
+    return result
+
+
+async def setup_playlist(client: httpx.AsyncClient, tmp: str, items: int) -> int:
+    """Upload a few images and build a playlist with ``items`` entries"""
+    image_path = os.path.join(tmp, "bench.jpg")
+    make_test_image(image_path)
+
+    content_item_ids = []
+    for i in range(min(items, 10)):
+        with open(image_path, "rb") as f:
+            response = await client.post(
+                "/api/v1/content",
+                files={"file": (f"bench{i}.jpg", f, "image/jpeg")},
+                data={"title": f"Bench image {i}"}
+            )
+        response.raise_for_status()
+        content_items = await client.get(f"/api/v1/content/{response.json()['id']}/items")
+        content_item_ids.extend(item["id"] for item in content_items.json())
+
+    response = await client.post("/api/v1/playlists", json={"name": f"Bench {time.time():.0f}"})
+    response.raise_for_status()
+    playlist_id = response.json()["id"]
+
+    for order in range(items):
+        response = await client.post(
+            f"/api/v1/playlists/{playlist_id}/items",
+            json={"content_item_id": content_item_ids[order % len(content_item_ids)], "order": order}
+        )
+        response.raise_for_status()
+    return playlist_id
+
+
+async def run(args, base_url: str) -> list:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        response = await login(client, args.username, args.password)
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            playlist_id = await setup_playlist(client, tmp, args.items)
+
+            pdf_path = os.path.join(tmp, "bench.pdf")
+            make_test_pdf(pdf_path, args.pdf_pages)
+            with open(pdf_path, "rb") as f:
+                pdf_bytes = f.read()
+
+            async def upload_pdf(i):
+                return await client.post(
+                    "/api/v1/content",
+                    files={"file": (f"bench{i}.pdf", pdf_bytes, "application/pdf")},
+                    data={"title": f"Bench PDF {i}"}
+                )
+
+            scenarios = [
+                ("login", lambda i: login(client, args.username, args.password), args.requests),
+                ("content_list", lambda i: client.get("/api/v1/content"), args.requests),
+                ("playlist_full", lambda i: client.get(f"/api/v1/playlists/{playlist_id}/full"), args.requests),
+                ("pdf_upload", upload_pdf, args.uploads),
+            ]
+
+            results = []
+            for name, request, total in scenarios:
+                if args.scenario and name not in args.scenario:
+                    continue
+                results.append(await run_scenario(name, request, total, args.concurrency))
+            return results
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server (default: start one)")
+    parser.add_argument("--database-url", help="DATABASE_URL for the started server (default: scratch SQLite)")
+    parser.add_argument("--username", default=BENCH_USERNAME)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per read scenario")
+    parser.add_argument("--uploads", type=int, default=10, help="PDF uploads")
+    parser.add_argument("--pdf-pages", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--items", type=int, default=50, help="Items in the /full playlist")
+    parser.add_argument("--scenario", action="append", help="Run only these scenarios (repeatable)")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    server = nullcontext(args.url) if args.url else local_server(args.database_url)
+    with server as base_url:
+        results = asyncio.run(run(args, base_url))
+
+    params = {key: value for key, value in vars(args).items() if key not in ("password", "output")}
+    return write_report("api", results, params, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Micro-benchmarks for the ingestion hot paths in app.utils.file_handler.
+
+Usage (from backend/):
+    python -m benchmarks.bench_file_handler [--repeat N] [--pages N]
+
+- convert_pdf_to_images: full conversion (pages + thumbnail) of a generated PDF
+- create_thumbnail: JPEG/PNG sources of several sizes
+
+Output files go to a temporary UPLOAD_DIR.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.core.config import settings
+from app.utils.file_handler import PDF_SUPPORT, convert_pdf_to_images, create_thumbnail
+from benchmarks.common import make_test_image, make_test_pdf, summarize, write_report
+
+
+IMAGE_SIZES = [(1920, 1080), (3840, 2160)]
+
+
+def bench_convert_pdf(tmp: str, pages: int, repeat: int) -> dict:
+    pdf_path = os.path.join(tmp, "bench.pdf")
+    make_test_pdf(pdf_path, pages)
+
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        images = convert_pdf_to_images(
+            pdf_path, i, f"bench{i}.pdf", thumbnail_path=os.path.join(tmp, f"bench{i}_thumb.jpg")
+        )
+        samples.append(time.perf_counter() - start)
+        for file_path, _ in images:
+            os.remove(file_path)
+
+    result = {"name": "convert_pdf_to_images", "pages": pages, "dpi": settings.PDF_DPI}
+    result.update(summarize(samples))
+    result["pages_per_s"] = round(pages * len(samples) / sum(samples), 2)
+    return result
+
+
+def bench_thumbnail(tmp: str, size, ext: str, repeat: int) -> dict:
+    source = os.path.join(tmp, f"source_{size[0]}x{size[1]}.{ext}")
+    make_test_image(source, size)
+    thumbnail_path = os.path.join(tmp, "thumb.jpg")
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        create_thumbnail(source, thumbnail_path)
+        samples.append(time.perf_counter() - start)
+
+    result = {"name": "create_thumbnail", "source": f"{size[0]}x{size[1]} {ext}"}
+    result.update(summarize(samples))
+    return result
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=10, help="Pages of the generated PDF")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.UPLOAD_DIR = tmp
+
+        if PDF_SUPPORT:
+            results.append(bench_convert_pdf(tmp, args.pages, args.repeat))
+        else:
+            results.append({"name": "convert_pdf_to_images", "skipped": "no PDF backend installed"})
+
+        for size in IMAGE_SIZES:
+            for ext in ("jpg", "png"):
+                results.append(bench_thumbnail(tmp, size, ext, args.repeat))
+
+    params = {"repeat": args.repeat, "pages": args.pages, "pdf_backend": settings.PDF_BACKEND}
+    return write_report("file_handler", results, params, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare PDF backends (pdfium vs poppler): open/inspect and page rendering.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_backends [--pdf FILE] [--pages N] [--dpi DPI]
+
+Without --pdf a test document is generated with Pillow. Results are
+printed as JSON (see benchmarks.common.write_report).
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.utils.file_handler import PDF_BACKENDS, open_pdf
+from benchmarks.common import make_test_pdf, write_report
+
+
+def bench_backend(backend: str, pdf_path: str, dpi: int) -> dict:
+    start = time.perf_counter()
+    with open_pdf(pdf_path, backend=backend) as pdf:
+        open_time = time.perf_counter() - start
+        page_count = pdf.page_count
+
+        render_start = time.perf_counter()
+        for image in pdf.iter_pages(dpi):
+            image.load()
+        render_time = time.perf_counter() - render_start
+
+        single_start = time.perf_counter()
+        pdf.render_page(1, dpi)
+        single_time = time.perf_counter() - single_start
+
+    return {
+        "backend": backend,
+        "pages": page_count,
+        "dpi": dpi,
+        "open_s": round(open_time, 4),
+        "render_all_s": round(render_time, 4),
+        "pages_per_s": round(page_count / render_time, 2) if render_time else None,
+        "render_first_page_s": round(single_time, 4),
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pdf", help="PDF file to benchmark (default: generated)")
+    parser.add_argument("--pages", type=int, default=10, help="Pages of generated PDF")
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf
+        if not pdf_path:
+            pdf_path = os.path.join(tmp, "bench.pdf")
+            make_test_pdf(pdf_path, args.pages)
+
+        results = []
+        for backend, (available, _) in PDF_BACKENDS.items():
+            if not available:
+                results.append({"backend": backend, "skipped": "not installed"})
+                continue
+            try:
+                results.append(bench_backend(backend, pdf_path, args.dpi))
+            except Exception as e:
+                results.append({"backend": backend, "error": str(e)})
+
+    params = {"pdf": args.pdf, "pages": args.pages, "dpi": args.dpi}
+    return write_report("pdf_backends", results, params, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""List endpoint serialization: ORM + Pydantic + json vs. read models + orjson.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [--rows N] [--repeat N]
+
+Seeds a scratch SQLite DB with --rows content entries (one item each),
+--rows playlists (two items, one schedule each) and one playlist with --rows
+items, then times the query-to-bytes path of
+
+- content_list   GET /api/v1/content
+- playlist_list  GET /api/v1/playlists
+- playlist_full  GET /api/v1/playlists/{id}/full
+
+"orm" is what the endpoints did before: ORM objects validated through the
+``from_attributes`` response models (lazy-loading children per row), dumped
+and encoded with json.dumps like FastAPI's JSONResponse. "read_model" is
+the column projection encoded with orjson. Both payloads are compared, so a
+drifting read model fails the benchmark.
+"""
+from datetime import time as dt_time
+from typing import List
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.read_models import content_list, playlist_list, playlist_with_content
+import app.models
+from app.models.content import Content, ContentItem, ContentType
+from app.models.playlist import Playlist, PlaylistItem, PlaylistSchedule
+from app.schemas.content import ContentResponse
+from app.schemas.playlist import PlaylistResponse, PlaylistWithContent
+from benchmarks.common import summarize, write_report
+
+
+def seed(session, rows: int) -> int:
+    """Bulk insert the fixture, returns the id of the large playlist"""
+    session.execute(insert(Content), [
+        {"id": i, "title": f"Content {i}", "file_path": f"/storage/uploads/c{i}.jpg", "file_name": f"c{i}.jpg",
+         "file_size": 1000 + i, "content_type": ContentType.IMAGE, "mime_type": "image/jpeg", "duration": 10,
+         "thumbnail_path": f"/storage/uploads/thumb_c{i}.jpg", "created_by": 1}
+        for i in range(1, rows + 1)
+    ])
+    session.execute(insert(ContentItem), [
+        {"id": i, "content_id": i, "item_number": 1, "file_path": f"/storage/uploads/c{i}.jpg",
+         "mime_type": "image/jpeg", "duration": 10}
+        for i in range(1, rows + 1)
+    ])
+    session.execute(insert(Playlist), [
+        {"id": i, "name": f"Playlist {i}", "is_active": True, "loop": True, "shuffle": False, "created_by": 1}
+        for i in range(1, rows + 2)
+    ])
+    session.execute(insert(PlaylistItem), [
+        {"playlist_id": i, "content_item_id": (i + n) % rows + 1, "order": n}
+        for i in range(1, rows + 1) for n in range(2)
+    ] + [
+        {"playlist_id": rows + 1, "content_item_id": n + 1, "order": n, "duration_override": 5 if n % 2 else None}
+        for n in range(rows)
+    ])
+    session.execute(insert(PlaylistSchedule), [
+        {"playlist_id": i, "start_time": dt_time(8), "end_time": dt_time(18), "monday": True, "friday": True}
+        for i in range(1, rows + 1)
+    ])
+    session.commit()
+    return rows + 1
+
+
+def _fastapi_json(adapter: TypeAdapter, value) -> bytes:
+    # FastAPI with a response_model: validate, dump in JSON mode, JSONResponse.render
+    dumped = adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json")
+    return json.dumps(dumped, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def orm_content_list(session, rows: int) -> bytes:
+    return _fastapi_json(TypeAdapter(List[ContentResponse]), session.query(Content).order_by(Content.id).limit(rows).all())
+
+
+def orm_playlist_list(session, rows: int) -> bytes:
+    return _fastapi_json(TypeAdapter(List[PlaylistResponse]), session.query(Playlist).order_by(Playlist.id).limit(rows).all())
+
+
+def orm_playlist_full(session, playlist_id: int) -> bytes:
+    # The former endpoint body: one ContentItem query per playlist item
+    playlist = session.query(Playlist).filter(Playlist.id == playlist_id).first()
+    items_detailed = []
+    for item in sorted(playlist.items, key=lambda x: x.order):
+        content_item = session.query(ContentItem).filter(ContentItem.id == item.content_item_id).first()
+        if content_item:
+            items_detailed.append({
+                "id": item.id, "order": item.order, "duration": item.duration_override or content_item.duration,
+                "content_item": {
+                    "id": content_item.id, "content_id": content_item.content_id, "item_number": content_item.item_number,
+                    "file_path": content_item.file_path, "mime_type": content_item.mime_type, "duration": content_item.duration
+                }
+            })
+    schedules = session.query(PlaylistSchedule).filter(PlaylistSchedule.playlist_id == playlist_id).all()
+    value = {**playlist.__dict__, "items_detailed": items_detailed, "schedules": [s.__dict__ for s in schedules]}
+    adapter = TypeAdapter(PlaylistWithContent)
+    return json.dumps(adapter.dump_python(adapter.validate_python(value), mode="json")).encode()
+
+
+def _time(factory, fn, repeat: int):
+    samples, payload = [], None
+    for _ in range(repeat):
+        session = factory()  # Fresh session: no identity map carried over between runs
+        try:
+            start = time.perf_counter()
+            payload = fn(session)
+            samples.append(time.perf_counter() - start)
+        finally:
+            session.close()
+    return samples, payload
+
+
+def bench(factory, name: str, orm_fn, read_fn, repeat: int) -> dict:
+    orm_samples, orm_payload = _time(factory, orm_fn, repeat)
+    read_samples, read_payload = _time(factory, lambda session: orjson.dumps(read_fn(session)), repeat)
+
+    orm_data, read_data = json.loads(orm_payload), json.loads(read_payload)
+    if name == "playlist_full":
+        orm_data.pop("updated_at", None)  # __dict__ spread leaked extra columns into the old response
+        orm_data = {key: value for key, value in orm_data.items() if key in read_data}
+
+    orm_summary, read_summary = summarize(orm_samples), summarize(read_samples)
+    return {
+        "scenario": name,
+        "orm": orm_summary,
+        "read_model": read_summary,
+        "bytes": len(read_payload),
+        "speedup": round(orm_summary["p50_ms"] / read_summary["p50_ms"], 1),
+        "identical": orm_data == read_data
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="dsbench") as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'serialization.db')}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+
+        session = factory()
+        full_id = seed(session, args.rows)
+        session.close()
+
+        rows = args.rows
+        results = [
+            bench(factory, "content_list", lambda s: orm_content_list(s, rows),
+                  lambda s: content_list(s, 0, rows), args.repeat),
+            bench(factory, "playlist_list", lambda s: orm_playlist_list(s, rows),
+                  lambda s: playlist_list(s, 0, rows), args.repeat),
+            bench(factory, "playlist_full", lambda s: orm_playlist_full(s, full_id),
+                  lambda s: playlist_with_content(s, full_id), args.repeat),
+        ]
+        engine.dispose()
+
+    params = {"rows": args.rows, "repeat": args.repeat}
+    return write_report("serialization", results, params, args.output)
+
+
+if __name__ == "__main__":
+    main()
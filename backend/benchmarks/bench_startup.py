@@ -0,0 +1,144 @@
+"""Worker startup: import time of app.main and time until /health/live answers.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup [--repeat N] [--budget-ms MS] [--top N]
+
+- import: ``python -X importtime -c "import app.main"`` in a fresh
+  interpreter per run (bytecode cache warm), cumulative time of app.main
+  plus the slowest top-level imports of the median run
+- ready: uvicorn process start until /health/live returns 200 (scratch
+  SQLite DB, SCHEMA_MODE=off)
+
+Exits with status 1 when the median import time exceeds --budget-ms or a
+module from LAZY_MODULES is imported at startup (imaging/PDF libraries and
+alembic belong to first use, not to boot).
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.common import BACKEND_DIR, _free_port, summarize, write_report
+
+
+# Must not be imported by "import app.main"
+LAZY_MODULES = ("PIL", "pypdfium2", "pdf2image", "PyPDF2", "alembic")
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us, depth) per line of -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2  # Two spaces per nesting level
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def import_once() -> list:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def bench_import(repeat: int, top: int) -> dict:
+    import_once()  # Write bytecode caches
+    runs = []
+    for _ in range(repeat):
+        modules = import_once()
+        total = next(cumulative for name, _, cumulative, _ in modules if name == "app.main")
+        runs.append((total, modules))
+    runs.sort(key=lambda run: run[0])
+    total, modules = runs[len(runs) // 2]
+
+    # Direct imports of app.main are one level deeper than app.main itself
+    main_depth = next(depth for name, _, _, depth in modules if name == "app.main")
+    direct = [(name, cumulative) for name, _, cumulative, depth in modules if depth == main_depth + 1]
+    loaded = {name for name, _, _, _ in modules}
+
+    return {
+        "name": "import app.main",
+        **summarize([run[0] / 1e6 for run in runs]),
+        "slowest": [
+            {"module": name, "cumulative_ms": round(cumulative / 1000, 2)}
+            for name, cumulative in sorted(direct, key=lambda item: -item[1])[:top]
+        ],
+        "lazy_violations": sorted(name for name in LAZY_MODULES if name in loaded)
+    }
+
+
+def bench_ready(repeat: int) -> dict:
+    samples = []
+    with tempfile.TemporaryDirectory(prefix="dsbench") as tmp:
+        env = dict(os.environ)
+        env.update({
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+            "UPLOAD_DIR": os.path.join(tmp, "uploads"),
+            "LOG_LEVEL": "WARNING",
+            "SCHEMA_MODE": "off",
+        })
+        for _ in range(repeat):
+            port = _free_port()
+            start = time.perf_counter()
+            process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+                cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                while True:
+                    try:
+                        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health/live", timeout=1) as response:
+                            if response.status == 200:
+                                break
+                    except OSError:
+                        if process.poll() is not None:
+                            raise RuntimeError("uvicorn exited during startup")
+                        time.sleep(0.01)
+                samples.append(time.perf_counter() - start)
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+    return {"name": "ready", **summarize(samples)}
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Max. median import time of app.main")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports to list")
+    parser.add_argument("--no-ready", action="store_true", help="Only measure imports")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    results = [bench_import(args.repeat, args.top)]
+    if not args.no_ready:
+        results.append(bench_ready(args.repeat))
+
+    params = {"repeat": args.repeat, "budget_ms": args.budget_ms}
+    return write_report("startup", results, params, args.output)
+
+
+def check_budget(report: dict) -> list:
+    """Budget violations of a startup report (empty = ok)"""
+    budget = report["params"]["budget_ms"]
+    imports = report["results"][0]
+    problems = []
+    if imports["p50_ms"] > budget:
+        problems.append(f"import app.main takes {imports['p50_ms']}ms, budget {budget}ms")
+    if imports["lazy_violations"]:
+        problems.append(f"imported at startup: {', '.join(imports['lazy_violations'])}")
+    return problems
+
+
+if __name__ == "__main__":
+    problems = check_budget(main())
+    for problem in problems:
+        print(f"OVER BUDGET: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
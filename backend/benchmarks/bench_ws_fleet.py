@@ -0,0 +1,192 @@
+"""Simulated display fleet: N WebSocket clients on /ws/screen/{name}.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ws_fleet [--url URL] [--clients N] [--rate R]
+                                        [--duration S] [--broadcasts N] [--pushes N]
+
+Each client behaves like display.html: it answers pings with pongs and
+counts playlist updates. The run has three phases:
+
+1. ramp-up: connect --clients at --rate connections/second
+2. broadcasts: POST /ws/broadcast with a timestamp, measure fan-out latency
+   until every client received it
+3. playlist pushes: assign a playlist to --pushes screens and trigger
+   /ws/screen/{name}/reload, measure request-to-receipt latency
+
+Thousands of clients need a high open-files limit (``ulimit -n``) on both
+sides. Without --url a uvicorn server is started against a scratch SQLite DB.
+"""
+from contextlib import nullcontext
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+
+import httpx
+from websockets.asyncio.client import connect
+
+from benchmarks.bench_api import login, setup_playlist
+from benchmarks.common import BENCH_USERNAME, BENCH_PASSWORD, local_server, summarize, write_report
+
+
+class Fleet:
+    """State shared by all simulated displays"""
+
+    def __init__(self):
+        self.connect_latencies = []
+        self.errors = {}
+        self.connected = 0
+        self.pongs = 0
+        self.broadcast_received = {}  # seq -> list of receive times
+        self.playlist_received = {}  # screen name -> receive time
+        self.playlist_updates = 0
+
+    def error(self, name: str):
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+
+async def display(ws_url: str, name: str, fleet: Fleet, stop: asyncio.Event):
+    start = time.perf_counter()
+    try:
+        async with connect(f"{ws_url}/ws/screen/{name}", open_timeout=30, ping_interval=None,
+                           max_size=None) as ws:
+            fleet.connect_latencies.append(time.perf_counter() - start)
+            fleet.connected += 1
+            try:
+                while not stop.is_set():
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        continue
+                    received = time.time()
+                    message = json.loads(raw)
+                    kind = message.get("type")
+                    if kind == "ping":
+                        await ws.send('{"type": "pong"}')
+                        fleet.pongs += 1
+                    elif kind == "playlist_update":
+                        fleet.playlist_updates += 1
+                        fleet.playlist_received[name] = received
+                    elif kind == "bench":
+                        fleet.broadcast_received.setdefault(message["seq"], []).append(
+                            received - message["sent_at"]
+                        )
+            finally:
+                fleet.connected -= 1
+    except Exception as e:
+        fleet.error(type(e).__name__)
+
+
+async def wait_until(predicate, timeout: float):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    return predicate()
+
+
+async def run(args, base_url: str) -> dict:
+    ws_url = base_url.replace("http", "ws", 1)
+    fleet = Fleet()
+    stop = asyncio.Event()
+    names = [f"{args.prefix}-{i}" for i in range(args.clients)]
+
+    # Phase 1: ramp-up
+    tasks = []
+    ramp_start = time.perf_counter()
+    for i, name in enumerate(names):
+        tasks.append(asyncio.create_task(display(ws_url, name, fleet, stop)))
+        delay = ramp_start + (i + 1) / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    await wait_until(lambda: fleet.connected + sum(fleet.errors.values()) >= args.clients, 60)
+    ramp_time = time.perf_counter() - ramp_start
+
+    results = {
+        "ramp_up": dict(summarize(fleet.connect_latencies), connected=fleet.connected,
+                        errors=dict(fleet.errors), seconds=round(ramp_time, 2))
+    }
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        # Phase 2: broadcast fan-out
+        for seq in range(args.broadcasts):
+            expected = fleet.connected
+            await client.post("/ws/broadcast", json={"type": "bench", "seq": seq, "sent_at": time.time()})
+            await wait_until(lambda: len(fleet.broadcast_received.get(seq, ())) >= expected, 30)
+            await asyncio.sleep(args.interval)
+
+        latencies = [latency for values in fleet.broadcast_received.values() for latency in values]
+        full_fanout = [max(values) for values in fleet.broadcast_received.values()]
+        results["broadcast"] = {
+            "broadcasts": args.broadcasts,
+            "deliveries": len(latencies),
+            "expected_deliveries": args.broadcasts * fleet.connected,
+            "delivery": summarize(latencies),
+            "full_fanout": summarize(full_fanout)
+        }
+
+        # Phase 3: playlist pushes to individual screens
+        if args.pushes:
+            response = await login(client, args.username, args.password)
+            response.raise_for_status()
+            client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+            with tempfile.TemporaryDirectory() as tmp:
+                playlist_id = await setup_playlist(client, tmp, args.items)
+
+            screens = {screen["name"]: screen["id"] for screen in (await client.get(
+                "/api/v1/screens", params={"limit": args.clients + 100})).json()}
+            latencies = []
+            for name in names[:args.pushes]:
+                if name not in screens:
+                    continue
+                await client.put(f"/api/v1/screens/{screens[name]}", json={"assigned_playlist_id": playlist_id})
+                fleet.playlist_received.pop(name, None)
+                sent_at = time.time()
+                await client.post(f"/ws/screen/{name}/reload")
+                if await wait_until(lambda: name in fleet.playlist_received, 10):
+                    latencies.append(fleet.playlist_received[name] - sent_at)
+            results["playlist_push"] = dict(summarize(latencies), pushes=args.pushes, items=args.items)
+
+    # Let heartbeats run for the remaining duration
+    remaining = args.duration - (time.perf_counter() - ramp_start)
+    if remaining > 0:
+        await asyncio.sleep(remaining)
+
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    results["totals"] = {
+        "pongs": fleet.pongs,
+        "playlist_updates": fleet.playlist_updates,
+        "errors": dict(fleet.errors),
+        "seconds": round(time.perf_counter() - ramp_start, 2)
+    }
+    return results
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server (default: start one)")
+    parser.add_argument("--database-url", help="DATABASE_URL for the started server (default: scratch SQLite)")
+    parser.add_argument("--username", default=BENCH_USERNAME)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=200, help="New connections per second")
+    parser.add_argument("--duration", type=float, default=30, help="Minimum total run time (seconds)")
+    parser.add_argument("--broadcasts", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.0, help="Pause between broadcasts (seconds)")
+    parser.add_argument("--pushes", type=int, default=20, help="Screens that get a playlist push")
+    parser.add_argument("--items", type=int, default=20, help="Items in the pushed playlist")
+    parser.add_argument("--prefix", default="bench", help="Screen name prefix")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    server = nullcontext(args.url) if args.url else local_server(args.database_url)
+    with server as base_url:
+        results = asyncio.run(run(args, base_url))
+
+    params = {key: value for key, value in vars(args).items() if key not in ("password", "output")}
+    return write_report("ws_fleet", results, params, args.output)
+
+
+if __name__ == "__main__":
+    main()
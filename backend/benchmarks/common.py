@@ -0,0 +1,174 @@
+"""Shared helpers for the benchmark scripts.
+
+Reports are JSON documents with a ``meta`` block (commit, python, host) so
+files from different commits can be diffed with ``benchmarks.compare``.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from PIL import Image, ImageDraw
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_USERNAME = "bench"
+BENCH_PASSWORD = "bench-password"
+
+# Runs in a subprocess with the server's environment - creates schema and admin user
+_SEED_SCRIPT = """
+from app.core.database import engine, Base, SessionLocal
+from app.core.security import get_password_hash
+import app.models
+from app.models.user import User, UserRole
+
+Base.metadata.create_all(bind=engine)
+db = SessionLocal()
+if not db.query(User).filter(User.username == {username!r}).first():
+    db.add(User(
+        username={username!r}, email="bench@example.com",
+        hashed_password=get_password_hash({password!r}),
+        is_active=True, is_admin=True, role=UserRole.ADMIN
+    ))
+    db.commit()
+db.close()
+"""
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_report(benchmark: str, results, params: dict, output: str = None) -> dict:
+    """Print the report as JSON (and write it to ``output`` if given)"""
+    report = {
+        "benchmark": benchmark,
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count()
+        },
+        "params": params,
+        "results": results
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    return report
+
+
+def summarize(samples, elapsed: float = None) -> dict:
+    """Latency summary in milliseconds (samples in seconds)"""
+    ordered = sorted(samples)
+    count = len(ordered)
+    summary = {"count": count}
+    if count:
+        def pct(p):
+            return round(ordered[min(count - 1, int(p / 100 * count))] * 1000, 2)
+        summary.update({
+            "mean_ms": round(sum(ordered) / count * 1000, 2),
+            "p50_ms": pct(50),
+            "p90_ms": pct(90),
+            "p99_ms": pct(99),
+            "max_ms": round(ordered[-1] * 1000, 2)
+        })
+    if elapsed:
+        summary["per_s"] = round(count / elapsed, 2)
+    return summary
+
+
+def make_test_pdf(path: str, pages: int):
+    """Write an A4 PDF with some drawing on each page"""
+    images = []
+    for page_num in range(pages):
+        img = Image.new("RGB", (1240, 1754), "white")
+        draw = ImageDraw.Draw(img)
+        for i in range(0, 1754, 40):
+            draw.line((0, i, 1240, 1754 - i), fill=(page_num * 20 % 255, 80, 160), width=3)
+        draw.text((100, 100), f"Page {page_num + 1}", fill="black")
+        images.append(img)
+    images[0].save(path, "PDF", resolution=150, save_all=True, append_images=images[1:])
+
+
+def make_test_image(path: str, size=(1920, 1080)):
+    """Write a gradient image (format by extension)"""
+    width, height = size
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for x in range(0, width, 60):
+        draw.line((x, 0, width - x, height), fill=(x % 255, 120, 200), width=4)
+    img.save(path, quality=90)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not come up at {url}")
+
+
+@contextmanager
+def local_server(database_url: str = None, workers: int = 1, env: dict = None):
+    """Run uvicorn on a free port against a scratch SQLite DB (or database_url)
+
+    Yields the base URL. The admin user BENCH_USERNAME/BENCH_PASSWORD is seeded.
+    """
+    with tempfile.TemporaryDirectory(prefix="dsbench") as tmp:
+        server_env = dict(os.environ)
+        server_env.update({
+            "DATABASE_URL": database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            "UPLOAD_DIR": os.path.join(tmp, "uploads"),
+            "LOG_LEVEL": "WARNING",
+            "HEALTH_MIN_FREE_BYTES": "0",
+            "SCHEMA_MODE": "off",  # Scratch schema comes from create_all in the seed script
+        })
+        server_env.update(env or {})
+
+        subprocess.run(
+            [sys.executable, "-c", _SEED_SCRIPT.format(username=BENCH_USERNAME, password=BENCH_PASSWORD)],
+            cwd=BACKEND_DIR, env=server_env, check=True
+        )
+
+        port = _free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(port), "--workers", str(workers), "--no-access-log"],
+            cwd=BACKEND_DIR, env=server_env
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_for(f"{base_url}/health/live")
+            yield base_url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
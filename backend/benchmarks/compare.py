@@ -0,0 +1,77 @@
+"""Compare two benchmark reports (e.g. from two commits).
+
+Usage (from backend/):
+    python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 10]
+
+Prints the relative change of every numeric metric and exits with status 1
+when a latency (``*_ms``, ``*_s``) grows or a rate (``*per_s``) drops by more
+than --threshold percent.
+"""
+import argparse
+import json
+import sys
+
+
+# Fields identifying an entry in a results list
+ID_FIELDS = ("scenario", "name", "backend", "source")
+
+
+def flatten(value, prefix: str = "") -> dict:
+    """Numeric leaves keyed by dotted path; list entries keyed by their identity"""
+    flat = {}
+    if isinstance(value, dict):
+        for key, child in value.items():
+            flat.update(flatten(child, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            label = str(index)
+            if isinstance(child, dict):
+                label = " ".join(str(child[field]) for field in ID_FIELDS if field in child) or label
+            flat.update(flatten(child, f"{prefix}[{label}]"))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        flat[prefix] = value
+    return flat
+
+
+def is_regression(key: str, change: float, threshold: float) -> bool:
+    if key.endswith("per_s"):
+        return change < -threshold
+    if key.endswith(("_ms", "_s")):
+        return change > threshold
+    return False
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed change in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    old = flatten(baseline.get("results"))
+    new = flatten(current.get("results"))
+    print(f"{baseline.get('benchmark')}: {baseline['meta']['commit']} -> {current['meta']['commit']}")
+
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        if old[key] == 0:
+            continue
+        change = (new[key] - old[key]) / abs(old[key]) * 100
+        regressed = is_regression(key, change, args.threshold)
+        regressions += regressed
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{key:70} {old[key]:>12} {new[key]:>12} {change:+8.1f}%{marker}")
+
+    for key in sorted(old.keys() - new.keys()):
+        print(f"{key:70} missing in current")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Test setup: scratch SQLite DB and upload dir, one admin user.
+
+The environment is set before ``app`` is imported, since settings and the
+engine are created at import time.
+"""
+import os
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="dstest")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_TMP, 'test.db')}",
+    "UPLOAD_DIR": os.path.join(_TMP, "uploads"),
+    "SCHEMA_MODE": "create",
+    "LOG_LEVEL": "WARNING",
+})
+os.makedirs(os.environ["UPLOAD_DIR"], exist_ok=True)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, engine, SessionLocal
+from app.core.security import create_access_token, get_password_hash
+import app.models
+from app.models.user import User, UserRole
+from app.main import app as fastapi_app
+
+Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture(scope="session")
+def admin_headers():
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.username == "admin").first():
+            db.add(User(
+                username="admin", email="admin@example.com", hashed_password=get_password_hash("admin-password"),
+                is_active=True, is_admin=True, role=UserRole.ADMIN
+            ))
+            db.commit()
+    finally:
+        db.close()
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'admin'})}"}
+
+
+@pytest.fixture
+def client():
+    # No context manager: the lifespan (background tasks, signal handler) is not needed
+    return TestClient(fastapi_app)
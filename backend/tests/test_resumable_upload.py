@@ -0,0 +1,146 @@
+"""Resumable uploads: interrupted transfers, resume, offset and checksum checks, expiry."""
+import asyncio
+import hashlib
+import io
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.utils.resumable_upload import (
+    append_chunk,
+    cleanup_expired_uploads,
+    create_upload,
+    get_upload,
+    get_upload_offset
+)
+
+API = settings.API_PREFIX + "/content/uploads"
+
+
+def png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (200, 40, 40)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def create(client, headers, data: bytes, **extra) -> str:
+    response = client.post(API, headers=headers, json={
+        "filename": "upload.png", "length": len(data), "title": "Upload", **extra
+    })
+    assert response.status_code == 201
+    assert response.json()["offset"] == 0
+    return response.json()["id"]
+
+
+def patch(client, headers, upload_id: str, offset: int, chunk: bytes):
+    return client.patch(f"{API}/{upload_id}", headers={**headers, "Upload-Offset": str(offset)}, content=chunk)
+
+
+async def _dropped_connection(chunks):
+    """Request body that breaks off after ``chunks`` (like a client losing its uplink)"""
+    for chunk in chunks:
+        yield chunk
+    raise ConnectionResetError("client went away")
+
+
+def test_interrupted_patch_resumes_at_head_offset(client, admin_headers):
+    data = png_bytes()
+    upload_id = create(client, admin_headers, data)
+    cut = len(data) // 3
+
+    # First PATCH dies mid-body: the bytes that arrived are kept
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(append_chunk(upload_id, 0, _dropped_connection([data[:100], data[100:cut]]), len(data)))
+    assert get_upload_offset(upload_id) == cut
+
+    response = client.head(f"{API}/{upload_id}", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["Upload-Offset"] == str(cut)
+    assert response.headers["Upload-Length"] == str(len(data))
+
+    # Resume from the reported offset in two more chunks
+    middle = 2 * len(data) // 3
+    response = patch(client, admin_headers, upload_id, cut, data[cut:middle])
+    assert response.status_code == 204
+    assert response.headers["Upload-Offset"] == str(middle)
+    response = patch(client, admin_headers, upload_id, middle, data[middle:])
+    assert response.headers["Upload-Offset"] == str(len(data))
+
+    response = client.post(f"{API}/{upload_id}/finalize", headers=admin_headers)
+    assert response.status_code == 201
+    assert response.json()["checksum"] == hashlib.sha256(data).hexdigest()
+    assert get_upload(upload_id) is None
+
+
+def test_finalize_before_complete_is_rejected(client, admin_headers):
+    data = png_bytes()
+    upload_id = create(client, admin_headers, data)
+    patch(client, admin_headers, upload_id, 0, data[:10])
+
+    response = client.post(f"{API}/{upload_id}/finalize", headers=admin_headers)
+    assert response.status_code == 409
+    assert response.headers["Upload-Offset"] == "10"
+
+
+def test_offset_mismatch_is_rejected(client, admin_headers):
+    data = png_bytes()
+    upload_id = create(client, admin_headers, data)
+    patch(client, admin_headers, upload_id, 0, data[:50])
+
+    # Replaying the first chunk (client missed the response) and skipping ahead both fail
+    for offset in (0, 80):
+        response = patch(client, admin_headers, upload_id, offset, data[offset:offset + 50])
+        assert response.status_code == 409
+        assert response.headers["Upload-Offset"] == "50"
+    assert get_upload_offset(upload_id) == 50
+
+
+def test_chunk_beyond_declared_length_is_rejected(client, admin_headers):
+    data = png_bytes()
+    upload_id = create(client, admin_headers, data)
+
+    response = patch(client, admin_headers, upload_id, 0, data + b"extra")
+    assert response.status_code == 413
+
+
+def test_checksum_mismatch_at_finalize(client, admin_headers):
+    data = png_bytes()
+    upload_id = create(client, admin_headers, data, checksum=hashlib.sha256(data).hexdigest())
+
+    corrupted = bytes([data[0] ^ 0xFF]) + data[1:]
+    patch(client, admin_headers, upload_id, 0, corrupted)
+
+    response = client.post(f"{API}/{upload_id}/finalize", headers=admin_headers)
+    assert response.status_code == 422
+    assert "Checksum mismatch" in response.json()["detail"]
+    # Nothing reaches storage, the session is gone
+    assert get_upload(upload_id) is None
+    assert client.head(f"{API}/{upload_id}", headers=admin_headers).status_code == 404
+
+
+def test_matching_checksum_is_accepted(client, admin_headers):
+    data = png_bytes()
+    upload_id = create(client, admin_headers, data, checksum=hashlib.sha256(data).hexdigest().upper())
+    patch(client, admin_headers, upload_id, 0, data)
+
+    response = client.post(f"{API}/{upload_id}/finalize", headers=admin_headers)
+    assert response.status_code == 201
+
+
+def test_expired_uploads_are_cleaned_up():
+    expired = create_upload({"filename": "old.mp4", "length": 100, "title": "Old"})
+    active = create_upload({"filename": "new.mp4", "length": 100, "title": "New"})
+
+    # Last activity (metadata and staging file) older than the TTL
+    old = time.time() - settings.UPLOAD_SESSION_TTL_HOURS * 3600 - 60
+    staging_dir = os.path.join(settings.UPLOAD_DIR, ".staging")
+    for suffix in (".json", ".part"):
+        os.utime(os.path.join(staging_dir, expired["id"] + suffix), (old, old))
+
+    assert cleanup_expired_uploads() == 1
+    assert get_upload(expired["id"]) is None
+    assert not os.path.exists(os.path.join(staging_dir, expired["id"] + ".part"))
+    assert get_upload(active["id"]) is not None
@@ -0,0 +1,41 @@
+"""Startup budget: "import app.main" stays fast and leaves imaging/PDF libraries to first use.
+
+benchmarks.bench_startup reports the details (slowest imports, time to ready).
+"""
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.bench_startup import LAZY_MODULES, parse_importtime
+from benchmarks.common import BACKEND_DIR
+
+# Cumulative import time of app.main, best of 3 (headroom for slow CI runners)
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", 1500))
+
+_IMPORT_SCRIPT = f"""
+import json, sys
+import app.main
+print(json.dumps(sorted(name for name in {LAZY_MODULES!r} if name in sys.modules)))
+"""
+
+
+def import_app() -> tuple:
+    """(import time of app.main in ms, lazy modules loaded) in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_SCRIPT],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    total_us = next(cumulative for name, _, cumulative, _ in parse_importtime(result.stderr) if name == "app.main")
+    return total_us / 1000, json.loads(result.stdout)
+
+
+def test_lazy_modules_not_imported_at_startup():
+    _, loaded = import_app()
+    assert loaded == []
+
+
+def test_import_time_within_budget():
+    import_app()  # Write bytecode caches
+    best_ms = min(import_app()[0] for _ in range(3))
+    assert best_ms <= STARTUP_BUDGET_MS, f"import app.main takes {best_ms:.0f}ms, budget {STARTUP_BUDGET_MS:.0f}ms"
@@ -1,48 +1,18 @@
 import { useState, useEffect } from 'react';
-import { RefreshCw, Monitor } from 'lucide-react';
-import toast from 'react-hot-toast';
+import { Monitor, Wifi, WifiOff } from 'lucide-react';
+import { liveView } from '../../services/liveView';
 
 export default function ScreenLiveView({ screenId, screenName }) {
-  const [screenshot, setScreenshot] = useState(null);
-  const [loading, setLoading] = useState(false);
+  const [screen, setScreen] = useState(null);
   const [lastUpdate, setLastUpdate] = useState(null);
-  const [autoRefresh, setAutoRefresh] = useState(false);
 
+  // Server pushes changes of this screen, no polling
   useEffect(() => {
-    if (autoRefresh) {
-      const interval = setInterval(() => {
-        refreshScreenshot();
-      }, 5000); // Refresh every 5 seconds
-
-      return () => clearInterval(interval);
-    }
-  }, [autoRefresh]);
-
-  const refreshScreenshot = async () => {
-    setLoading(true);
-    try {
-      // In a real implementation, you would call an API endpoint
-      // that gets the current content being displayed on the screen
-      // For now, we'll show a placeholder
-      
-      // Simulate API call
-      await new Promise(resolve => setTimeout(resolve, 500));
-      
-      // This would come from the API in production
-      setScreenshot({
-        content: 'Currently displaying: Content Name',
-        timestamp: new Date().toLocaleTimeString(),
-        status: 'online'
-      });
+    return liveView.subscribe(`screen:${screenId}`, (state) => {
+      setScreen(state);
       setLastUpdate(new Date());
-      
-      toast.success('Screenshot updated');
-    } catch (error) {
-      toast.error('Failed to get screenshot');
-    } finally {
-      setLoading(false);
-    }
-  };
+    });
+  }, [screenId]);
 
   return (
     <div className="bg-white rounded-lg p-6">
@@ -51,44 +21,42 @@ export default function ScreenLiveView({ screenId, screenName }) {
           <Monitor className="w-5 h-5 text-blue-600" />
           <h3 className="font-semibold">Live View: {screenName}</h3>
         </div>
-        <button
-          onClick={refreshScreenshot}
-          disabled={loading}
-          className="btn btn-secondary flex items-center gap-2"
-        >
-          <RefreshCw className={`w-4 h-4 ${loading ? 'animate-spin' : ''}`} />
-          Refresh
-        </button>
+        {screen && (
+          screen.is_online ? (
+            <Wifi className="w-5 h-5 text-green-600" />
+          ) : (
+            <WifiOff className="w-5 h-5 text-gray-400" />
+          )
+        )}
       </div>
 
       {/* Preview Area */}
       <div className="bg-gray-900 rounded-lg aspect-video flex items-center justify-center mb-4 overflow-hidden">
-        {screenshot ? (
+        {screen ? (
           <div className="w-full h-full flex items-center justify-center bg-gray-900">
             <div className="text-center text-white">
-              <p className="text-lg font-semibold">{screenshot.content}</p>
-              <p className="text-sm text-gray-400 mt-2">{screenshot.timestamp}</p>
+              <p className="text-lg font-semibold">
+                {screen.is_online ? 'Online' : 'Offline'}
+              </p>
+              <p className="text-sm text-gray-400 mt-2">
+                {screen.playlist_item_id
+                  ? `Currently displaying: item ${screen.playlist_item_id} (content ${screen.content_id})`
+                  : 'No playback reported yet'}
+              </p>
+              {screen.last_seen && (
+                <p className="text-xs text-gray-500 mt-2">
+                  Last seen: {new Date(screen.last_seen + 'Z').toLocaleTimeString()}
+                </p>
+              )}
             </div>
           </div>
         ) : (
           <div className="text-center text-gray-400">
-            <p>No screenshot yet</p>
-            <p className="text-sm mt-2">Click Refresh to get a live screenshot</p>
+            <p>Connecting...</p>
           </div>
         )}
       </div>
 
-      {/* Auto Refresh Toggle */}
-      <label className="flex items-center gap-2 mb-4 cursor-pointer">
-        <input
-          type="checkbox"
-          checked={autoRefresh}
-          onChange={(e) => setAutoRefresh(e.target.checked)}
-          className="w-4 h-4"
-        />
-        <span className="text-sm">Auto-refresh every 5 seconds</span>
-      </label>
-
       {/* Info */}
       {lastUpdate && (
         <p className="text-xs text-gray-600">
@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import { screensAPI, playlistsAPI, websocketAPI } from '../services/api';
+import { liveView } from '../services/liveView';
 import { Plus, Trash2, Edit, Wifi, WifiOff } from 'lucide-react';
 import toast from 'react-hot-toast';
 
@@ -13,11 +14,29 @@ export default function ScreensPage() {
   useEffect(() => {
     loadData();
     
-    // Refresh online status every 30 seconds
-    const interval = setInterval(loadData, 30000);
-    return () => clearInterval(interval);
+    // Reload the list only when screens are added or removed elsewhere
+    let screenCount = null;
+    return liveView.subscribe('fleet', (fleet) => {
+      if (screenCount !== null && fleet.screens !== screenCount) {
+        loadData();
+      }
+      screenCount = fleet.screens;
+    });
   }, []);
 
+  // Online status and assignment are pushed by the server (no polling)
+  const screenIds = screens.map((screen) => screen.id).join(',');
+  useEffect(() => {
+    const unsubscribers = screens.map((screen) =>
+      liveView.subscribe(`screen:${screen.id}`, (state) => {
+        setScreens((current) =>
+          current.map((s) => (s.id === screen.id ? { ...s, ...state } : s))
+        );
+      })
+    );
+    return () => unsubscribers.forEach((unsubscribe) => unsubscribe());
+  }, [screenIds]);
+
   const loadData = async () => {
     try {
       const [screensRes, playlistsRes] = await Promise.all([
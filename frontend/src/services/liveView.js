@@ -0,0 +1,106 @@
+// Admin live view: one shared WebSocket per tab, topic subscriptions,
+// the server pushes diffs (max. a few frames per second) instead of polling.
+// Topics: 'fleet', 'jobs', 'screen:<id>', 'group:<id>'
+
+const listeners = new Map(); // topic -> Set of callbacks
+const state = new Map(); // topic -> current object
+let socket = null;
+let retries = 0;
+let pending = new Set(); // Topics to (re)subscribe on the next flush
+
+function socketUrl() {
+  const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+  const token = encodeURIComponent(localStorage.getItem('token') || '');
+  return `${protocol}//${window.location.host}/ws/admin/live?token=${token}`;
+}
+
+function send(message) {
+  if (socket && socket.readyState === WebSocket.OPEN) {
+    socket.send(JSON.stringify(message));
+  }
+}
+
+function notify(topic) {
+  const value = state.get(topic);
+  (listeners.get(topic) || []).forEach((callback) => callback(value));
+}
+
+// Batch subscriptions made in the same tick into one message
+function flushPending() {
+  if (pending.size === 0) return;
+  const topics = [...pending];
+  pending = new Set();
+  send({ type: 'subscribe', topics });
+}
+
+function handleMessage(message) {
+  if (message.type === 'snapshot') {
+    Object.entries(message.topics).forEach(([topic, value]) => {
+      state.set(topic, value);
+      notify(topic);
+    });
+  } else if (message.type === 'update') {
+    Object.entries(message.topics).forEach(([topic, diff]) => {
+      const next = { ...(state.get(topic) || {}), ...diff.changes };
+      diff.removed.forEach((key) => delete next[key]);
+      state.set(topic, next);
+      notify(topic);
+    });
+  }
+}
+
+function connect() {
+  if (socket) return;
+
+  socket = new WebSocket(socketUrl());
+
+  socket.onopen = () => {
+    retries = 0;
+    pending = new Set(listeners.keys());
+    flushPending();
+  };
+
+  socket.onmessage = (event) => handleMessage(JSON.parse(event.data));
+
+  socket.onclose = () => {
+    socket = null;
+    if (listeners.size > 0) {
+      // Exponential backoff with jitter, max. 30 seconds
+      retries++;
+      const delay = Math.min(30000, 1000 * 2 ** retries) * (0.5 + Math.random() / 2);
+      setTimeout(connect, delay);
+    }
+  };
+}
+
+export const liveView = {
+  // Returns an unsubscribe function; callback gets the full topic state
+  subscribe: (topic, callback) => {
+    if (!listeners.has(topic)) {
+      listeners.set(topic, new Set());
+      pending.add(topic);
+      Promise.resolve().then(flushPending);
+    } else if (state.has(topic)) {
+      callback(state.get(topic));
+    }
+    listeners.get(topic).add(callback);
+    connect();
+
+    return () => {
+      const callbacks = listeners.get(topic);
+      if (!callbacks) return;
+      callbacks.delete(callback);
+      if (callbacks.size === 0) {
+        listeners.delete(topic);
+        state.delete(topic);
+        pending.delete(topic);
+        send({ type: 'unsubscribe', topics: [topic] });
+      }
+      if (listeners.size === 0 && socket) {
+        socket.close();
+      }
+    };
+  },
+
+  get: (topic) => state.get(topic)
+};